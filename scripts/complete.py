@@ -1,10 +1,36 @@
-from cliff.complete import CompleteCommand
+"""Generate vinfra bash completion.
 
+The completion tree is precompiled to a JSON file read by
+vinfraclient.completion, and the bash completion script is printed to
+stdout. Run it at install time:
+
+    python scripts/complete.py [--tree-file PATH] > /etc/bash_completion.d/vinfra
+"""
+import argparse
+import json
+import sys
+
+from vinfraclient import completion
 from vinfraclient.main import VinfraApp
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--tree-file',
+        default=completion.DEFAULT_TREE,
+        help='Where to save the completion tree (default: %(default)s)')
+    parser.add_argument(
+        '--python',
+        default=sys.executable,
+        help='Python interpreter to run the completion helper '
+             '(default: %(default)s)')
+    args = parser.parse_args()
+
     app = VinfraApp()
     app.NAME = 'vinfra'
-    cmd = CompleteCommand(app, None)
-    cmd.take_action(cmd.get_parser(None).parse_args([]))
+    tree = completion.build_tree(app)
+    with open(args.tree_file, 'w') as fp:
+        json.dump(tree, fp, sort_keys=True)
+
+    sys.stdout.write(completion.BASH_SCRIPT % {'python': args.python})
@@ -78,6 +78,15 @@ vinfra_cli_cmds = [
     'location_move = vinfraclient.cmd.location:MoveLocations',
     'location_delete = vinfraclient.cmd.location:DeleteLocation',
 
+    # desired state
+    'apply = vinfraclient.cmd.compute.desired_state:ApplyState',
+
+    # shell completion
+    'completion_refresh = vinfraclient.cmd.completion:RefreshCompletion',
+
+    # export
+    'export_sqlite = vinfraclient.cmd.export:ExportSqlite',
+
     # backup:
     'cluster_backup_create = vinfraclient.cmd.backup:CreateBackup',
     'cluster_backup_show = vinfraclient.cmd.backup:ShowBackup',
@@ -97,6 +106,7 @@ vinfra_cli_cmds = [
     'cluster_alert_delete = vinfraclient.cmd.alert:DeleteAlert',
     'cluster_alert_list = vinfraclient.cmd.alert:ListAlert',
     'cluster_alert_show = vinfraclient.cmd.alert:ShowAlert',
+    'cluster_alert_watch = vinfraclient.cmd.alert:WatchAlert',
     # cluster alert types
     'cluster_alert_types_list = vinfraclient.cmd.alert_type:ListAlertType',
     # cluster auditlog
@@ -227,7 +237,9 @@ vinfra_cli_cmds = [
     'domain_group_user_add = vinfraclient.cmd.domain.group:AddDomainGroupUser',
     # node:
     'node_forget = vinfraclient.cmd.node:ForgetNode',
+    'node_inventory = vinfraclient.cmd.node:ListNodeInventory',
     'node_join = vinfraclient.cmd.node:JoinNode',
+    'node_join-bulk = vinfraclient.cmd.node:JoinNodeBulk',
     'node_list = vinfraclient.cmd.node:ListNode',
     'node_release = vinfraclient.cmd.node:ReleaseNode',
     'node_show = vinfraclient.cmd.node:ShowNode',
@@ -236,6 +248,7 @@ vinfra_cli_cmds = [
     'node_maintenance_start = vinfraclient.cmd.node:MaintenanceNodeStart',
     'node_maintenance_stop = vinfraclient.cmd.node:MaintenanceNodeStop',
     'node_maintenance_precheck = vinfraclient.cmd.node:MaintenanceNodePrecheck',
+    'node_maintenance_rolling = vinfraclient.cmd.node:RollingMaintenanceNode',
     # node disk
     'node_disk_assign = vinfraclient.cmd.node.disk:AssignDiskBulk',
     'node_disk_blink_on = vinfraclient.cmd.node.disk:StartBlinkDisk',
@@ -435,6 +448,7 @@ vinfra_cli_cmds = [
     'service_compute_k8saas_rotate-ca = vinfraclient.cmd.compute.k8saas:RotateK8saasClusterCA',
     'service_compute_k8saas_upgrade = vinfraclient.cmd.compute.k8saas:UpgradeK8saasCluster',
     'service_compute_k8saas_health = vinfraclient.cmd.compute.k8saas:ShowK8saasClusterHealth',
+    'service_compute_k8saas_fleet-health = vinfraclient.cmd.compute.k8saas:ListK8saasClusterHealth',
     'service_compute_k8saas_defaults_show = vinfraclient.cmd.compute.k8saas:K8saasDefaultsShow',
     'service_compute_k8saas_defaults_set = vinfraclient.cmd.compute.k8saas:K8saasDefaultsSet',
     # compute k8saas workergroup
@@ -444,6 +458,7 @@ vinfra_cli_cmds = [
     'service_compute_k8saas_workergroup_show = vinfraclient.cmd.compute.k8saas:ShowK8saasWorkerGroup',
     'service_compute_k8saas_workergroup_set = vinfraclient.cmd.compute.k8saas:SetK8saasWorkerGroup',
     'service_compute_k8saas_workergroup_upgrade = vinfraclient.cmd.compute.k8saas:UpgradeK8saasWorkerGroup',
+    'service_compute_k8saas_workergroup_scale = vinfraclient.cmd.compute.k8saas:ScaleK8saasWorkerGroups',
     # compute load-balancer
     'service_compute_load-balancer_create = vinfraclient.cmd.compute.load_balancer:CreateLoadBalancer',
     'service_compute_load-balancer_list = vinfraclient.cmd.compute.load_balancer:ListLoadBalancers',
@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+import mock
+from requests import exceptions as request_exceptions
+
+from vinfra.api.alerts import Alert, AlertManager
+
+
+class TestAlertWatcher(TestCase):
+    def setUp(self):
+        super(TestAlertWatcher, self).setUp()
+        self.manager = AlertManager(mock.Mock())
+        self.manager.list = mock.Mock()
+
+    def _set_alerts(self, *alerts):
+        self.manager.list.return_value = [
+            Alert(self.manager, dict(alert)) for alert in alerts]
+
+    def test_poll(self):
+        watcher = self.manager.watch()
+        self._set_alerts({'id': 1, 'severity': 'warning'},
+                         {'id': 2, 'severity': 'error'})
+        self.assertEqual([('new', 1), ('new', 2)],
+                         [(e['event'], e['id']) for e in watcher.poll()])
+        self.assertEqual([], watcher.poll())
+
+        self._set_alerts({'id': 2, 'severity': 'critical'},
+                         {'id': 3, 'severity': 'error'})
+        self.assertEqual([
+            {'event': 'changed', 'id': 2,
+             'alert': {'id': 2, 'severity': 'critical'}},
+            {'event': 'new', 'id': 3,
+             'alert': {'id': 3, 'severity': 'error'}},
+            {'event': 'cleared', 'id': 1,
+             'alert': {'id': 1, 'severity': 'warning'}},
+        ], watcher.poll())
+        self.manager.list.assert_called_with(enabled=True, lang='en')
+
+    def test_changes_only(self):
+        watcher = self.manager.watch(initial=False)
+        self._set_alerts({'id': 1})
+        self.assertEqual([], watcher.poll())
+        self._set_alerts({'id': 1}, {'id': 2})
+        self.assertEqual([2], [e['id'] for e in watcher.poll()])
+
+    @mock.patch('time.sleep')
+    def test_backoff(self, sleep):
+        self._set_alerts({'id': 1})
+        self.manager.list.side_effect = [
+            self.manager.list.return_value,
+            self.manager.list.return_value,
+            request_exceptions.ConnectionError('unreachable'),
+            self.manager.list.return_value,
+            [],
+            KeyboardInterrupt,
+        ]
+        watcher = self.manager.watch(interval=5, max_interval=30)
+        events = []
+        with self.assertRaises(KeyboardInterrupt):
+            for event in watcher:
+                events.append(event['event'])
+
+        self.assertEqual(['new', 'cleared'], events)
+        self.assertEqual([5, 10, 20, 30, 5],
+                         [call[0][0] for call in sleep.call_args_list])
+
+
+class TestAlertManager(TestCase):
+    def test_list_disabled(self):
+        manager = AlertManager(mock.Mock())
+        manager.client.get.return_value = []
+        manager.list()
+
+        manager.client.get.assert_called_once_with(
+            '/alerts?params={"filters":{"enabled":"False"}}',
+            query_params={}, cookies={'WebCP-Language': 'en'})
@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+import mock
+from requests.exceptions import HTTPError
+
+from vinfra import api_versions
+from vinfra import Vinfra, exceptions
+from vinfra.api_versions import APIVersion, VersionCache, version_wrap
+
+
+class FakeManager(object):
+    def __init__(self, version):
+        self.api = mock.Mock(api_version=APIVersion(version))
+
+    @version_wrap("2.0", "5.0.1")
+    def action(self):
+        return 'old'
+
+    @version_wrap("5.1.0")
+    def action(self):  # pylint: disable=function-redefined
+        return 'new'
+
+
+class TestVersionWrap(TestCase):
+    def test_dispatch(self):
+        self.assertEqual('old', FakeManager('5.0.1').action())
+        self.assertEqual('new', FakeManager('5.1.0').action())
+        self.assertRaises(exceptions.VinfraError,
+                          FakeManager('1.0.0').action)
+
+    def test_dispatch_is_resolved_once(self):
+        manager = FakeManager('4.0.0')
+        manager.action()
+        with mock.patch.object(api_versions, '_get_methods') as get_methods:
+            self.assertEqual('old', manager.action())
+            get_methods.assert_not_called()
+
+    def test_recheck_version(self):
+        manager = FakeManager('5.0.1')
+        response = mock.Mock(status_code=404)
+        calls = []
+
+        def action(obj):
+            calls.append(obj.api.api_version)
+            if len(calls) == 1:
+                raise HTTPError(response=response)
+            return 'new'
+
+        def recheck():
+            manager.api.api_version = APIVersion('5.1.0')
+            return True
+        manager.api.recheck_versions.side_effect = recheck
+        with mock.patch.object(api_versions, '_resolve_method',
+                               return_value=mock.Mock(func=action)):
+            self.assertEqual('new', manager.action())
+        self.assertEqual([APIVersion('5.0.1'), APIVersion('5.1.0')], calls)
+
+        # other errors are not retried
+        response.status_code = 500
+        calls[:] = []
+        with mock.patch.object(api_versions, '_resolve_method',
+                               return_value=mock.Mock(func=action)):
+            self.assertRaises(HTTPError, manager.action)
+        self.assertEqual(1, manager.api.recheck_versions.call_count)
+
+    def test_compare_with_string(self):
+        version = APIVersion('5.1.0')
+        self.assertTrue(version > '5.0.1')
+        self.assertTrue(version == '5.1.0')
+        self.assertTrue(version <= 'latest.0.0')
+
+
+class TestVersionCache(TestCase):
+    def setUp(self):
+        super(TestVersionCache, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'host', 'versions')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        super(TestVersionCache, self).tearDown()
+
+    def test_get_set(self):
+        cache = VersionCache(self.filename)
+        self.assertIsNone(cache.get('api_version'))
+        cache.set('api_version', '5.1.0')
+        self.assertEqual('5.1.0', VersionCache(self.filename).get('api_version'))
+
+    def test_revalidate_expired(self):
+        cache = VersionCache(self.filename, ttl=10)
+        cache.set('api_version', '5.1.0')
+        with mock.patch('time.time', return_value=time.time() + 20):
+            self.assertIsNone(cache.get('api_version'))
+
+    def test_invalidate(self):
+        cache = VersionCache(self.filename)
+        cache.set('api_version', '5.1.0')
+        cache.invalidate()
+        self.assertIsNone(cache.get('api_version'))
+
+    def test_recheck(self):
+        cache = VersionCache(self.filename)
+        cache.set('api_version', '5.0.1')
+        api = Vinfra('https://node:8888', version_cache=cache)
+        with mock.patch.object(api, 'get_api_version',
+                               return_value='5.1.0') as get_api_version:
+            self.assertEqual('5.0.1', api.api_version)
+            self.assertTrue(api.recheck_versions())
+            self.assertEqual('5.1.0', api.api_version)
+            # versions are rechecked once
+            self.assertFalse(api.recheck_versions())
+        get_api_version.assert_called_once_with()
+        self.assertEqual('5.1.0', cache.get('api_version'))
@@ -0,0 +1,68 @@
+import datetime
+from unittest import TestCase
+
+import mock
+
+from vinfra.api.auditlog import AuditLogManager
+
+
+def _entries(count):
+    start = datetime.datetime(2020, 1, 1)
+    return [{
+        'id': idx,
+        'timestamp': (start + datetime.timedelta(hours=idx)).strftime(
+            '%Y-%m-%dT%H:%M:%S.%f+00:00'),
+    } for idx in range(1, count + 1)]
+
+
+class FakeAuditLogBackend(object):
+    def __init__(self, count):
+        self.entries = _entries(count)
+        self.paging = True
+        self.calls = 0
+
+    def get(self, url, query_params=None, **kwargs):  # pylint: disable=unused-argument
+        self.calls += 1
+        reverse = query_params.get('sort') == 'id:desc'
+        entries = sorted(self.entries, key=lambda e: e['id'], reverse=reverse)
+        marker = query_params.get('marker')
+        if marker and self.paging:
+            entries = [e for e in entries
+                       if (e['id'] < marker if reverse else e['id'] > marker)]
+        return entries[:query_params.get('limit')]
+
+
+class TestAuditLogManager(TestCase):
+    def setUp(self):
+        super(TestAuditLogManager, self).setUp()
+        self.backend = FakeAuditLogBackend(100)
+        api = mock.Mock()
+        api.client = self.backend
+        self.manager = AuditLogManager(api)
+
+    def test_iterate_time_window(self):
+        since = datetime.datetime(2020, 1, 4, 0, 30)
+        until = datetime.datetime(2020, 1, 4, 12, 30)
+        entries = list(self.manager.iterate(since=since, until=until,
+                                            page_size=10))
+
+        self.assertEqual(list(range(84, 72, -1)), [e.id for e in entries])
+        # paging stops once the window is passed
+        self.assertEqual(3, self.backend.calls)
+
+    def test_list_newer(self):
+        entries = self.manager.list_newer(95, page_size=2)
+        self.assertEqual([96, 97, 98, 99, 100], [e.id for e in entries])
+        self.assertEqual([], self.manager.list_newer(100))
+
+    def test_get_last_id(self):
+        self.assertEqual(100, self.manager.get_last_id())
+
+    def test_marker_ignored(self):
+        self.backend.paging = False
+        entries = list(self.manager.iterate(page_size=30))
+        # the rest is listed at once instead of stopping after a page
+        self.assertEqual(list(range(100, 0, -1)), [e.id for e in entries])
+        self.assertEqual(3, self.backend.calls)
+        self.assertEqual(list(range(51, 101)),
+                         [e.id for e in self.manager.list_newer(50, 10)])
@@ -0,0 +1,91 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from requests import adapters
+from urllib3 import HTTPResponse
+
+from vinfra import exceptions
+from vinfra.session import Session
+
+
+class FakeBackendAdapter(adapters.BaseAdapter):
+    def __init__(self):
+        super(FakeBackendAdapter, self).__init__()
+        self.requests = []
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        self.requests.append(request)
+        if request.url.endswith('/login'):
+            body = {'token': 'secret-token', 'domain_id': 'default'}
+            headers = [('Content-Type', 'application/json'),
+                       ('Set-Cookie', 'session=secret-cookie; Path=/')]
+        else:
+            body = {'data': [{'id': len(self.requests)}]}
+            headers = [('Content-Type', 'application/json')]
+        raw = HTTPResponse(body=io.BytesIO(json.dumps(body).encode('utf-8')),
+                           headers=headers, status=200, reason='OK',
+                           preload_content=False)
+        return adapters.HTTPAdapter().build_response(request, raw)
+
+    def close(self):
+        pass
+
+
+class TestCassette(TestCase):
+    def setUp(self):
+        super(TestCassette, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'cassette.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        super(TestCassette, self).tearDown()
+
+    def _record(self):
+        session = Session('https://backend:8888')
+        backend = FakeBackendAdapter()
+        session.session.mount('https://', backend)
+        session.record(self.filename)
+
+        session.post('/api/v2/login', authenticated=False,
+                     json={'username': 'admin', 'password': 'secret'})
+        session.get('/api/v2/nodes', authenticated=False)
+        session.get('/api/v2/nodes', authenticated=False)
+        return backend
+
+    def test_secrets_are_scrubbed(self):
+        self._record()
+        with open(self.filename) as fp:
+            content = fp.read()
+
+        self.assertEqual(3, len(content.splitlines()))
+        self.assertNotIn('secret-token', content)
+        self.assertNotIn('secret-cookie', content)
+        self.assertNotIn('"secret"', content)
+
+    def test_replay(self):
+        self._record()
+
+        session = Session('https://other-backend:8888')
+        session.replay(self.filename, latency_scale=0)
+
+        resp = session.post('/api/v2/login', authenticated=False, json={})
+        self.assertIn('session', [cookie.name for cookie in session.cookies])
+        self.assertTrue(resp.json()['token'].startswith('{SHA256}'))
+
+        ids = [session.get('/api/v2/nodes', authenticated=False).json()
+               ['data'][0]['id'] for _ in range(3)]
+        # the last recorded response is repeated once exhausted
+        self.assertEqual([2, 3, 3], ids)
+
+    def test_replay_unknown_request(self):
+        self._record()
+
+        session = Session('https://backend:8888')
+        session.replay(self.filename, latency_scale=0)
+        self.assertRaises(exceptions.VinfraError, session.get,
+                          '/api/v2/clusters', authenticated=False)
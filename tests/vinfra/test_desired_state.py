@@ -0,0 +1,147 @@
+from unittest import TestCase
+
+import mock
+
+from vinfra import exceptions
+from vinfra.api import base
+from vinfra.api.compute.desired_state import Operation, StatePlanner
+
+
+def _resource(**info):
+    return base.Resource(mock.Mock(), info)
+
+
+class TestStatePlanner(TestCase):
+    def setUp(self):
+        super(TestStatePlanner, self).setUp()
+        self.compute = mock.Mock()
+        self.compute.api.session.auth.project_id = 'p1'
+        self.compute.flavors.list.return_value = [
+            _resource(id='f1', name='small', vcpus=1, ram=1024, swap=''),
+            _resource(id='f2', name='large', vcpus=8, ram=8192, swap=''),
+        ]
+        self.compute.security_groups.list.return_value = [
+            _resource(id='sg1', name='default', description='Default',
+                      project_id='p1'),
+            _resource(id='sg2', name='web', description='Web',
+                      project_id='p1'),
+            _resource(id='sg3', name='web', description='Web',
+                      project_id='p2'),
+            _resource(id='sg4', name='old', project_id='p1'),
+        ]
+        self.compute.security_group_rules.list.return_value = [
+            _resource(id='r1', security_group_id='sg2', direction='ingress',
+                      ethertype='IPv4', protocol='tcp', port_range_min=80,
+                      port_range_max=80, remote_ip_prefix=None,
+                      remote_group_id=None),
+            _resource(id='r2', security_group_id='sg2', direction='egress',
+                      ethertype='IPv4', protocol=None, port_range_min=None,
+                      port_range_max=None, remote_ip_prefix=None,
+                      remote_group_id=None),
+            _resource(id='r3', security_group_id='sg2', direction='ingress',
+                      ethertype='IPv4', protocol='tcp', port_range_min=22,
+                      port_range_max=22, remote_ip_prefix=None,
+                      remote_group_id=None),
+        ]
+        self.compute.quotas.show.return_value = _resource(
+            compute={'cores': {'limit': 10}},
+            storage={'storage_policies': {'default': {'limit': 100}}})
+        self.state = {
+            'flavors': [{'name': 'small', 'vcpus': 1, 'ram': 1024},
+                        {'name': 'large', 'vcpus': 16, 'ram': 8192}],
+            'security_groups': [
+                {'name': 'web', 'description': 'Web',
+                 'rules': [{'direction': 'ingress', 'protocol': 'tcp',
+                            'port_range_min': 80, 'port_range_max': 80},
+                           {'direction': 'ingress', 'remote_group': 'db'}]},
+                {'name': 'db', 'rules': [
+                    {'direction': 'ingress', 'remote_group': 'web'}]},
+            ],
+            'quotas': [{'project': 'p1', 'compute_cores': 10,
+                        'storage_policies': {'default': 200}}],
+        }
+
+    def _plan(self, **kwargs):
+        plan = StatePlanner(self.compute, self.state, **kwargs).plan()
+        return dict(((op.action, op.kind, op.name), op) for op in plan)
+
+    def test_plan(self):
+        ops = self._plan()
+        self.assertEqual(set([
+            ('delete', 'flavor', 'large'),
+            ('create', 'flavor', 'large'),
+            ('create', 'security group', 'db'),
+            ('create', 'security group rule', 'web: ingress IPv4 any db'),
+            ('create', 'security group rule', 'db: ingress IPv4 any web'),
+            ('update', 'quota', 'p1'),
+        ]), set(ops))
+        # every resource type is fetched once
+        self.compute.flavors.list.assert_called_once_with()
+        self.compute.security_group_rules.list.assert_called_once_with(
+            limit=-1)
+
+        replace = ops[('create', 'flavor', 'large')]
+        self.assertEqual({'vcpus': (8, 16)}, replace.changes)
+        self.assertEqual([ops[('delete', 'flavor', 'large')]],
+                         replace.requires)
+        self.assertEqual([ops[('create', 'security group', 'db')]],
+                         ops[('create', 'security group rule',
+                              'db: ingress IPv4 any web')].requires)
+        self.assertEqual({'storage_policies.default': (100, 200)},
+                         ops[('update', 'quota', 'p1')].changes)
+
+    def test_prune(self):
+        del self.state['flavors']
+        ops = self._plan(prune=True)
+        self.assertIn(('delete', 'security group rule', 'web: r3'), ops)
+        # the default egress rule is kept while no egress rules are listed
+        self.assertNotIn(('delete', 'security group rule', 'web: r2'), ops)
+        self.assertIn(('delete', 'security group', 'old'), ops)
+        self.assertNotIn(('delete', 'security group', 'default'), ops)
+        # groups of other projects are left alone
+        self.assertEqual([('delete', 'security group', 'old')],
+                         [key for key in ops if key[:2] == ('delete',
+                                                            'security group')])
+        self.assertFalse([key for key in ops if key[1] == 'flavor'])
+
+        self.state['security_groups'][0]['rules'].append(
+            {'direction': 'egress', 'protocol': 'tcp'})
+        ops = self._plan(prune=True)
+        self.assertIn(('delete', 'security group rule', 'web: r2'), ops)
+
+    def test_prune_unscoped(self):
+        self.compute.api.session.auth.project_id = None
+        del self.state['flavors']
+        self.state['security_groups'] = [{'name': 'default'}]
+        ops = self._plan(prune=True)
+        self.assertFalse([key for key in ops
+                          if key[:2] == ('delete', 'security group')])
+
+    def test_execute(self):
+        created = _resource(id='sg3', name='db')
+        self.compute.security_groups.create.return_value = created
+        self.compute.flavors.delete.side_effect = exceptions.VinfraError(
+            'flavor is in use')
+        plan = StatePlanner(self.compute, self.state).plan()
+
+        operations = plan.execute(concurrency=4)
+        states = dict(((op.action, op.kind, op.name), op.state)
+                      for op in operations)
+        self.assertEqual(Operation.FAILED,
+                         states[('delete', 'flavor', 'large')])
+        self.assertEqual(Operation.SKIPPED,
+                         states[('create', 'flavor', 'large')])
+        self.assertEqual(Operation.DONE,
+                         states[('create', 'security group rule',
+                                 'db: ingress IPv4 any web')])
+        # the rule of the new group is created in the group
+        self.compute.security_group_rules.create.assert_any_call(
+            created, 'ingress', remote_group=self.compute.security_groups
+            .list.return_value[1], ethertype=None, protocol=None,
+            port_range_min=None, port_range_max=None, remote_ip_prefix=None)
+
+    def test_invalid_state(self):
+        self.assertRaises(exceptions.VinfraError, StatePlanner,
+                          self.compute, {'networks': []})
+        self.assertRaises(exceptions.VinfraError, StatePlanner,
+                          self.compute, {'flavors': [{'name': 'small'}]})
@@ -0,0 +1,82 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+from unittest import TestCase
+
+import mock
+
+from vinfra.export import SqliteExport
+
+
+def _resource(**data):
+    return mock.Mock(id=data['id'], **{'to_dict.return_value': data})
+
+
+class TestSqliteExport(TestCase):
+    def setUp(self):
+        super(TestSqliteExport, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'inventory.db')
+        self.servers = [
+            _resource(id='s1', name='web', status='ACTIVE',
+                      updated_at='2024-01-02T00:00:00', metadata={'a': 1}),
+            _resource(id='s2', name='db', status='ACTIVE',
+                      updated_at='2024-01-01T00:00:00', metadata={}),
+        ]
+        self.api = mock.Mock()
+        self.api.compute.servers.list.return_value = self.servers
+        self.api.nodes.list.return_value = [
+            _resource(id='n1', host='node1', is_assigned=True)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        super(TestSqliteExport, self).tearDown()
+
+    def _query(self, sql):
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute(sql).fetchall()
+        finally:
+            conn.close()
+
+    def test_full_export(self):
+        results = SqliteExport(self.api, self.path,
+                               tables=['servers', 'nodes']).run()
+
+        self.assertEqual({('servers', 'full', 2, 2), ('nodes', 'full', 1, 1)},
+                         set((r['table'], r['mode'], r['rows'], r['total'])
+                             for r in results))
+        self.api.compute.servers.list.assert_called_once_with(limit=-1)
+        self.assertEqual(
+            [('web', 1)],
+            self._query("SELECT name, json_extract(data, '$.metadata.a') "
+                        "FROM servers WHERE status = 'ACTIVE' AND "
+                        "updated_at > '2024-01-01T00:00:00'"))
+        self.assertEqual([('node1', 1)],
+                         self._query('SELECT host, is_assigned FROM nodes'))
+
+    def test_incremental_export(self):
+        SqliteExport(self.api, self.path, tables=['servers']).run()
+
+        self.api.compute.servers.list.reset_mock()
+        self.api.compute.servers.list.return_value = [
+            _resource(id='s3', name='new', status='BUILD',
+                      updated_at='2024-01-03T00:00:00'),
+            _resource(id='s1', name='web', status='SHUTOFF',
+                      updated_at='2024-01-02T00:00:00'),
+            _resource(id='s2', name='db', status='ACTIVE',
+                      updated_at='2024-01-01T00:00:00'),
+        ]
+        results = SqliteExport(self.api, self.path, tables=['servers']).run()
+
+        self.api.compute.servers.list.assert_called_once_with(
+            limit=SqliteExport.page_size, marker=None, sort='updated_at:desc')
+        self.assertEqual([('servers', 'incremental', 2, 3)],
+                         [(r['table'], r['mode'], r['rows'], r['total'])
+                          for r in results])
+        self.assertEqual(
+            [('s1', 'SHUTOFF'), ('s2', 'ACTIVE'), ('s3', 'BUILD')],
+            self._query('SELECT id, status FROM servers ORDER BY id'))
+        self.assertEqual([('2024-01-03T00:00:00',)], self._query(
+            "SELECT updated_at FROM _export WHERE name = 'servers'"))
@@ -0,0 +1,47 @@
+from unittest import TestCase
+
+import mock
+
+from vinfra.api.nodes import NodeManager
+
+
+def _node(node_id):
+    node = mock.Mock(id=node_id, ID_ATTR='id')
+    node.to_dict.return_value = {'id': node_id, 'host': node_id}
+    node.disks_manager.list.return_value = [
+        mock.Mock(**{'to_dict.return_value': {'device': 'sda'}})]
+    node.ifaces_manager.list.return_value = [
+        mock.Mock(**{'to_dict.return_value': {'name': 'eth0'}})]
+    node.iscsi_manager.get.return_value = None
+    return node
+
+
+class TestNodeInventory(TestCase):
+    def setUp(self):
+        super(TestNodeInventory, self).setUp()
+        self.nodes = [_node('node{}'.format(idx)) for idx in range(4)]
+        self.manager = NodeManager(mock.Mock())
+        self.manager.list = mock.Mock(return_value=self.nodes)
+
+    def test_snapshot(self):
+        inventory = self.manager.snapshot(concurrency=2)
+
+        self.manager.list.assert_called_once_with()
+        self.assertEqual({
+            'id': 'node1', 'host': 'node1', 'disks': [{'device': 'sda'}],
+            'ifaces': [{'name': 'eth0'}], 'iscsi_target': None,
+        }, inventory.to_dict()['nodes'][1])
+        self.assertEqual(
+            {'nodes', 'disks', 'ifaces', 'iscsi', 'total'},
+            set(inventory.timings))
+
+    def test_errors_recorded(self):
+        self.nodes[2].disks_manager.list.side_effect = Exception('offline')
+        inventory = self.manager.snapshot(nodes=self.nodes[1:3],
+                                          phases=['disks'])
+
+        self.manager.list.assert_not_called()
+        self.assertEqual({'node2': {'disks': 'offline'}}, inventory.errors)
+        self.assertIsNone(inventory.get_disks('node2'))
+        self.assertEqual(1, len(inventory.get_disks(self.nodes[1])))
+        self.assertNotIn('ifaces', inventory.node_to_dict(self.nodes[1]))
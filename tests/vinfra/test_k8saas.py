@@ -0,0 +1,109 @@
+from unittest import TestCase
+
+import mock
+
+from vinfra import exceptions
+from vinfra.api.compute.k8saas import (K8saasCluster, K8saasClusterManager,
+                                       K8saasNodeGroup)
+
+
+class FakeK8saasBackend(object):
+    def __init__(self):
+        self.clusters = {}
+        self.nodegroups = {}
+        self.health = {}
+        self.list_calls = []
+
+    def add_cluster(self, name, status='ACTIVE', nodegroups=(), agents=()):
+        self.clusters[name] = {'id': name, 'name': name, 'status': status,
+                               'updated_at': None}
+        self.nodegroups[name] = dict(
+            (ng_name, {'id': '{}-{}'.format(name, ng_name), 'name': ng_name,
+                       'status': ng_status, 'node_count': 1})
+            for ng_name, ng_status in nodegroups)
+        self.health[name] = {'nodegroups': [{'servers': [
+            {'id': server_id, 'agent_status': agent_status}
+            for server_id, agent_status in agents]}]}
+
+    def get(self, url, **kwargs):  # pylint: disable=unused-argument
+        parts = url.split('/')
+        if parts[-1] == 'health':
+            if parts[-2] == 'broken':
+                raise exceptions.VinfraError('health is unavailable')
+            return self.health[parts[-2]]
+        if parts[-1] == 'nodegroups':
+            self.list_calls.append(parts[-2])
+            return [dict(ng) for ng in self.nodegroups[parts[-2]].values()]
+        if parts[-1] in self.clusters:
+            return dict(self.clusters[parts[-1]])
+        return [dict(cluster) for cluster in self.clusters.values()]
+
+    def patch(self, url, json=None, **kwargs):
+        parts = url.split('/')
+        cluster, nodegroup_id = parts[-3], parts[-1]
+        for nodegroup in self.nodegroups[cluster].values():
+            if nodegroup['id'] == nodegroup_id:
+                # the requested values are stored before the update starts
+                nodegroup.update(json or {})
+                return dict(nodegroup)
+        raise exceptions.VinfraError('not found')
+
+
+class TestK8saasFleet(TestCase):
+    def setUp(self):
+        super(TestK8saasFleet, self).setUp()
+        self.backend = FakeK8saasBackend()
+        api = mock.Mock(api_version=mock.MagicMock(__lt__=lambda *_: False))
+        self.manager = K8saasClusterManager(api)
+        client = mock.patch('vinfra.api.compute.base.BaseClient',
+                            return_value=self.backend)
+        client.start()
+        self.addCleanup(client.stop)
+
+    def _cluster(self, name):
+        return K8saasCluster(self.manager, dict(self.backend.clusters[name]))
+
+    def test_fleet_health(self):
+        self.backend.add_cluster('k1', nodegroups=[('workers', 'ACTIVE')],
+                                 agents=[('s1', 'active')])
+        self.backend.add_cluster('k2', nodegroups=[('workers', 'ACTIVE'),
+                                                   ('gpu', 'UPDATING')],
+                                 agents=[('s2', 'active'), ('s3', 'down')])
+        self.backend.add_cluster('broken')
+
+        summaries = dict((summary['name'], summary) for summary in
+                         self.manager.fleet_health(concurrency=2))
+
+        self.assertTrue(summaries['k1']['healthy'])
+        self.assertEqual(1, summaries['k1']['servers'])
+        self.assertFalse(summaries['k2']['healthy'])
+        self.assertEqual(['gpu'], summaries['k2']['workergroups_not_active'])
+        self.assertEqual(['s3'], summaries['k2']['servers_not_responding'])
+        self.assertFalse(summaries['broken']['healthy'])
+        self.assertEqual('health is unavailable', summaries['broken']['error'])
+
+    @mock.patch('time.sleep')
+    def test_update_nodegroups(self, sleep):
+        self.backend.add_cluster('k1', nodegroups=[('a', 'ACTIVE'),
+                                                   ('b', 'ACTIVE')])
+        self.backend.add_cluster('k2', nodegroups=[('a', 'ACTIVE')])
+        updates = []
+        for cluster, name in [('k1', 'a'), ('k1', 'b'), ('k2', 'a')]:
+            manager = self._cluster(cluster).nodegroups_manager
+            nodegroup = K8saasNodeGroup(
+                manager, dict(self.backend.nodegroups[cluster][name]))
+            updates.append((nodegroup, {'node_count': 3}))
+
+        task = self.manager.update_nodegroups_async(updates)
+
+        def start_update(_):
+            for cluster in self.backend.clusters.values():
+                cluster['updated_at'] = 'now'
+            self.backend.nodegroups['k2']['a']['status'] = 'UPDATE_FAILED'
+        sleep.side_effect = start_update
+
+        results = task.wait()
+        # worker groups are not listed until the update has started
+        self.assertEqual(['k1', 'k2'], sorted(self.backend.list_calls))
+        self.assertEqual(['k1-a', 'k1-b'], [r.id for r in results[:2]])
+        self.assertIsInstance(results[2], exceptions.VinfraError)
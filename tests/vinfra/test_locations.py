@@ -0,0 +1,42 @@
+from unittest import TestCase
+
+import mock
+
+from vinfra.api.locations import RacksManager, RowsManager
+from vinfra.api.locations.loc_types import Rack, Row
+
+NODE_ID = '5c0a1b2c-3d4e-4f50-8a6b-7c8d9e0f1a2b'
+
+
+class TestLocations(TestCase):
+    def _manager(self, manager_class, data):
+        api = mock.Mock()
+        api.client.get.return_value = data
+        return manager_class(api)
+
+    def test_schema_cached_per_class(self):
+        self.assertIs(Rack.schema(), Rack.schema())
+        self.assertIsNot(Rack.schema(), Row.schema())
+        self.assertIsNot(Rack.schema(), Rack.schema(strict=False))
+        self.assertIsInstance(Rack.schema(), Rack.Schema)
+
+    def test_list(self):
+        manager = self._manager(RacksManager, [
+            {'id': 1, 'name': 'rack1', 'parent': 3, 'children': [NODE_ID]},
+            {'id': 2, 'name': 'rack2', 'parent': 3},
+        ])
+        Rack.schema()
+        with mock.patch.object(Rack, 'Schema') as schema_class:
+            racks = manager.list()
+            repr(racks[0])
+        schema_class.assert_not_called()
+
+        self.assertEqual([1, 2], [rack.id for rack in racks])
+        self.assertEqual([], racks[1].nodes)
+        self.assertEqual(
+            {'id': 1, 'name': 'rack1', 'parent': 3, 'nodes': [NODE_ID]},
+            racks[0].to_dict())
+
+    def test_list_invalid(self):
+        manager = self._manager(RowsManager, [{'id': 1, 'name': 'row1'}])
+        self.assertRaises(Exception, manager.list)
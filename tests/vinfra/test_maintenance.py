@@ -0,0 +1,106 @@
+import functools
+import json
+from unittest import TestCase
+
+import mock
+
+from vinfra import exceptions
+from vinfra.api.nodes import NodeManager
+from vinfra.api.tasks import TaskManager
+
+
+class FakeBackend(object):
+    def __init__(self):
+        self.tasks = {}
+        self.calls = []
+
+    def submit(self, node, operation):
+        self.calls.append((operation, node.id))
+        task_id = 'task{}'.format(len(self.tasks))
+        self.tasks[task_id] = 'success'
+        return mock.Mock(data={'task_id': task_id})
+
+    def list_tasks(self, url, **kwargs):  # pylint: disable=unused-argument
+        return [{'task_id': task_id, 'name': 'maintenance', 'state': state}
+                for task_id, state in self.tasks.items()]
+
+
+class TestRollingMaintenance(TestCase):
+    def setUp(self):
+        super(TestRollingMaintenance, self).setUp()
+        self.backend = FakeBackend()
+        api = mock.Mock()
+        api.client.get.side_effect = self.backend.list_tasks
+        api.tasks = TaskManager(api)
+        self.manager = NodeManager(api)
+        self.nodes = [self._node(idx) for idx in range(4)]
+        self.racks = {'node0': 'rack1', 'node1': 'rack1', 'node2': 'rack1',
+                      'node3': 'rack2'}
+        self.saved = []
+
+    def _node(self, idx):
+        node = mock.Mock(id='node{}'.format(idx), host='host{}'.format(idx),
+                         is_primary=idx == 0, ID_ATTR='id')
+        for operation in ('maintenance_precheck', 'maintenance_start',
+                          'maintenance_stop'):
+            getattr(node, operation).side_effect = functools.partial(
+                self.backend.submit, node, operation)
+        return node
+
+    def _save(self, state):
+        # states are saved as JSON by the command
+        self.saved.append(json.loads(json.dumps(state)))
+
+    @mock.patch('time.sleep')
+    def test_resume(self, sleep):  # pylint: disable=unused-argument
+        action = mock.Mock(side_effect=[None, Exception('update failed'),
+                                        None, None, None])
+        maintenance = self.manager.rolling_maintenance(
+            self.nodes, batch_size=2, action=action, on_change=self._save,
+            failure_domains=self.racks)
+        self.assertRaises(exceptions.VinfraError, maintenance.run)
+
+        state = self.saved[-1]
+        self.assertEqual([['node1', 'node2'], ['node3'], ['node0']],
+                         state['batches'])
+        self.assertEqual('maintenance', state['nodes']['node2']['phase'])
+        self.assertEqual('update failed', state['nodes']['node2']['error'])
+
+        del self.backend.calls[:]
+        maintenance = self.manager.rolling_maintenance(
+            self.nodes, batch_size=2, action=action, state=state,
+            on_change=self._save)
+        state = maintenance.run()
+
+        self.assertEqual(['done'] * 4, [state['nodes'][node.id]['phase']
+                                        for node in self.nodes])
+        # the failed node resumes from the action, prechecks are not rerun
+        self.assertEqual([
+            ('maintenance_stop', 'node1'), ('maintenance_stop', 'node2'),
+            ('maintenance_start', 'node3'), ('maintenance_stop', 'node3'),
+            ('maintenance_start', 'node0'), ('maintenance_stop', 'node0'),
+        ], self.backend.calls)
+
+    @mock.patch('time.sleep')
+    def test_blocked(self, sleep):  # pylint: disable=unused-argument
+        self.nodes[3].maintenance_precheck.side_effect = Exception('no quorum')
+        maintenance = self.manager.rolling_maintenance(self.nodes)
+        self.assertRaises(exceptions.VinfraError, maintenance.run)
+        self.assertEqual([], [call for call in self.backend.calls
+                              if call[0] != 'maintenance_precheck'])
+
+        maintenance = self.manager.rolling_maintenance(
+            self.nodes, batch_size=3, skip_blocked=True,
+            failure_domains=self.racks)
+        state = maintenance.run()
+        self.assertEqual([['node1', 'node2'], ['node0']], state['batches'])
+        self.assertEqual('blocked', state['nodes']['node3']['phase'])
+
+    def test_schedule_failure_domains(self):
+        self.racks.update(node2='rack2', node3='rack1')
+        self.nodes.extend(self._node(idx) for idx in range(4, 6))
+        maintenance = self.manager.rolling_maintenance(
+            self.nodes, batch_size=3, failure_domains=self.racks)
+        # a batch takes down one rack, nodes out of racks go one by one
+        self.assertEqual([['node1', 'node3'], ['node2'], ['node4'],
+                          ['node5'], ['node0']], maintenance.schedule())
@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+import mock
+from requests import exceptions as request_exceptions
+
+from vinfra import exceptions
+from vinfra.api.nodes.join import NodeJoin
+from vinfra.api.tasks import TaskManager
+
+
+def _node(idx, **kwargs):
+    attrs = dict(id='node{}'.format(idx), host='host{}'.format(idx),
+                 is_assigned=False, is_online=True, ID_ATTR='id')
+    attrs.update(kwargs)
+    return mock.Mock(**attrs)
+
+
+def _busy_error():
+    response = mock.Mock(status_code=503, headers={'Retry-After': '0'})
+    return request_exceptions.HTTPError(response=response)
+
+
+class TestNodeJoin(TestCase):
+    def setUp(self):
+        super(TestNodeJoin, self).setUp()
+        self.cluster = mock.Mock()
+        self.api = self.cluster.manager.api
+        self.api.tasks = TaskManager(self.api)
+        self.tasks = {}
+        self.api.client.get.side_effect = self._list_tasks
+        self.submitted = []
+        self.cluster.join_node_async.side_effect = self._join
+
+    def _list_tasks(self, url, **kwargs):  # pylint: disable=unused-argument
+        rv = [dict(task_id=task_id, name='join', state=state)
+              for task_id, state in self.tasks.items()]
+        # every poll finishes the running tasks
+        for task_id in self.tasks:
+            self.tasks[task_id] = 'success'
+        return rv
+
+    def _join(self, node, disks=None):  # pylint: disable=unused-argument
+        if node.id == 'node1' and 'busy' not in self.submitted:
+            self.submitted.append('busy')
+            raise _busy_error()
+        if node.id == 'node4':
+            raise request_exceptions.ConnectionError('connection reset')
+        running = [state for state in self.tasks.values()
+                   if state == 'running']
+        self.assertLess(len(running), 2)
+        self.submitted.append(node.id)
+        task_id = 'task-{}'.format(node.id)
+        self.tasks[task_id] = 'running'
+        return mock.Mock(data={'task_id': task_id})
+
+    @mock.patch('time.sleep')
+    def test_join(self, sleep):  # pylint: disable=unused-argument
+        nodes = [_node(idx) for idx in range(5)]
+        join = NodeJoin(self.cluster, nodes, disks={'node2': ['sda']},
+                        concurrency=2)
+        results = join.run()
+
+        self.assertEqual(['node0', 'busy', 'node1', 'node2', 'node3'],
+                         self.submitted)
+        self.assertEqual(['success'] * 4 + ['failed'],
+                         [result['state'] for result in results])
+        # a node failing to be submitted does not stop the others
+        self.assertEqual('connection reset', results[4]['error'])
+        self.cluster.join_node_async.assert_any_call(nodes[2], disks=['sda'])
+        self.cluster.set_join_config.assert_called_once_with(nodes[2],
+                                                             ['sda'])
+        self.assertEqual(4, self.cluster.get_join_config.call_count)
+
+    def test_validation(self):
+        self.cluster.set_join_config.side_effect = Exception('no disks')
+        nodes = [_node(0, is_assigned=True), _node(1, is_online=False),
+                 _node(2)]
+        join = NodeJoin(self.cluster, nodes, disks={'node2': ['sdz']},
+                        concurrency=1)
+
+        with self.assertRaises(exceptions.VinfraError) as ctx:
+            join.run()
+        self.assertIn('host0: already in the cluster', str(ctx.exception))
+        self.assertIn('host1: offline', str(ctx.exception))
+        self.assertIn('host2: failed to get join configuration: no disks',
+                      str(ctx.exception))
+        self.cluster.join_node_async.assert_not_called()
@@ -0,0 +1,87 @@
+import threading
+from unittest import TestCase
+
+import mock
+
+from vinfra.client import Client
+from vinfra.request_cache import RequestCache, expire_cached_requests
+
+
+class FakeSession(object):
+    def __init__(self):
+        self.requests = []
+        self.lock = threading.Lock()
+        self.release = threading.Event()
+        self.release.set()
+
+    def request(self, method, url, **kwargs):  # pylint: disable=unused-argument
+        with self.lock:
+            self.requests.append((method, url))
+        self.release.wait()
+        return mock.Mock(headers={'Content-Type': 'application/json'},
+                         text='x', json=lambda: {'url': url})
+
+
+class TestRequestCache(TestCase):
+    def setUp(self):
+        super(TestRequestCache, self).setUp()
+        self.session = FakeSession()
+        self.api = mock.Mock(session=self.session,
+                             request_cache=RequestCache())
+        self.client = Client(self.api)
+
+    def test_memoize(self):
+        self.client.get('/nodes')
+        self.client.get('/nodes')
+        self.assertEqual(2, len(self.session.requests))
+
+        with self.api.request_cache:
+            data = self.client.get('/nodes')
+            data['url'] = 'changed'
+            self.assertEqual({'url': '/api/v2/nodes'},
+                             self.client.get('/nodes/'))
+            self.client.get('/nodes', query_params={'limit': 1})
+        self.assertEqual(4, len(self.session.requests))
+
+        with self.api.request_cache:
+            self.client.get('/nodes')
+        self.assertEqual(5, len(self.session.requests))
+
+    def test_invalidate(self):
+        with self.api.request_cache:
+            self.client.get('/compute/servers')
+            self.client.get('/tasks')
+            self.client.post('/compute/networks', json={})
+            self.client.get('/compute/servers')
+            self.client.get('/tasks')
+            self.client.get('/tasks')
+            expire_cached_requests()
+            self.client.get('/tasks')
+        # any mutating request expires all the responses
+        self.assertEqual([
+            ('get', '/api/v2/compute/servers'),
+            ('get', '/api/v2/tasks'),
+            ('post', '/api/v2/compute/networks'),
+            ('get', '/api/v2/compute/servers'),
+            ('get', '/api/v2/tasks'),
+            ('get', '/api/v2/tasks'),
+        ], self.session.requests)
+
+    def test_single_flight(self):
+        self.session.release.clear()
+        results = []
+
+        def get():
+            results.append(self.client.get('/clusters'))
+
+        with self.api.request_cache:
+            threads = [threading.Thread(target=get) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            while not self.session.requests:
+                threading.Event().wait(0.01)
+            self.session.release.set()
+            for thread in threads:
+                thread.join()
+        self.assertEqual([('get', '/api/v2/clusters')], self.session.requests)
+        self.assertEqual([{'url': '/api/v2/clusters'}] * 4, results)
@@ -0,0 +1,53 @@
+from unittest import TestCase
+
+import mock
+
+from vinfra.api.compute.sampler import SampleBuffer, StatSampler, flatten_stat
+
+
+def _server(server_id):
+    server = mock.Mock(id=server_id, ID_ATTR='id')
+    server.name = 'vm-{}'.format(server_id)
+    return server
+
+
+class TestStatSampler(TestCase):
+    def test_flatten_stat(self):
+        self.assertEqual(
+            {'cpu.usage': 10, 'disks.0.read': 1, 'disks.1.read': 2},
+            flatten_stat({'cpu': {'usage': 10},
+                          'disks': [{'read': 1}, {'read': 2}]}))
+
+    def test_buffer(self):
+        buf = SampleBuffer(2)
+        buf.append(1, {'cpu': 1})
+        buf.append(2, {'cpu': 2, 'mem': 20})
+        buf.append(3, {'mem': 30})
+        self.assertEqual(2, len(buf))
+        self.assertEqual([(2, {'cpu': 2, 'mem': 20}),
+                          (3, {'cpu': None, 'mem': 30})], buf.samples())
+        self.assertEqual([(2, 20), (3, 30)], buf.series('mem'))
+        self.assertEqual([], buf.series('disk'))
+
+    @mock.patch('time.sleep')
+    def test_rounds(self, sleep):
+        servers = [_server(idx) for idx in range(5)]
+        manager = mock.Mock()
+
+        def stat(server):
+            if server.id == 3:
+                raise Exception('not running')
+            return {'cpu': {'usage': server.id}}
+
+        manager.stat.side_effect = stat
+        sampler = StatSampler(manager, servers, interval=10, count=3,
+                              concurrency=2, history=2)
+        rounds = list(sampler)
+
+        self.assertEqual(3, len(rounds))
+        self.assertEqual(2, sleep.call_count)
+        self.assertEqual(15, manager.stat.call_count)
+        self.assertEqual('not running', rounds[0][3].error)
+        self.assertEqual({'cpu.usage': 4}, rounds[2][4].values)
+        self.assertEqual(2, len(sampler.buffers[1]))
+        self.assertEqual(0, len(sampler.buffers[3]))
@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+import mock
+
+from vinfra import exceptions
+from vinfra.api.compute.servers import Server, ServerManager
+
+
+class FakeServersBackend(object):
+    def __init__(self):
+        self.servers = {}
+        self.list_calls = []
+
+    def post(self, url, json=None, **kwargs):  # pylint: disable=unused-argument
+        if json['name'] == 'fail':
+            raise exceptions.VinfraError('quota exceeded')
+        server_id = 'id-{}'.format(json['name'])
+        self.servers[server_id] = {'id': server_id, 'name': json['name'],
+                                   'status': 'BUILD', 'traits': []}
+        return dict(self.servers[server_id])
+
+    def get(self, url, query_params=None, **kwargs):  # pylint: disable=unused-argument
+        ids = query_params['id'][len('in:'):].split(',')
+        self.list_calls.append(ids)
+        return [dict(self.servers[server_id]) for server_id in ids]
+
+
+class TestCreateMany(TestCase):
+    def setUp(self):
+        super(TestCreateMany, self).setUp()
+        self.backend = FakeServersBackend()
+        self.manager = ServerManager(mock.Mock())
+        client = mock.patch('vinfra.api.compute.base.BaseClient',
+                            return_value=self.backend)
+        client.start()
+        self.addCleanup(client.stop)
+
+    @mock.patch('time.sleep')
+    def test_create_many(self, sleep):
+        task = self.manager.create_many_async(
+            ['vm1', 'fail', 'vm2', 'vm3'], 'flavor',
+            [{'network_id': 'net'}], [{'source_type': 'blank'}],
+            concurrency=2)
+        self.assertEqual(4, len(task.get_info()))
+
+        self.backend.servers['id-vm1']['status'] = 'ACTIVE'
+        self.backend.servers['id-vm2']['status'] = 'ERROR'
+
+        def activate(_):
+            self.backend.servers['id-vm3']['status'] = 'ACTIVE'
+        sleep.side_effect = activate
+
+        results = task.wait()
+        self.assertIsInstance(results[0], Server)
+        self.assertEqual('ACTIVE', results[0].status)
+        self.assertIsInstance(results[1], exceptions.VinfraError)
+        self.assertIsInstance(results[2], exceptions.VinfraError)
+        self.assertEqual('id-vm3', results[3].id)
+        # status of all the servers is polled with one request
+        self.assertEqual([['id-vm1', 'id-vm2', 'id-vm3'], ['id-vm3']],
+                         self.backend.list_calls)
+
+    def test_shared_volume_rejected(self):
+        self.assertRaises(
+            exceptions.VinfraError, self.manager.create_many_async,
+            ['vm1', 'vm2'], 'flavor', [{'network_id': 'net'}],
+            [{'source_type': 'volume', 'uuid': 'volume'}])
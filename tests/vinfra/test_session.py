@@ -0,0 +1,193 @@
+import threading
+import time
+from unittest import TestCase
+
+import mock
+import requests
+
+from vinfra import exceptions
+from vinfra.session import Auth, Session
+
+PROJECT_ID = '5c0a1b2c-3d4e-4f50-8a6b-7c8d9e0f1a2b'
+
+
+def _json_response(data):
+    resp = mock.Mock()
+    resp.json.return_value = data
+    return resp
+
+
+def _http_error(status_code):
+    response = mock.Mock(status_code=status_code)
+    return requests.HTTPError(response=response)
+
+
+class TestProjectAuthenticate(TestCase):
+    def setUp(self):
+        super(TestProjectAuthenticate, self).setUp()
+        self.session = mock.Mock()
+        self.session.post.return_value = _json_response({'token': 'scoped'})
+
+    def test_project_id_skips_listing(self):
+        auth = Auth('admin', 'password', project=PROJECT_ID)
+        auth.make_scoped_authenticate(self.session)
+
+        self.assertEqual('scoped', auth.scoped_token)
+        self.assertEqual(PROJECT_ID, auth.project_id)
+        self.session.get.assert_not_called()
+        self.session.post.assert_called_once_with(
+            '/api/v2/accounts/projects/{}/auth'.format(PROJECT_ID),
+            authenticated=False, log=False)
+
+    def test_project_name_uses_filtered_lookup(self):
+        self.session.get.return_value = _json_response(
+            {'data': [{'id': PROJECT_ID, 'name': 'prj'}]})
+
+        auth = Auth('admin', 'password', project='prj')
+        auth.make_scoped_authenticate(self.session)
+        self.assertEqual(PROJECT_ID, auth.project_id)
+        self.session.get.assert_called_once_with(
+            '/api/v2/accounts/projects', authenticated=False,
+            params={'name': 'prj'})
+
+        # the resolution is reused by the next login
+        self.session.get.reset_mock()
+        auth.scoped_token = None
+        auth.make_scoped_authenticate(self.session)
+        self.session.get.assert_not_called()
+
+    def test_stale_project_id_is_resolved_again(self):
+        new_project_id = 'd1e2f3a4-b5c6-4d7e-8f90-a1b2c3d4e5f6'
+        self.session.get.return_value = _json_response(
+            {'data': [{'id': new_project_id, 'name': 'prj'}]})
+        self.session.post.side_effect = [
+            _http_error(404), _json_response({'token': 'scoped'})]
+
+        auth = Auth('admin', 'password', project='prj')
+        auth.project_id = PROJECT_ID
+        auth.make_scoped_authenticate(self.session)
+        self.assertEqual(new_project_id, auth.project_id)
+        self.assertEqual('scoped', auth.scoped_token)
+
+    def test_unknown_project(self):
+        self.session.get.side_effect = [
+            _json_response({'data': []}),
+            _json_response({'data': [{'id': PROJECT_ID, 'name': 'prj'}]}),
+        ]
+        auth = Auth('admin', 'password', project='other')
+        self.assertRaises(exceptions.VinfraError,
+                          auth.make_scoped_authenticate, self.session)
+
+
+class TestSessionRenewal(TestCase):
+    def _session(self, expires_in):
+        session = mock.Mock()
+        session.cookies = requests.cookies.RequestsCookieJar()
+        session.cookies.set('session', 'value',
+                            expires=int(time.time() + expires_in))
+        return session
+
+    def test_renew_before_expiration(self):
+        auth = Auth('admin', 'password', renew_margin=60)
+        self.assertFalse(auth.needs_reauthenticate(self._session(600)))
+        self.assertTrue(auth.needs_reauthenticate(self._session(30)))
+
+    def test_short_lived_session(self):
+        auth = Auth('admin', 'password', renew_margin=60)
+        auth.session_lifetime = 40
+        self.assertFalse(auth.needs_reauthenticate(self._session(30)))
+        self.assertTrue(auth.needs_reauthenticate(self._session(10)))
+
+    def test_single_renewal(self):
+        auth = Auth('admin', 'password')
+        auth.make_authenticate = mock.Mock()
+
+        generation = auth.generation
+        auth.renew(mock.Mock(), generation)
+        auth.generation += 1
+        # the session has been already renewed by another caller
+        auth.renew(mock.Mock(), generation)
+        auth.make_authenticate.assert_called_once()
+
+    def test_headers_generation(self):
+        auth = Auth('admin', 'password')
+
+        def login(_session):
+            auth.generation += 1
+        auth.make_authenticate = mock.Mock(side_effect=login)
+        auth.needs_reauthenticate = mock.Mock(return_value=True)
+
+        # the login made while building the headers is the one to renew
+        auth.get_headers(mock.Mock())
+        self.assertEqual(1, auth.headers_generation)
+        auth.renew(mock.Mock(), auth.headers_generation)
+        self.assertEqual(2, auth.make_authenticate.call_count)
+
+
+class FakeRequestsSession(object):
+    """Backend hosts: a list of responses or exceptions per host."""
+
+    def __init__(self, hosts):
+        self.hosts = hosts
+        self.requests = []
+        self.cookies = requests.cookies.RequestsCookieJar()
+        self.slow = threading.Event()
+
+    def request(self, method, url, **kwargs):  # pylint: disable=unused-argument
+        host = url.split('/')[2]
+        self.requests.append((method, host))
+        result = self.hosts[host]
+        if result == 'slow':
+            self.slow.wait(5)
+            result = 'slow'
+        if isinstance(result, Exception):
+            raise result
+        return mock.Mock(status_code=200, text=result, cookies=[],
+                         headers={})
+
+
+class TestEndpointFailover(TestCase):
+    def _session(self, hosts, **kwargs):
+        fake = FakeRequestsSession(hosts)
+        session = Session('https://vip:8888', auth=None, session=fake)
+        session.set_endpoints(['https://node1:8888', 'https://node2:8888'],
+                              **kwargs)
+        return session, fake
+
+    def test_failover(self):
+        refused = requests.exceptions.ConnectTimeout('refused')
+        session, fake = self._session({
+            'vip:8888': refused, 'node1:8888': refused, 'node2:8888': 'ok'})
+
+        resp = session.request('POST', '/api/v2/nodes', authenticated=False)
+        self.assertEqual('ok', resp.text)
+        self.assertEqual(['vip:8888', 'node1:8888', 'node2:8888'],
+                         [host for _, host in fake.requests])
+
+        # failed endpoints are not tried until they are up again
+        del fake.requests[:]
+        session.request('GET', '/api/v2/nodes', authenticated=False)
+        self.assertEqual([('GET', 'node2:8888')], fake.requests)
+
+    def test_no_failover_of_sent_requests(self):
+        reset = requests.exceptions.ConnectionError('reset')
+        session, fake = self._session({
+            'vip:8888': reset, 'node1:8888': 'ok', 'node2:8888': 'ok'})
+
+        self.assertRaises(requests.exceptions.ConnectionError,
+                          session.request, 'POST', '/api/v2/nodes',
+                          authenticated=False)
+        self.assertEqual(1, len(fake.requests))
+        resp = session.request('GET', '/api/v2/nodes', authenticated=False)
+        self.assertEqual('ok', resp.text)
+
+    def test_hedged_get(self):
+        session, fake = self._session(
+            {'vip:8888': 'slow', 'node1:8888': 'fast', 'node2:8888': 'ok'},
+            hedge_delay=0.05)
+        self.addCleanup(fake.slow.set)
+
+        started = time.time()
+        resp = session.request('GET', '/api/v2/nodes', authenticated=False)
+        self.assertEqual('fast', resp.text)
+        self.assertLess(time.time() - started, 1)
@@ -0,0 +1,103 @@
+import datetime
+from unittest import TestCase
+
+import mock
+
+from vinfra import exceptions
+from vinfra.api.tasks import TaskIndex, TaskManager
+from vinfra.progress import ProgressListener
+
+
+def _tasks(*states):
+    return [{'task_id': 't{}'.format(idx), 'name': 'node.release',
+             'state': state, 'created_at': '2024-01-0{}T00:00:00'.format(idx)}
+            for idx, state in enumerate(states, 1)]
+
+
+class TestTaskManager(TestCase):
+    def setUp(self):
+        super(TestTaskManager, self).setUp()
+        self.manager = TaskManager(mock.Mock())
+        self.client = self.manager.api.client = mock.Mock()
+        self.client.get.return_value = _tasks('success', 'running', 'failed')
+
+    def test_filters(self):
+        self.assertEqual(['t2'], [task.task_id for task in
+                                  self.manager.list(states=['running'])])
+        self.assertEqual(['t2', 't3'], [task.task_id for task in
+                                        self.manager.list(
+                                            name='node.*',
+                                            since=datetime.datetime(2024, 1, 2))])
+        self.assertEqual([], self.manager.list(name='cluster.*'))
+
+        index = self.manager.index()
+        self.assertEqual(1, index.count('failed'))
+        self.assertEqual(['t1', 't2'], [task.task_id for task in index.select(
+            states=['running', 'success'])])
+
+    @mock.patch('time.sleep')
+    def test_wait_many(self, sleep):
+        self.client.get.side_effect = [
+            _tasks('running', 'success'),
+            _tasks('success', 'success'),
+        ]
+        self.manager.max_task_gets = 0
+        tasks = self.manager.wait_many(['t2', 't1'])
+
+        self.assertEqual(['t2', 't1'], [task.task_id for task in tasks])
+        self.assertEqual(2, self.client.get.call_count)
+        sleep.assert_called_once_with(1)
+
+    @mock.patch('time.sleep')
+    def test_wait_many_gets(self, sleep):  # pylint: disable=unused-argument
+        tasks = dict((task['task_id'], task)
+                     for task in _tasks('success', 'failed'))
+        self.client.get.side_effect = lambda url, **kwargs: tasks[
+            url.rsplit('/', 1)[-1]]
+        self.assertRaises(exceptions.TaskError, self.manager.wait_many,
+                          ['t1', 't2'])
+        self.assertEqual(['/tasks/t1', '/tasks/t2'],
+                         [call[0][0] for call in
+                          self.client.get.call_args_list])
+
+    @mock.patch('vinfra.api.tasks.time')
+    def test_wait_many_shared_index(self, clock):
+        now = [100]
+        clock.time.side_effect = lambda: now[0]
+        clock.sleep.side_effect = lambda seconds: now.__setitem__(
+            0, now[0] + seconds)
+        self.client.get.side_effect = [
+            _tasks('running', 'success'),
+            _tasks('success', 'success'),
+        ]
+        index = TaskIndex(self.manager)
+        index.refresh()
+        tasks = self.manager.wait_many(['t2', 't1'], index=index)
+
+        # the listing made just before is reused for the first poll
+        self.assertEqual(['t2', 't1'], [task.task_id for task in tasks])
+        self.assertEqual(2, self.client.get.call_count)
+        clock.sleep.assert_called_once_with(1)
+
+    @mock.patch('time.sleep')
+    @mock.patch('vinfra.progress.time')
+    def test_wait_progress(self, clock, sleep):  # pylint: disable=unused-argument
+        clock.time.side_effect = [0, 10, 20, 30, 40]
+        self.client.get.side_effect = [
+            dict(task_id='t1', state='running', progress=10),
+            dict(task_id='t1', state='running', progress='40%'),
+            dict(task_id='t1', state='success', progress=100),
+        ]
+        events = []
+        with ProgressListener(events.append):
+            self.manager.wait('t1')
+
+        self.assertEqual(['start', 'progress', 'progress', 'progress',
+                          'finish'], [event['event'] for event in events])
+        # 30% in 10 seconds, so 60% left takes 20 seconds
+        self.assertEqual((40.0, 20.0), (events[2]['progress'],
+                                        events[2]['eta']))
+        self.assertEqual(('success', 0.0), (events[3]['state'],
+                                            events[3]['eta']))
+        self.assertEqual((40.0, None), (events[-1]['elapsed'],
+                                        events[-1]['error']))
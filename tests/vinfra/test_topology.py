@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+import mock
+
+from vinfra import exceptions
+from vinfra.api.network.topology import TopologyResolver
+from vinfra.api.nodes import NodeManager
+from vinfra.api.s3 import S3Api
+
+
+def _network(network_id, traffic_types):
+    return mock.Mock(id=network_id, traffic_types=traffic_types, ID_ATTR='id')
+
+
+def _iface(name, network):
+    iface = mock.Mock(network=network, ipv4=['10.0.0.1/24'])
+    iface.name = name
+    return iface
+
+
+def _node(node_id, ifaces):
+    node = mock.Mock(id=node_id, host='{}.vstoragedomain'.format(node_id),
+                     ID_ATTR='id')
+    node.ifaces_manager.list.return_value = [
+        _iface(name, network) for name, network in ifaces]
+    return node
+
+
+class TestTopologyResolver(TestCase):
+    def setUp(self):
+        super(TestTopologyResolver, self).setUp()
+        self.api = mock.Mock()
+        self.api.nodes = NodeManager(self.api)
+        self.api.networks.list.return_value = [
+            _network('public', ['SSH']),
+            _network('private', ['OSTOR private', 'Backup (ABGW) private']),
+        ]
+
+    def test_resolve(self):
+        nodes = [_node('node{}'.format(idx), [('eth0', 'public'),
+                                               ('eth1', 'private')])
+                 for idx in range(5)]
+        topology = TopologyResolver(self.api, concurrency=3)
+
+        ifaces = topology.resolve(nodes, 'OSTOR private')
+        self.assertEqual(['eth1'] * 5, [iface.name for iface in ifaces])
+
+        # the topology is reused within the operation
+        topology.resolve(nodes, 'Backup (ABGW) private')
+        self.api.networks.list.assert_called_once_with()
+        for node in nodes:
+            node.ifaces_manager.list.assert_called_once_with()
+
+    def test_all_errors_reported(self):
+        nodes = [_node('node1', [('eth1', 'private')]),
+                 _node('node2', [('eth0', 'public')]),
+                 _node('node3', [('eth0', 'public')])]
+        topology = TopologyResolver(self.api)
+
+        with self.assertRaises(exceptions.VinfraError) as ctx:
+            topology.resolve(nodes, 'OSTOR private')
+        message = str(ctx.exception)
+        self.assertNotIn('node1', message)
+        self.assertIn('node2', message)
+        self.assertIn('node3', message)
+
+    def test_fetch_error_raised(self):
+        node = _node('node1', [])
+        node.ifaces_manager.list.side_effect = Exception('offline')
+        topology = TopologyResolver(self.api)
+
+        with self.assertRaises(Exception) as ctx:
+            topology.resolve([node], 'OSTOR private')
+        self.assertEqual('offline', str(ctx.exception))
+
+    def test_network_not_found(self):
+        topology = TopologyResolver(self.api)
+        self.assertRaises(exceptions.VinfraError, topology.resolve,
+                          [], 'NFS')
+
+    def test_s3_adjust_nodes(self):
+        cluster = mock.Mock(id='cluster')
+        cluster.manager.api = self.api
+        nodes = [_node('node1', [('eth1', 'private')])]
+
+        self.assertEqual([{'id': 'node1', 'priv_net_if': 'eth1'}],
+                         S3Api(cluster)._adjust_nodes(nodes))  # pylint: disable=protected-access
@@ -0,0 +1,79 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+
+from six.moves import BaseHTTPServer, socketserver
+
+from vinfra import transport
+from vinfra.session import Session
+
+
+class BackendHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        body = json.dumps({
+            'path': self.path,
+            'cookie': self.headers.get('Cookie'),
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', 'session=secret; Path=/')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class UnixBackend(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        socketserver.UnixStreamServer.__init__(self, path, BackendHandler)
+        self.connections = 0
+
+    def get_request(self):
+        self.connections += 1
+        request, _ = socketserver.UnixStreamServer.get_request(self)
+        # BaseHTTPRequestHandler expects a client address tuple
+        return request, ('local', 0)
+
+
+class TestUnixTransport(TestCase):
+    def setUp(self):
+        super(TestUnixTransport, self).setUp()
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        self.path = os.path.join(tmp_dir, 'backend.sock')
+        self.backend = UnixBackend(self.path)
+        thread = threading.Thread(target=self.backend.serve_forever,
+                                  kwargs={'poll_interval': 0.05})
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.backend.server_close)
+        self.addCleanup(self.backend.shutdown)
+
+    def test_normalize_url(self):
+        url = transport.normalize_url('unix:///run/backend.sock')
+        self.assertEqual('http+unix://%2Frun%2Fbackend.sock', url)
+        self.assertEqual('/run/backend.sock', transport.get_socket_path(url))
+        self.assertEqual('https://node:8888',
+                         transport.normalize_url('https://node:8888'))
+
+    def test_requests(self):
+        session = Session('unix://' + self.path)
+        self.addCleanup(session.session.close)
+
+        data = session.get('/api/v2/tasks', authenticated=False).json()
+        self.assertEqual({'path': '/api/v2/tasks', 'cookie': None}, data)
+        data = session.get('/api/v2/tasks', authenticated=False,
+                           params={'limit': 1}).json()
+        self.assertEqual({'path': '/api/v2/tasks?limit=1',
+                          'cookie': 'session=secret'}, data)
+        # the connection is reused
+        self.assertEqual(1, self.backend.connections)
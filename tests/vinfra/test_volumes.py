@@ -0,0 +1,107 @@
+from unittest import TestCase
+
+import mock
+
+from vinfra import exceptions
+from vinfra.api.compute.volume_snapshots import VolumeSnapshotManager
+from vinfra.api.compute.volumes import Volume, VolumeManager
+
+
+class FakeVolumesBackend(object):
+    def __init__(self):
+        self.volumes = {}
+        self.list_calls = []
+
+    def post(self, url, json=None, **kwargs):  # pylint: disable=unused-argument
+        volume_id = 'id-{}'.format(json['name'])
+        self.volumes[volume_id] = {'id': volume_id, 'name': json['name'],
+                                   'status': 'creating'}
+        return dict(self.volumes[volume_id])
+
+    def get(self, url, query_params=None, **kwargs):  # pylint: disable=unused-argument
+        ids = query_params['id'][len('in:'):].split(',')
+        self.list_calls.append(ids)
+        return [dict(self.volumes[volume_id]) for volume_id in ids]
+
+
+class TestCreateMany(TestCase):
+    def setUp(self):
+        super(TestCreateMany, self).setUp()
+        self.backend = FakeVolumesBackend()
+        self.manager = VolumeManager(mock.Mock(), mock.Mock())
+        client = mock.patch('vinfra.api.compute.base.BaseClient',
+                            return_value=self.backend)
+        client.start()
+        self.addCleanup(client.stop)
+
+    @mock.patch('time.sleep')
+    def test_create_many(self, sleep):
+        task = self.manager.create_many_async(
+            ['vol1', 'vol2', 'vol3'], 1, 'default', concurrency=2)
+
+        self.backend.volumes['id-vol1']['status'] = 'available'
+        self.backend.volumes['id-vol2']['status'] = 'downloading'
+        self.backend.volumes['id-vol3']['status'] = 'deleting'
+
+        def download(_):
+            self.backend.volumes['id-vol2']['status'] = 'available'
+        sleep.side_effect = download
+
+        results = task.wait()
+        self.assertIsInstance(results[0], Volume)
+        self.assertEqual('id-vol2', results[1].id)
+        # unexpected status is a failure, not a pending one
+        self.assertIsInstance(results[2], exceptions.VinfraError)
+        self.assertEqual([['id-vol1', 'id-vol2', 'id-vol3'], ['id-vol2']],
+                         self.backend.list_calls)
+
+        report = task.get_report()
+        self.assertEqual(['available', 'available', 'deleting'],
+                         [item['status'] for item in report])
+        self.assertIsNone(report[0]['error'])
+        self.assertIn('deleting', report[2]['error'])
+
+    @mock.patch('time.sleep')
+    def test_clone_many(self, _sleep):
+        task = self.manager.clone_many_async('source', ['c1', 'c2'])
+        for volume in self.backend.volumes.values():
+            volume['status'] = 'available'
+
+        self.assertEqual(['id-c1', 'id-c2'], [v.id for v in task.wait()])
+
+
+class TestSnapshots(TestCase):
+    def setUp(self):
+        super(TestSnapshots, self).setUp()
+        self.manager = VolumeSnapshotManager(mock.Mock(), mock.Mock())
+        patcher = mock.patch('vinfra.api.compute.base.BaseClient')
+        self.client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+    def test_list_by_volume(self):
+        self.client.get.return_value = []
+        self.manager.list('vol1')
+        self.client.get.assert_called_once_with(
+            '/compute/volume_snapshots', query_params={},
+            params={'volume_id': 'vol1'})
+
+    @mock.patch('time.sleep')
+    def test_create_many(self, _sleep):
+        statuses = {'s1': ['creating', 'available'], 's2': ['error']}
+
+        def get(url, **kwargs):  # pylint: disable=unused-argument
+            snapshot_id = url.rsplit('/', 1)[-1]
+            return {'id': snapshot_id,
+                    'status': statuses[snapshot_id].pop(0)}
+        self.client.post.side_effect = [
+            {'id': 's1', 'status': 'creating'},
+            {'id': 's2', 'status': 'creating'}]
+        self.client.get.side_effect = get
+
+        task = self.manager.create_many_async(['vol1', 'vol1'],
+                                              concurrency=1)
+        results = task.wait()
+        self.assertEqual('s1', results[0].id)
+        self.assertIsInstance(results[1], exceptions.VinfraError)
+        # snapshots are polled one by one, never listed
+        self.assertEqual(3, self.client.get.call_count)
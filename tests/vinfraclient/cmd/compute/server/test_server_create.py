@@ -0,0 +1,50 @@
+import mock
+
+from tests import utils
+from vinfraclient.cmd.base import COMMAND_ERROR
+from vinfraclient.cmd.compute import server
+from vinfraclient.exceptions import ValidationError
+
+
+class TestCreateServerTemplate(utils.TestCommand):
+    def setUp(self):
+        super(TestCreateServerTemplate, self).setUp()
+        self.servers_mock = self.app.vinfra.compute.servers
+        self.cmd = server.CreateServer(self.app, None)
+        self.arglist = ['--network', 'private', '--volume',
+                        'source=blank,size=10', '--flavor', 'tiny',
+                        '--name-template', 'web-{index:02d}', '--count', '3']
+
+    @mock.patch('vinfraclient.utils.find_resource')
+    def test_create_many(self, find_resource):
+        find_resource.side_effect = lambda manager, name: mock.Mock(id=name)
+        task = self.servers_mock.create_many_async.return_value
+        task.get_report.return_value = [
+            {'id': '1', 'status': 'BUILD', 'error': None},
+            {'id': None, 'status': None, 'error': 'quota exceeded'},
+            {'id': '3', 'status': 'BUILD', 'error': None},
+        ]
+        parsed_args = self.check_parser(
+            self.cmd, self.arglist, [('name_template', 'web-{index:02d}'), ('name', None),
+             ('count', 3)])
+        columns, data = self.cmd.take_action(parsed_args)
+
+        args, kwargs = self.servers_mock.create_many_async.call_args
+        self.assertEqual((['web-01', 'web-02', 'web-03'], 'tiny'), args[:2])
+        self.assertNotIn('count', kwargs)
+        self.assertEqual(('web-01', 'web-02', 'web-03'), columns)
+        self.assertEqual({'error': 'quota exceeded'},
+                         data[1].machine_readable())
+        # a partial failure fails the command
+        self.assertEqual(COMMAND_ERROR, self.cmd.exit_code)
+
+    def test_template_requires_placeholder(self):
+        self.arglist[-3] = 'web'
+        parsed_args = self.check_parser(self.cmd, self.arglist, [])
+        self.assertRaises(ValidationError, self.cmd.take_action, parsed_args)
+
+    def test_template_and_name(self):
+        parsed_args = self.check_parser(
+            self.cmd, self.arglist + ['web'], [('name', 'web')])
+        self.assertRaises(ValidationError, self.cmd.take_action, parsed_args)
+        self.assertFalse(self.servers_mock.create_many_async.called)
@@ -0,0 +1,69 @@
+import datetime
+import json
+
+import mock
+from six.moves import StringIO
+
+from tests import utils
+from vinfra.api.compute.sampler import Sample
+from vinfraclient.cmd.compute import server
+from vinfraclient.exceptions import ValidationError
+
+
+def _sample(server_id, values=None, error=None):
+    return Sample(timestamp=datetime.datetime(2020, 10, 2, 15, 10, 11),
+                  server_id=server_id, server_name='vm-' + server_id,
+                  values=values, error=error)
+
+
+class TestStatServer(utils.TestCommand):
+    def setUp(self):
+        super(TestStatServer, self).setUp()
+        self.app.stdout = StringIO()
+        self.servers_mock = self.app.vinfra.compute.servers
+        self.servers_mock.sampler.return_value = [
+            [_sample('1', {'cpu.usage': 10}), _sample('2', error='failed')],
+            [_sample('1', {'cpu.usage': 20, 'mem.used': 1})],
+        ]
+        self.cmd = server.StatServer(self.app, None)
+
+    def test_stat_all_ndjson(self):
+        parsed_args = self.check_parser(
+            self.cmd, ['--all', '--interval', '10', '--count', '2'],
+            [('all', True), ('interval', 10), ('count', 2)])
+        self.cmd.take_action(parsed_args)
+
+        self.servers_mock.sampler.assert_called_once_with(
+            servers=None, interval=10, count=2, concurrency=None)
+        lines = self.app.stdout.getvalue().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertEqual({
+            'timestamp': '2020-10-02T15:10:11.000000+00:00',
+            'server_id': '1', 'server_name': 'vm-1', 'error': None,
+            'stat': {'cpu.usage': 10},
+        }, json.loads(lines[0]))
+
+    def test_stat_all_csv(self):
+        parsed_args = self.check_parser(
+            self.cmd, ['--all', '--stream-format', 'csv'], [])
+        self.cmd.take_action(parsed_args)
+
+        self.servers_mock.sampler.assert_called_once_with(
+            servers=None, interval=None, count=1, concurrency=None)
+        self.assertEqual([
+            'timestamp,server_id,server_name,error,cpu.usage',
+            '2020-10-02T15:10:11.000000+00:00,1,vm-1,,10',
+            '2020-10-02T15:10:11.000000+00:00,2,vm-2,failed,',
+            '2020-10-02T15:10:11.000000+00:00,1,vm-1,,20',
+        ], self.app.stdout.getvalue().splitlines())
+
+    def test_stat_requires_server(self):
+        parsed_args = self.check_parser(self.cmd, [], [])
+        self.assertRaises(ValidationError, self.cmd.take_action, parsed_args)
+
+    @mock.patch('vinfraclient.utils.find_resource')
+    def test_stat_one(self, find_resource):
+        find_resource.return_value.stat.return_value = {'cpu': 1}
+        parsed_args = self.check_parser(self.cmd, ['vm-1'], [])
+        self.cmd.take_action(parsed_args)
+        self.servers_mock.sampler.assert_not_called()
@@ -0,0 +1,31 @@
+import mock
+
+from tests import utils
+from vinfraclient.cmd.compute import volume_snapshot
+
+
+class TestCreateVolumeSnapshots(utils.TestCommand):
+    def setUp(self):
+        super(TestCreateVolumeSnapshots, self).setUp()
+        self.snapshots_mock = self.app.vinfra.compute.volume_snapshots
+        self.cmd = volume_snapshot.CreateVolumeSnapshot(self.app, None)
+
+    @mock.patch('vinfraclient.cmd.compute.volume_snapshot.find_resources')
+    def test_repeated_volume(self, find_resources):
+        find_resources.side_effect = lambda manager, names: [
+            mock.Mock(id=name) for name in names]
+        task = self.snapshots_mock.create_many_async.return_value
+        task.get_report.return_value = [
+            {'id': 's1', 'status': 'creating', 'error': None},
+            {'id': 's2', 'status': 'creating', 'error': None},
+            {'id': 's3', 'status': 'creating', 'error': None},
+        ]
+        parsed_args = self.check_parser(
+            self.cmd, ['--volume', 'vol1', '--volume', 'vol2', '--volume',
+                       'vol1', 'daily'], [])
+        columns, data = self.cmd.take_action(parsed_args)
+
+        # every snapshot of the volume is shown
+        self.assertEqual(('vol1 (1)', 'vol1 (3)', 'vol2'), columns)
+        self.assertEqual(['s1', 's3', 's2'],
+                         [item.machine_readable()['id'] for item in data])
@@ -0,0 +1,67 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import mock
+
+from vinfraclient import completion
+
+TREE = {
+    'options': {'--vinfra-portal': {'nargs': 1}, '--debug': {'nargs': 0}},
+    'commands': {
+        'node': {'list': {completion.SPEC: {'options': {}, 'positionals': []}}},
+        'service': {'compute': {'server': {'show': {completion.SPEC: {
+            'options': {'--format': {'nargs': 1,
+                                     'choices': ['json', 'table']},
+                        '--long': {'nargs': 0}},
+            'positionals': [{'nargs': 1, 'kind': 'servers',
+                             'repeat': False}],
+        }}}}},
+    },
+}
+
+
+class TestCompleter(TestCase):
+    def setUp(self):
+        super(TestCompleter, self).setUp()
+        self.home = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.home)
+        patcher = mock.patch.dict(os.environ, {'HOME': self.home})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(completion, 'refresh_in_background')
+        self.refresh = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        names_dir = completion.get_names_dir('portal.local')
+        os.makedirs(names_dir)
+        with open(completion.get_names_path(names_dir, 'servers'), 'w') as fp:
+            json.dump({'names': ['vm1', 'vm2', 'db1']}, fp)
+        self.completer = completion.Completer(TREE, portal='portal.local')
+
+    def test_commands(self):
+        self.assertEqual(['node', 'service'], self.completer.complete(['']))
+        self.assertEqual(['node'], self.completer.complete(
+            ['--debug', '--vinfra-portal', 'portal.local', 'n']))
+        self.assertEqual(['list'], self.completer.complete(['node', '']))
+
+    def test_options(self):
+        words = ['service', 'compute', 'server', 'show']
+        self.assertEqual(['--format', '--long'],
+                         self.completer.complete(words + ['--']))
+        self.assertEqual(['json'], self.completer.complete(
+            words + ['--long', '--format', 'j']))
+
+    def test_resource_names(self):
+        words = ['service', 'compute', 'server', 'show']
+        self.assertEqual(['vm1', 'vm2'],
+                         self.completer.complete(words + ['vm']))
+        self.assertEqual([], self.completer.complete(words + ['vm1', '']))
+        self.assertFalse(self.refresh.called)
+
+        self.completer.ttl = -1
+        self.completer.complete(words + [''])
+        self.refresh.assert_called_once_with(
+            'portal.local', completion.get_names_dir('portal.local'))
@@ -0,0 +1,132 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import mock
+from six.moves import StringIO
+
+from vinfra.request_cache import RequestCache
+from vinfraclient.cmd.base import Lister, ShowOne
+from vinfraclient.main import VinfraApp
+
+
+class ListNodes(Lister):
+    _default_fields = ['id']
+    multi_portal = True
+
+    def do_action(self, parsed_args):
+        if self.app.vinfra.portal == 'b':
+            raise self.app.vinfra.error
+        return [{'id': '{}-node'.format(self.app.vinfra.portal)}]
+
+
+class ListEvents(Lister):
+    _default_fields = ['id']
+    multi_portal = True
+    _single_portal_options = {'follow': '--follow'}
+
+    def configure_parser(self, parser):
+        parser.add_argument('--follow', action='store_true')
+
+    def do_action(self, parsed_args):
+        return [{'id': self.app.vinfra.portal}]
+
+
+class ShowCluster(ShowOne):
+    multi_portal = True
+
+    def do_action(self, parsed_args):
+        # every portal runs its own command
+        assert not hasattr(self, 'portal')
+        self.portal = self.app.vinfra.portal
+        return {'name': self.portal}
+
+
+class SetCluster(ShowOne):
+    def do_action(self, parsed_args):
+        return {}
+
+
+class TestMultiplePortals(TestCase):
+    def setUp(self):
+        super(TestMultiplePortals, self).setUp()
+        self.app = VinfraApp()
+        self.app.stdout = StringIO()
+        self.app.stderr = StringIO()
+        self.app.options = mock.Mock(portal='a,b,c, a', portals_file=None,
+                                     concurrency=None, verbose_level=1)
+        self.app.initialize_app([])
+
+        def init_vinfra(portal=None):
+            self.app.vinfra = mock.Mock(portal=portal,
+                                        request_cache=RequestCache())
+            self.app.vinfra.error = ValueError('no node')
+
+        patcher = mock.patch.object(self.app, '_init_vinfra',
+                                    side_effect=init_vinfra)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(self.app, '_init_auth')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _run(self, cmd_cls, args):
+        cmd = cmd_cls(self.app, None)
+        parsed_args = cmd.get_parser('test').parse_args(args)
+        return cmd.run(parsed_args)
+
+    def test_lister(self):
+        self.assertEqual(['a', 'b', 'c'], self.app.portals)
+        self.assertEqual(2, self._run(ListNodes, ['-f', 'json']))
+        self.assertEqual([{'portal': 'a', 'id': 'a-node'},
+                          {'portal': 'c', 'id': 'c-node'}],
+                         json.loads(self.app.stdout.getvalue()))
+        self.assertIn('b: command failed: no node',
+                      self.app.stderr.getvalue())
+        self.assertIsNone(self.app.vinfra)
+
+    def test_show_one(self):
+        self.assertEqual(0, self._run(ShowCluster, ['-f', 'json']))
+        self.assertEqual([{'portal': portal, 'name': portal}
+                          for portal in 'abc'],
+                         json.loads(self.app.stdout.getvalue()))
+
+    def test_single_portal_option(self):
+        self.assertEqual(2, self._run(ListEvents, ['--follow']))
+        self.assertIn('--follow cannot be used on multiple portals',
+                      self.app.stderr.getvalue())
+        self.assertEqual('', self.app.stdout.getvalue())
+        self.assertEqual(0, self._run(ListEvents, ['-f', 'json']))
+
+    def test_single_portal_command(self):
+        cmd = SetCluster(self.app, None)
+        with mock.patch('sys.exit', side_effect=SystemExit) as exit_mock:
+            self.assertRaises(SystemExit, self.app.prepare_to_run_command,
+                              cmd)
+        exit_mock.assert_called_once_with(2)
+
+
+class TestHaEndpoints(TestCase):
+    def setUp(self):
+        super(TestHaEndpoints, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        patcher = mock.patch('vinfraclient.main.get_cache_dir',
+                             return_value=self.tmp_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.app = VinfraApp()
+        self.app.vinfra = mock.Mock()
+        self.app.vinfra.ha.get_endpoints.return_value = ['https://node:8888']
+
+    def test_corrupt_cache(self):
+        cache_file = os.path.join(self.tmp_dir, '.endpoints')
+        with open(cache_file, 'w') as fp:
+            fp.write('{"time": ')
+        # the cache is rediscovered instead of failing every command
+        self.assertEqual(['https://node:8888'],
+                         self.app._get_ha_endpoints(discover=True))  # pylint: disable=protected-access
+        with open(cache_file) as fp:
+            self.assertEqual(['https://node:8888'], json.load(fp)['endpoints'])
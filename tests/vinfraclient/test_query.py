@@ -0,0 +1,78 @@
+from unittest import TestCase
+
+import mock
+
+from vinfraclient import exceptions
+from vinfraclient.cmd.base import Lister
+from vinfraclient.query import Query
+
+SERVERS = [
+    {'id': 's1', 'status': 'ACTIVE', 'host': 'node1', 'vcpus': 4,
+     'metadata': {'env': 'prod'}},
+    {'id': 's2', 'status': 'ACTIVE', 'host': 'node2', 'vcpus': 2,
+     'metadata': {'env': 'dev'}},
+    {'id': 's3', 'status': 'SHUTOFF', 'host': 'node1', 'vcpus': 8,
+     'metadata': {}},
+    {'id': 's4', 'status': 'ERROR', 'host': None, 'vcpus': None,
+     'metadata': {}},
+]
+
+
+class ListServers(Lister):
+    _default_fields = ['id', 'status']
+    _server_filters = {'status': 'status'}
+
+    def configure_parser(self, parser):
+        parser.add_argument('--status')
+
+    def do_action(self, parsed_args):
+        return [server for server in SERVERS
+                if parsed_args.status in (None, server['status'])]
+
+
+class TestQuery(TestCase):
+    def _ids(self, query):
+        return [record['id'] for record in query.run(SERVERS)]
+
+    def test_where(self):
+        self.assertEqual(['s1', 's3'], self._ids(Query(where=['vcpus>=4'])))
+        self.assertEqual(['s1'], self._ids(Query(
+            where=['status=ACTIVE', 'metadata.env~^pr'])))
+        self.assertEqual(['s2', 's4'], self._ids(Query(where=['host!=node1'])))
+        self.assertRaises(exceptions.ValidationError, Query, where=['vcpus'])
+
+    def test_order_top(self):
+        self.assertEqual(['s3', 's1', 's2', 's4'], self._ids(Query(
+            order_by=['vcpus:desc'])))
+        self.assertEqual(['s3', 's1'], self._ids(Query(
+            order_by=['host', 'vcpus:desc'], top=2)))
+
+    def test_group_by(self):
+        query = Query(group_by=['host'], sums=['vcpus'],
+                      order_by=['count:desc'], top=2)
+        self.assertEqual(['host', 'count', 'sum_vcpus'], query.columns)
+        self.assertEqual(
+            [{'host': 'node1', 'count': 2, 'sum_vcpus': 12},
+             {'host': None, 'count': 1, 'sum_vcpus': 0}],
+            query.run(SERVERS))
+
+
+class TestListerQuery(TestCase):
+    def setUp(self):
+        super(TestListerQuery, self).setUp()
+        self.cmd = ListServers(mock.Mock(), None)
+        self.parser = self.cmd.get_parser('vinfra server list')
+
+    def test_server_filter_and_grouping(self):
+        parsed_args = self.parser.parse_args(
+            ['--where', 'status=ACTIVE', '--group-by', 'status'])
+        columns, rows = self.cmd.take_action(parsed_args)
+
+        self.assertEqual('ACTIVE', parsed_args.status)
+        self.assertEqual(('status', 'count'), columns)
+        self.assertEqual([['ACTIVE', 2]], rows)
+
+    def test_unknown_field(self):
+        parsed_args = self.parser.parse_args(['--where', 'state=ACTIVE'])
+        self.assertRaises(exceptions.ValidationError,
+                          self.cmd.take_action, parsed_args)
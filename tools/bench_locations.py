@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""Benchmark listing of location resources.
+
+Compares building racks one by one with a fresh schema per call (the
+previous behaviour) with the cached schema and bulk loading used by
+vinfra.locations.racks.list().
+
+Usage: python tools/bench_locations.py [--count N [N ...]] [--repeat R]
+"""
+from __future__ import print_function
+
+import argparse
+import timeit
+import uuid
+
+from vinfra.api.locations import RacksManager
+from vinfra.api.locations.loc_types import Rack
+
+
+class FakeClient(object):
+    def __init__(self, data):
+        self.data = data
+
+    def get(self, url, **kwargs):  # pylint: disable=unused-argument
+        return self.data
+
+
+class FakeApi(object):
+    def __init__(self, data):
+        self.client = FakeClient(data)
+
+
+def make_racks(count):
+    return [{
+        'id': idx,
+        'name': 'rack{}'.format(idx),
+        'parent': idx // 20,
+        'children': [str(uuid.uuid4()) for _ in range(4)],
+    } for idx in range(count)]
+
+
+def list_uncached(manager, data):
+    items = []
+    for info in data:
+        obj = Rack.__new__(Rack)
+        obj.manager = manager
+        obj.__dict__.update(Rack.Schema(strict=True).load(info).data)
+        items.append(obj)
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, nargs='+',
+                        default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print('{:>8} {:>12} {:>12} {:>8}'.format(
+        'racks', 'uncached, s', 'cached, s', 'speedup'))
+    for count in args.count:
+        data = make_racks(count)
+        manager = RacksManager(FakeApi(data))
+        uncached = min(timeit.repeat(
+            lambda: list_uncached(manager, data),
+            number=1, repeat=args.repeat))
+        cached = min(timeit.repeat(
+            manager.list, number=1, repeat=args.repeat))
+        print('{:>8} {:>12.4f} {:>12.4f} {:>7.1f}x'.format(
+            count, uncached, cached, uncached / cached))
+
+
+if __name__ == '__main__':
+    main()
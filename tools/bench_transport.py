@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""Benchmark per-request latency of the backend session transports.
+
+Runs local stand-in backends answering a small JSON document over HTTPS
+on a host name (a self-signed certificate is made with openssl), over
+plain HTTP on the loopback address and over a Unix socket, and measures
+a request with a new session, as every vinfra invocation does, and with
+a reused one.
+
+Usage: python tools/bench_transport.py [--requests N]
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import timeit
+
+from six.moves import BaseHTTPServer, socketserver
+
+from vinfra.session import Session
+
+BODY = b'{"data": []}'
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+class TCPHandler(Handler):
+    # headers and the body are written separately
+    disable_nagle_algorithm = True
+
+
+class TCPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = socketserver.UnixStreamServer.get_request(self)
+        return request, ('local', 0)
+
+
+def start(server):
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def make_cert(tmp_dir):
+    cert = os.path.join(tmp_dir, 'cert.pem')
+    key = os.path.join(tmp_dir, 'key.pem')
+    try:
+        subprocess.check_call(
+            ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+             '-days', '1', '-subj', '/CN=localhost', '-keyout', key,
+             '-out', cert], stdout=open(os.devnull, 'w'),
+            stderr=subprocess.STDOUT)
+    except (OSError, subprocess.CalledProcessError) as err:
+        print('Skipping HTTPS: failed to make a certificate ({})'.format(err))
+        return None
+    return cert, key
+
+
+def start_backends(tmp_dir):
+    backends = []
+    cert = make_cert(tmp_dir)
+    if cert is not None:
+        server = TCPServer(('127.0.0.1', 0), TCPHandler)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(*cert)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        # the host name is resolved on every connection like the default
+        # portal is
+        backends.append(('https, host name', start(server),
+                         'https://localhost:{}'.format(
+                             server.server_address[1])))
+
+    server = TCPServer(('127.0.0.1', 0), TCPHandler)
+    backends.append(('http, loopback', start(server),
+                     'http://127.0.0.1:{}'.format(server.server_address[1])))
+
+    path = os.path.join(tmp_dir, 'backend.sock')
+    backends.append(('unix socket', start(UnixServer(path, Handler)),
+                     'unix://' + path))
+    return backends
+
+
+def get(session):
+    session.get('/api/v2/tasks', authenticated=False).json()
+
+
+def new_session_get(url):
+    session = Session(url)
+    try:
+        get(session)
+    finally:
+        session.session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    socket.setdefaulttimeout(10)
+    # requests prefers these to the disabled verification of the session,
+    # the stand-in certificate is self-signed
+    for name in ('REQUESTS_CA_BUNDLE', 'CURL_CA_BUNDLE'):
+        os.environ.pop(name, None)
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        backends = start_backends(tmp_dir)
+        print('{:<18} {:>14} {:>14}'.format(
+            'transport', 'new conn, ms', 'reused, ms'))
+        baseline = None
+        for name, server, url in backends:
+            fresh = min(timeit.repeat(lambda: new_session_get(url),
+                                      number=args.requests, repeat=3))
+            session = Session(url)
+            get(session)
+            reused = min(timeit.repeat(lambda: get(session),
+                                       number=args.requests, repeat=3))
+            session.session.close()
+            server.shutdown()
+            server.server_close()
+
+            fresh = fresh * 1000 / args.requests
+            reused = reused * 1000 / args.requests
+            if baseline is None:
+                baseline = fresh
+            print('{:<18} {:>14.3f} {:>14.3f}   saves {:.3f} ms per '
+                  'command'.format(name, fresh, reused, baseline - fresh))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -32,6 +32,7 @@ from vinfra.api.token import Token
 from vinfra.api.users import UserManager
 from vinfra.api_versions import APIVersion
 from vinfra.client import Client
+from vinfra.request_cache import RequestCache
 from vinfra.session import Session
 from vinfra.utils import flatten_args
 
@@ -70,8 +71,14 @@ class Vinfra(object):
         self.session = session
         self.client = Client(self)
 
-    def __init__(self, url, auth=None, session=None):
+    def __init__(self, url, auth=None, session=None, version_cache=None):
+        """
+        :param version_cache: persistent cache of backend versions
+        :type version_cache: vinfra.api_versions.VersionCache
+        """
         self._create_client(url, auth, session)
+        # GET responses are reused while it is entered, see RequestCache
+        self.request_cache = RequestCache()
 
         self.alerts = AlertManager(self)
         self.alert_types = AlertTypeManager(self)
@@ -122,8 +129,10 @@ class Vinfra(object):
         self.domain_props.keys = DomainsKeysManager(self)
         self.cses_config = CsesConfigManager(self)
 
+        self.version_cache = version_cache
         self._api_version = None
         self._backend_version = None
+        self._cached_versions = set()
         self._request_id = None
 
     def node_obj(self, node_id):
@@ -149,18 +158,58 @@ class Vinfra(object):
     def get_backend_version(self):
         return self.client.get("/version")["version"]
 
+    def _get_cached_version(self, name, getter):
+        version = None
+        if self.version_cache:
+            version = self.version_cache.get(name)
+        if version:
+            self._cached_versions.add(name)
+        else:
+            version = getter()
+            if self.version_cache:
+                self.version_cache.set(name, version)
+        return APIVersion(version)
+
     @property
     def api_version(self):
         if not self._api_version:
-            self._api_version = APIVersion(self.get_api_version())
+            self._api_version = self._get_cached_version(
+                'api_version', self.get_api_version)
         return self._api_version
 
     @property
     def backend_version(self):
         if not self._backend_version:
-            self._backend_version = APIVersion(self.get_backend_version())
+            self._backend_version = self._get_cached_version(
+                'backend_version', self.get_backend_version)
         return self._backend_version
 
+    def reset_versions(self):
+        """Forget the backend versions, e.g. after a software update."""
+        self._api_version = None
+        self._backend_version = None
+        self._cached_versions.clear()
+        if self.version_cache:
+            self.version_cache.invalidate()
+
+    def recheck_versions(self):
+        """Request the versions taken from the cache again.
+
+        A request rejected by the backend can be made for the version of
+        the backend before an update. Every cached version is rechecked
+        once. Return True if any of them has changed.
+        """
+        changed = False
+        while self._cached_versions:
+            name = self._cached_versions.pop()
+            version = getattr(self, 'get_' + name)()
+            self.version_cache.set(name, version)
+            version = APIVersion(version)
+            if version != getattr(self, '_' + name):
+                changed = True
+            setattr(self, '_' + name, version)
+        return changed
+
     def report_async(self, send=None, contact_email=None,
                      problem_description=None, verbosity_level=None,
                      include_days=None, node_ids=None):
@@ -5,6 +5,7 @@ from vinfra import exceptions
 from vinfra.api_versions import version_wrap
 from vinfra.api import base, failure_domains
 from vinfra.api.compute.storage_policies import get_api_redundancy
+from vinfra.api.network.topology import TopologyResolver
 from vinfra.utils import flatten_args
 
 from vinfra.api.abgw.georeplication import GeoReplication
@@ -26,37 +27,15 @@ class AbgwApi(base.VinfraApi):
         self.limits_params = ClientLimits(self.cluster)
 
     def _adjust_nodes(self, nodes):
-        abgw_private = 'Backup (ABGW) private'
-        network_id_with_abgw_private = None
-
-        for network in self.api.networks.list():
-            if abgw_private in network.traffic_types:
-                network_id_with_abgw_private = network.id
-                break
-        else:
-            msg = (
-                "Networks with the following required traffic types "
-                "not found: {!r}".format(abgw_private)
-            )
-            raise exceptions.VinfraError(msg)
-        nodes_data = []
-        errors = list()
-        for node in nodes:
-            for iface in node.ifaces_manager.list():
-                if iface.network == network_id_with_abgw_private:
-                    nodes_data.append({
-                        'node_id': base.get_id(node),
-                        'private_iface': iface.name
-                    })
-                    break
-            else:
-                errors.append(
-                    "Traffic type {!r} is not assigned on node {!r}".format(
-                        abgw_private, node['host']
-                    ))
-        if errors:
-            raise exceptions.VinfraError("\n".join(errors))
-        return nodes_data
+        topology = TopologyResolver(self.api)
+        ifaces = topology.resolve(nodes, 'Backup (ABGW) private')
+        return [
+            {
+                'node_id': base.get_id(node),
+                'private_iface': iface.name
+            }
+            for node, iface in zip(nodes, ifaces)
+        ]
 
     @version_wrap("2.0", "5.0.1")
     def assign_nodes(self, nodes):
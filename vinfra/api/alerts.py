@@ -1,12 +1,96 @@
+import logging
+import time
+
+from requests import exceptions as request_exceptions
+
 from vinfra.api import base
+from vinfra.request_cache import expire_cached_requests
 from vinfra.utils import flatten_args
 
+LOG = logging.getLogger(__name__)
+
 
 class Alert(base.Resource):
     def update(self, **kwargs):
         return self.manager.update(self, **kwargs)
 
 
+class AlertWatcher(object):
+    EVENT_NEW = 'new'
+    EVENT_CHANGED = 'changed'
+    EVENT_CLEARED = 'cleared'
+
+    def __init__(self, manager, enabled=True, lang='en', interval=5,
+                 max_interval=60, backoff=2, initial=True):
+        """Poll alerts and report only the differences.
+
+        Alerts are indexed by ID between polls. While nothing changes, the
+        polling interval grows by backoff times up to max_interval and
+        drops back to interval on the first change.
+
+        :param manager: alert manager
+        :param enabled: watch only enabled alerts
+        :param lang: language of alert messages
+        :param interval: minimal polling interval, in seconds
+        :param max_interval: maximal polling interval, in seconds
+        :param backoff: interval multiplier applied after an idle poll
+        :param initial: report alerts existing at the first poll as new
+        """
+        self.manager = manager
+        self.enabled = enabled
+        self.lang = lang
+        self.interval = interval
+        self.max_interval = max(max_interval, interval)
+        self.backoff = backoff
+        self.initial = initial
+        self.index = None
+        self.current_interval = interval
+
+    def poll(self):
+        """Fetch alerts once and return a list of events."""
+        alerts = self.manager.list(enabled=self.enabled, lang=self.lang)
+        index = dict((base.get_id(alert), alert.to_dict())
+                     for alert in alerts)
+        previous, self.index = self.index, index
+        if previous is None:
+            if not self.initial:
+                return []
+            previous = {}
+
+        events = []
+        for alert_id in sorted(index):
+            if alert_id not in previous:
+                events.append(self._event(self.EVENT_NEW, alert_id, index))
+            elif index[alert_id] != previous[alert_id]:
+                events.append(
+                    self._event(self.EVENT_CHANGED, alert_id, index))
+        for alert_id in sorted(set(previous) - set(index)):
+            events.append(self._event(self.EVENT_CLEARED, alert_id, previous))
+        return events
+
+    @staticmethod
+    def _event(event, alert_id, index):
+        return {'event': event, 'id': alert_id, 'alert': index[alert_id]}
+
+    def _next_interval(self, changed):
+        if changed:
+            return self.interval
+        return min(self.current_interval * self.backoff, self.max_interval)
+
+    def __iter__(self):
+        while True:
+            expire_cached_requests()
+            try:
+                events = self.poll()
+            except request_exceptions.RequestException as err:
+                LOG.warning("Failed to poll alerts: %s", err)
+                events = []
+            for event in events:
+                yield event
+            self.current_interval = self._next_interval(bool(events))
+            time.sleep(self.current_interval)
+
+
 class AlertManager(base.Manager):
     resource_class = Alert
     base_url = "/alerts"
@@ -17,6 +101,10 @@ class AlertManager(base.Manager):
             url += '?params={"filters":{"enabled":"False"}}'
         return self._list(url, cookies={'WebCP-Language': '{lang}'.format(lang=lang)})
 
+    def watch(self, **kwargs):
+        """Iterate over alert changes, see AlertWatcher for arguments."""
+        return AlertWatcher(self, **kwargs)
+
     def update(self, alert, suspended=None, enabled=None):
         alert_id = base.get_id(alert)
         json = flatten_args(suspended=suspended, enabled=enabled)
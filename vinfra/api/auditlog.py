@@ -1,4 +1,5 @@
 from vinfra.api import base
+from vinfra.utils import parse_timestamp
 
 
 class AuditLog(base.Resource):
@@ -7,6 +8,78 @@ class AuditLog(base.Resource):
 
 class AuditLogManager(base.Manager):
     resource_class = AuditLog
+    base_url = '/audit_log'
+    page_size = 500
 
-    def list(self):
-        return self._list('/audit_log')
+    def list(self, limit=None, marker=None, filters=None, sort=None):
+        return self._list(self.base_url, limit=limit, marker=marker,
+                          filters=filters, sort=sort)
+
+    def get(self, auditlog):
+        return self._get('{}/{}'.format(self.base_url, base.get_id(auditlog)))
+
+    def _list_after(self, marker, page_size, sort):
+        """List a page of entries following marker in the sort order.
+
+        Backends ignoring the paging parameters return the same entries
+        again, so the page would never advance. All the entries are listed
+        at once then; the second item of the result tells whether the page
+        is the last one.
+        """
+        page = self.list(limit=page_size, marker=marker, sort=sort)
+        reverse = sort == 'id:desc'
+
+        def follows(entry):
+            return (marker is None or
+                    (entry.id < marker if reverse else entry.id > marker))
+
+        last = len(page) < page_size
+        if not all(follows(entry) for entry in page):
+            page = self.list(sort=sort)
+            last = True
+        page = sorted((entry for entry in page if follows(entry)),
+                      key=lambda entry: entry.id, reverse=reverse)
+        return page, last
+
+    def iterate(self, since=None, until=None, page_size=None):
+        """Iterate entries page by page from the newest to the oldest.
+
+        Paging stops as soon as an entry older than since is met, so only
+        the requested time window is downloaded.
+
+        :param since: naive UTC datetime, skip older entries
+        :param until: naive UTC datetime, skip newer entries
+        :param page_size: number of entries requested at once
+        """
+        page_size = page_size or self.page_size
+        marker = None
+        while True:
+            page, last = self._list_after(marker, page_size, 'id:desc')
+            for entry in page:
+                timestamp = parse_timestamp(entry.timestamp)
+                if until and timestamp > until:
+                    continue
+                if since and timestamp < since:
+                    return
+                yield entry
+
+            if last or not page:
+                return
+            marker = page[-1].id
+
+    def list_newer(self, after_id, page_size=None):
+        """List entries with ID greater than after_id, the oldest first."""
+        page_size = page_size or self.page_size
+        entries = []
+        marker = after_id
+        while True:
+            page, last = self._list_after(marker, page_size, 'id:asc')
+            entries.extend(page)
+            if last or not page:
+                return entries
+            marker = page[-1].id
+
+    def get_last_id(self):
+        """Return ID of the newest entry or 0 if the log is empty."""
+        page = self.list(limit=1, sort='id:desc')
+        return max([entry.id for entry in page] or [0])
@@ -4,6 +4,8 @@ import re
 import time
 
 from vinfra import compat, exceptions
+from vinfra.progress import report_progress
+from vinfra.request_cache import expire_cached_requests
 
 LOG = logging.getLogger(__name__)
 CAMELCASE_REGEX = re.compile(r'[A-Z](?:[a-z0-9]+|[A-Z]*(?=[A-Z]|$))')
@@ -44,9 +46,12 @@ class PollTask(Task):
         result = None
         stime = time.time()
         while time.time() - stime < timeout:
+            expire_cached_requests()
             result = self.poll()
             if result is not None:
                 return result
+            state, progress = self.get_progress()
+            report_progress(state=state, progress=progress)
             time.sleep(self.poll_interval)
             continue
 
@@ -56,6 +61,10 @@ class PollTask(Task):
     def poll(self):
         raise NotImplementedError
 
+    def get_progress(self):
+        """Return the state and the progress seen by the last poll."""
+        return None, None
+
 
 class BackendTask(Task):
     def __init__(self, api, data, **kwargs):
@@ -122,10 +131,124 @@ class StatusTask(PollTask):
                 .format(self.resource.name.encode('utf8')))
         return None
 
+    def get_progress(self):
+        return getattr(self.resource, 'status', None), None
+
     def get_info(self):
         return self.resource
 
 
+class BatchStatusTask(PollTask):
+    """Wait for many resources to get the status.
+
+    Resources are polled in batches with manager.list(filters={'id':
+    'in:...'}) instead of one request per resource. The result is a list
+    in the order of resources: a resource which has got the status or an
+    exception describing why it has not.
+
+    A status starting with 'error' is a failure. If pending_statuses is
+    set, any status out of it is a failure as well.
+    """
+    status = None
+    pending_statuses = None
+    batch_size = 50
+
+    def __init__(self, manager, resources):
+        """
+        :param manager: resource manager
+        :param resources: resources to wait for; exceptions in place of
+                          resources are passed to the result as is
+        """
+        super(BatchStatusTask, self).__init__()
+        self.manager = manager
+        self.resources = list(resources)
+        self.results = {}
+        for idx, resource in enumerate(self.resources):
+            if isinstance(resource, Exception):
+                self.results[idx] = resource
+
+    def _pending(self):
+        return dict((get_id(resource), idx)
+                    for idx, resource in enumerate(self.resources)
+                    if idx not in self.results)
+
+    def list_batch(self, ids):
+        return self.manager.list(filters={'id': 'in:{}'.format(','.join(ids))})
+
+    def fetch(self, ids):
+        """Return current state of the resources with the given IDs."""
+        resources = []
+        for start in range(0, len(ids), self.batch_size):
+            resources.extend(self.list_batch(ids[start:start + self.batch_size]))
+        return resources
+
+    def is_ready(self, resource):
+        return resource.status == self.status
+
+    def is_failed(self, resource):
+        return (resource.status.lower().startswith('error') or
+                (self.pending_statuses is not None and
+                 resource.status not in self.pending_statuses))
+
+    def wait(self, timeout=None):
+        timeout = timeout or self.default_timeout
+        try:
+            return super(BatchStatusTask, self).wait(timeout=timeout)
+        except exceptions.TimeoutError:
+            for resource_id, idx in self._pending().items():
+                self.results[idx] = exceptions.TimeoutError(
+                    "Resource (id={}) status {!r} waiting exceeded {} "
+                    "second(s) timeout (status={})".format(
+                        resource_id, self.status, timeout,
+                        getattr(self.resources[idx], 'status', None)))
+        return self.get_results()
+
+    def poll(self):
+        pending = self._pending()
+        for resource in self.fetch(sorted(pending)):
+            idx = pending.get(get_id(resource))
+            if idx is None:
+                continue
+            self.resources[idx] = resource
+            if self.is_ready(resource):
+                self.results[idx] = resource
+            elif self.is_failed(resource):
+                self.results[idx] = exceptions.VinfraError(
+                    'Resource "{}" has {!r} status.'.format(
+                        getattr(resource, 'name', None) or
+                        get_id(resource), resource.status))
+
+        if len(self.results) == len(self.resources):
+            return self.get_results()
+        return None
+
+    def get_results(self):
+        return [self.results.get(idx) for idx in range(len(self.resources))]
+
+    def get_progress(self):
+        # the share of resources which have got the status or failed
+        return self.status, 100.0 * len(self.results) / len(self.resources)
+
+    def get_report(self):
+        """Return a list of dicts with id, status and error per resource.
+
+        The error is None unless the resource has failed.
+        """
+        report = []
+        for idx, resource in enumerate(self.resources):
+            result = self.results.get(idx)
+            report.append({
+                'id': (None if isinstance(resource, Exception)
+                       else get_id(resource)),
+                'status': getattr(resource, 'status', None),
+                'error': str(result) if isinstance(result, Exception) else None,
+            })
+        return report
+
+    def get_info(self):
+        return self.resources
+
+
 class DeleteTask(PollTask):
     def __init__(self, manager, resource):
         super(DeleteTask, self).__init__()
@@ -284,8 +407,10 @@ class Manager(VinfraApi):
                 LOG.warning('Cannot find resource ID attribute.')
                 break
 
-        items = [self.resource_class(self, res) for res in data or []]
-        return items
+        return self._make_resources(data)
+
+    def _make_resources(self, data):
+        return [self.resource_class(self, res) for res in data or []]
 
     def _get(self, url, **kwargs):
         data = self.client.get(url, **kwargs)
@@ -4,6 +4,7 @@ from vinfra.api.abgw import AbgwApi
 from vinfra.api.iscsi import Iscsi
 from vinfra.api.license import VirtuozzoLicense, AcronisLicense
 from vinfra.api.nfs import NfsManager
+from vinfra.api.nodes.join import NodeJoin
 from vinfra.api.s3 import S3Api
 from vinfra.api.block_storage import BlockStorageApi
 from vinfra.api.sshkeys import SshKeyManager
@@ -36,6 +37,9 @@ class Cluster(base.Resource):
     def join_node(self, node, **params):
         return self.manager.join_node(self, node, **params)
 
+    def join_nodes(self, nodes, **kwargs):
+        return self.manager.join_nodes(self, nodes, **kwargs)
+
     def get_settings(self):
         return self.manager.get_settings(self)
 
@@ -97,6 +101,10 @@ class ClusterManager(base.Manager):
     def join_node(self, cluster, node, **params):
         return self.join_node_async(cluster, node, **params)
 
+    def join_nodes(self, cluster, nodes, **kwargs):
+        """Return a NodeJoin of the nodes, see NodeJoin for arguments."""
+        return NodeJoin(cluster, nodes, **kwargs)
+
     def get_settings(self, cluster):
         url = "{}/settings".format(base.get_id(cluster))
         return self.client.get(url)
@@ -1,4 +1,5 @@
 from vinfra.api.compute.cluster import Cluster
+from vinfra.api.compute.desired_state import StatePlanner
 from vinfra.api.compute.storages import ComputeStorageManager
 from vinfra.api.compute.flavors import FlavorManager
 from vinfra.api.compute.floating_ips import FloatingIpManager
@@ -52,3 +53,12 @@ class Compute(object):
         self.stack_resources = stacks.StackResourcesManager(api)
         self.stack_templates = stacks.StackTemplateManager(api)
         self.vpn = vpn.VpnManager(api)
+
+    def plan_state(self, state, prune=False, concurrency=None,
+                   project_id=None):
+        """Return a Plan of operations applying the desired state.
+
+        See StatePlanner for the format of the state.
+        """
+        return StatePlanner(self, state, prune=prune, concurrency=concurrency,
+                            project_id=project_id).plan()
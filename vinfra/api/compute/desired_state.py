@@ -0,0 +1,491 @@
+import functools
+import logging
+
+from vinfra import exceptions
+from vinfra.api import base
+from vinfra.utils import concurrent_map
+
+__all__ = ['Operation', 'Plan', 'StatePlanner']
+
+LOG = logging.getLogger(__name__)
+
+_FLAVOR_FIELDS = ('vcpus', 'ram', 'swap')
+_SECURITY_GROUP_FIELDS = ('description',)
+_RULE_FIELDS = ('direction', 'ethertype', 'protocol', 'port_range_min',
+                'port_range_max', 'remote_ip_prefix', 'remote_group')
+_QUOTA_PATHS = {
+    'compute_cores': ('compute', 'cores', 'limit'),
+    'compute_ram': ('compute', 'ram', 'limit'),
+    'network_floatingip': ('network', 'floatingip', 'limit'),
+    'network_ipsec_site_connection': ('network', 'ipsec_site_connection',
+                                      'limit'),
+    'k8saas_cluster': ('k8saas', 'cluster', 'limit'),
+    'lbaas_loadbalancer': ('lbaas', 'loadbalancer', 'limit'),
+}
+
+
+def _get_path(data, path):
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _check_spec(kind, spec, required, optional=()):
+    if not isinstance(spec, dict):
+        raise exceptions.VinfraError(
+            "Each {} must be a mapping, got {!r}.".format(kind, spec))
+    missing = [key for key in required if spec.get(key) is None]
+    if missing:
+        raise exceptions.VinfraError("The {} {!r} misses required keys: "
+                                     "{}.".format(kind, spec,
+                                                  ", ".join(missing)))
+    unknown = sorted(set(spec) - set(required) - set(optional))
+    if unknown:
+        raise exceptions.VinfraError("The {} {!r} has unknown keys: "
+                                     "{}.".format(kind, spec,
+                                                  ", ".join(unknown)))
+    return spec
+
+
+class Operation(object):
+    PLANNED = 'planned'
+    DONE = 'done'
+    FAILED = 'failed'
+    SKIPPED = 'skipped'
+
+    def __init__(self, kind, action, name, func, changes=None, requires=()):
+        """One change of a resource.
+
+        :param kind: resource type, e.g. 'flavor'
+        :param action: 'create', 'update' or 'delete'
+        :param name: resource name
+        :param func: function making the change
+        :param changes: {field: (old value, new value)}
+        :param requires: operations to be done before this one
+        """
+        self.kind = kind
+        self.action = action
+        self.name = name
+        self.func = func
+        self.changes = changes or {}
+        self.requires = [op for op in requires if op is not None]
+        self.state = self.PLANNED
+        self.result = None
+        self.error = None
+
+    def __repr__(self):
+        return "<Operation {} {} {!r} ({})>".format(
+            self.action, self.kind, self.name, self.state)
+
+    def run(self):
+        try:
+            self.result = self.func()
+        except Exception as err:  # pylint: disable=broad-except
+            self.state = self.FAILED
+            self.error = err
+        else:
+            self.state = self.DONE
+
+    def to_dict(self):
+        return {
+            'kind': self.kind,
+            'action': self.action,
+            'name': self.name,
+            'changes': dict(self.changes),
+            'state': self.state,
+            'error': str(self.error) if self.error is not None else None,
+        }
+
+
+class Plan(object):
+    def __init__(self, operations):
+        self.operations = list(operations)
+
+    def __len__(self):
+        return len(self.operations)
+
+    def __iter__(self):
+        return iter(self.operations)
+
+    def execute(self, concurrency=None):
+        """Run the operations concurrently in dependency order.
+
+        An operation runs once all the operations it requires are done.
+        Operations depending on a failed one are skipped.
+
+        :return: the list of operations
+        """
+        pending = [op for op in self.operations if op.state == op.PLANNED]
+        while pending:
+            ready, waiting = [], []
+            skipped = False
+            for op in pending:
+                states = set(req.state for req in op.requires)
+                if states & set([op.FAILED, op.SKIPPED]):
+                    op.state = op.SKIPPED
+                    op.error = exceptions.VinfraError(
+                        "A required operation has not been done.")
+                    skipped = True
+                elif states - set([op.DONE]):
+                    waiting.append(op)
+                else:
+                    ready.append(op)
+
+            if not ready and not skipped:
+                raise exceptions.VinfraError(
+                    "Operations have circular dependencies: {}".format(
+                        waiting))
+            concurrent_map(Operation.run, ready, concurrency=concurrency)
+            pending = waiting
+        return self.operations
+
+
+class StatePlanner(object):
+    """Compare a desired state of compute resources with the current one.
+
+    The desired state is a dict, usually loaded from a YAML file:
+
+        flavors:
+        - {name: small, vcpus: 1, ram: 1024}
+        security_groups:
+        - name: web
+          description: Web servers
+          rules:
+          - {direction: ingress, protocol: tcp, port_range_min: 443,
+             port_range_max: 443, remote_ip_prefix: 0.0.0.0/0}
+          - {direction: ingress, remote_group: web}
+        quotas:
+        - {project: <project-id>, compute_cores: 16,
+           storage_policies: {default: 1024}}
+
+    Every resource type is fetched once, with all the requests sent
+    concurrently, and the difference is computed in memory. Resources
+    missing from the desired state are deleted only with prune. Default
+    egress rules are pruned only from security groups listing egress rules,
+    and only security groups of the project are managed. Flavors cannot be
+    modified, so a changed flavor is deleted and created again.
+    """
+    kinds = ('flavors', 'security_groups', 'quotas')
+
+    def __init__(self, compute, state, prune=False, concurrency=None,
+                 project_id=None):
+        """
+        :param compute: vinfra.api.compute.Compute
+        :param state: desired state
+        :param prune: delete resources missing from the desired state
+        :param concurrency: max number of concurrent requests
+        :param project_id: project whose security groups are managed, the
+                           project of the session by default
+        """
+        if not isinstance(state, dict):
+            raise exceptions.VinfraError("The desired state must be a "
+                                         "mapping of resource types.")
+        unknown = sorted(set(state) - set(self.kinds))
+        if unknown:
+            raise exceptions.VinfraError(
+                "Unknown resource types: {}. Supported types: {}.".format(
+                    ", ".join(unknown), ", ".join(self.kinds)))
+
+        self.compute = compute
+        self.state = dict((kind, state.get(kind) or []) for kind in state)
+        self.prune = prune
+        self.concurrency = concurrency
+        self.project_id = project_id
+        self.snapshot = {}
+        self._validate()
+
+    def _validate(self):
+        for spec in self.state.get('flavors', []):
+            _check_spec('flavor', spec, ('name', 'vcpus', 'ram'), ('swap',))
+        for spec in self.state.get('security_groups', []):
+            _check_spec('security group', spec, ('name',),
+                        _SECURITY_GROUP_FIELDS + ('rules',))
+            for rule in spec.get('rules') or []:
+                _check_spec('security group rule', rule, ('direction',),
+                            _RULE_FIELDS)
+        for spec in self.state.get('quotas', []):
+            _check_spec('quota', spec, ('project',),
+                        tuple(_QUOTA_PATHS) + ('storage_policies',))
+
+    def fetch(self):
+        """Fetch current resources of the types in the desired state."""
+        fetchers = {}
+        if 'flavors' in self.state:
+            fetchers['flavors'] = self.compute.flavors.list
+        if 'security_groups' in self.state:
+            fetchers['security_groups'] = functools.partial(
+                self.compute.security_groups.list, limit=-1)
+            fetchers['security_group_rules'] = functools.partial(
+                self.compute.security_group_rules.list, limit=-1)
+        for spec in self.state.get('quotas', []):
+            fetchers[('quotas', spec['project'])] = functools.partial(
+                self.compute.quotas.show, spec['project'])
+
+        keys = sorted(fetchers, key=str)
+        results = concurrent_map(lambda key: fetchers[key](), keys,
+                                 concurrency=self.concurrency)
+        self.snapshot = dict(zip(keys, results))
+        return self.snapshot
+
+    def plan(self):
+        """Return a Plan bringing the current state to the desired one."""
+        self.fetch()
+        if self.project_id is None:
+            # the session is scoped to the project by the first request
+            auth = self.compute.api.session.auth
+            self.project_id = getattr(auth, 'project_id', None)
+        operations = []
+        if 'flavors' in self.state:
+            operations.extend(self._plan_flavors())
+        if 'security_groups' in self.state:
+            operations.extend(self._plan_security_groups())
+        if 'quotas' in self.state:
+            operations.extend(self._plan_quotas())
+        return Plan(operations)
+
+    @staticmethod
+    def _index(kind, resources, names):
+        index = {}
+        for resource in resources:
+            index.setdefault(resource.name, []).append(resource)
+        for name in names:
+            if len(index.get(name, [])) > 1:
+                raise exceptions.VinfraError(
+                    "More than one {} exists with the name {!r}.".format(
+                        kind, name))
+        return index
+
+    @staticmethod
+    def _changes(current, spec, fields, normalize=None):
+        changes = {}
+        for field in fields:
+            if field not in spec:
+                continue
+            old = getattr(current, field, None)
+            if normalize:
+                old = normalize(field, old)
+            if old != spec[field]:
+                changes[field] = (old, spec[field])
+        return changes
+
+    def _plan_flavors(self):
+        manager = self.compute.flavors
+        specs = self.state['flavors']
+        index = self._index('flavor', self.snapshot['flavors'],
+                            [spec['name'] for spec in specs])
+
+        def normalize(field, value):
+            # nova reports an empty string if there is no swap
+            return value or 0 if field == 'swap' else value
+
+        operations = []
+        for spec in specs:
+            name = spec['name']
+            current = index.get(name, [None])[0]
+            create_changes = dict((field, (None, spec[field]))
+                                  for field in _FLAVOR_FIELDS if field in spec)
+            delete = None
+            if current is not None:
+                changes = self._changes(current, spec, _FLAVOR_FIELDS,
+                                        normalize)
+                if not changes:
+                    continue
+                create_changes = changes
+                delete = Operation('flavor', 'delete', name,
+                                   functools.partial(manager.delete, current))
+                operations.append(delete)
+            operations.append(Operation(
+                'flavor', 'create', name,
+                functools.partial(manager.create, **spec),
+                changes=create_changes, requires=[delete]))
+
+        if self.prune:
+            names = set(spec['name'] for spec in specs)
+            for flavor in self.snapshot['flavors']:
+                if flavor.name not in names:
+                    operations.append(Operation(
+                        'flavor', 'delete', flavor.name,
+                        functools.partial(manager.delete, flavor)))
+        return operations
+
+    @staticmethod
+    def _rule_key(rule, group_ids):
+        if isinstance(rule, dict):
+            values = dict((field, rule.get(field)) for field in _RULE_FIELDS)
+            values['ethertype'] = values['ethertype'] or 'IPv4'
+            if values['remote_group'] is not None:
+                values['remote_group'] = group_ids.get(
+                    values['remote_group'], ('new', values['remote_group']))
+        else:
+            values = dict((field, getattr(rule, field, None))
+                          for field in _RULE_FIELDS)
+            values['remote_group'] = getattr(rule, 'remote_group_id', None)
+        return tuple(values[field] for field in _RULE_FIELDS)
+
+    @staticmethod
+    def _is_default_egress(rule):
+        # every new security group gets such a rule for each ethertype
+        return rule.direction == 'egress' and all(
+            getattr(rule, field, None) is None
+            for field in ('protocol', 'port_range_min', 'port_range_max',
+                          'remote_ip_prefix', 'remote_group_id'))
+
+    @staticmethod
+    def _rule_name(group_name, rule):
+        parts = [rule.get('direction'), rule.get('ethertype') or 'IPv4',
+                 rule.get('protocol') or 'any']
+        if rule.get('port_range_min') is not None:
+            parts.append('{}-{}'.format(rule['port_range_min'],
+                                        rule.get('port_range_max')))
+        remote = rule.get('remote_ip_prefix') or rule.get('remote_group')
+        if remote:
+            parts.append(remote)
+        return '{}: {}'.format(group_name, ' '.join(
+            '{}'.format(part) for part in parts))
+
+    def _plan_security_groups(self):  # pylint: disable=too-many-locals
+        groups_manager = self.compute.security_groups
+        rules_manager = self.compute.security_group_rules
+        specs = self.state['security_groups']
+        groups = self.snapshot['security_groups']
+        if self.project_id is not None:
+            # an administrator lists security groups of all the projects
+            groups = [group for group in groups
+                      if getattr(group, 'project_id', None) ==
+                      self.project_id]
+        index = self._index('security group', groups,
+                            [spec['name'] for spec in specs])
+        group_ids = dict((name, base.get_id(resources[0]))
+                         for name, resources in index.items()
+                         if len(resources) == 1)
+        group_rules = {}
+        for rule in self.snapshot['security_group_rules']:
+            group_rules.setdefault(rule.security_group_id, []).append(rule)
+
+        operations = []
+        creates = {}
+        for spec in specs:
+            name = spec['name']
+            current = index.get(name, [None])[0]
+            if current is None:
+                creates[name] = Operation(
+                    'security group', 'create', name,
+                    functools.partial(groups_manager.create, name,
+                                      description=spec.get('description')),
+                    changes=self._changes(None, spec, _SECURITY_GROUP_FIELDS))
+                operations.append(creates[name])
+                continue
+            changes = self._changes(current, spec, _SECURITY_GROUP_FIELDS)
+            if changes:
+                operations.append(Operation(
+                    'security group', 'update', name,
+                    functools.partial(groups_manager.update, current,
+                                      description=spec['description']),
+                    changes=changes))
+
+        def group_ref(name):
+            # the group is either existing or created by the plan
+            if name in creates:
+                return lambda: creates[name].result
+            resource = index[name][0] if name in index else name
+            return lambda: resource
+
+        for spec in specs:
+            name = spec['name']
+            existing = {}
+            if name not in creates:
+                for rule in group_rules.get(group_ids[name], []):
+                    existing.setdefault(self._rule_key(rule, group_ids),
+                                        []).append(rule)
+
+            for rule in spec.get('rules') or []:
+                key = self._rule_key(rule, group_ids)
+                if existing.get(key):
+                    existing[key].pop()
+                    continue
+                remote = rule.get('remote_group')
+                if (remote is not None and remote not in creates and
+                        remote not in group_ids):
+                    raise exceptions.VinfraError(
+                        "Remote security group {!r} of the {!r} security "
+                        "group does not exist.".format(remote, name))
+                operations.append(Operation(
+                    'security group rule', 'create',
+                    self._rule_name(name, rule),
+                    functools.partial(self._create_rule, rules_manager,
+                                      group_ref(name),
+                                      remote and group_ref(remote), rule),
+                    changes=dict((field, (None, rule[field]))
+                                 for field in _RULE_FIELDS if field in rule),
+                    requires=[creates.get(name), creates.get(remote)]))
+
+            if self.prune:
+                manages_egress = any(rule.get('direction') == 'egress'
+                                     for rule in spec.get('rules') or [])
+                for rules in existing.values():
+                    for rule in rules:
+                        if (not manages_egress and
+                                self._is_default_egress(rule)):
+                            continue
+                        operations.append(Operation(
+                            'security group rule', 'delete',
+                            '{}: {}'.format(name, base.get_id(rule)),
+                            functools.partial(rules_manager.delete, rule)))
+
+        if self.prune and self.project_id is None:
+            LOG.warning("Security groups are not pruned: the session is not "
+                        "scoped to a project.")
+        elif self.prune:
+            names = set(spec['name'] for spec in specs)
+            for group in groups:
+                # every project has its own default group
+                if group.name not in names and group.name != 'default':
+                    operations.append(Operation(
+                        'security group', 'delete', group.name,
+                        functools.partial(groups_manager.delete, group)))
+        return operations
+
+    @staticmethod
+    def _create_rule(manager, group, remote_group, rule):
+        kwargs = dict((field, rule.get(field)) for field in _RULE_FIELDS
+                      if field not in ('direction', 'remote_group'))
+        return manager.create(
+            group(), rule['direction'],
+            remote_group=remote_group() if remote_group else None, **kwargs)
+
+    def _plan_quotas(self):
+        manager = self.compute.quotas
+        operations = []
+        for spec in self.state['quotas']:
+            project = spec['project']
+            current = self.snapshot[('quotas', project)].to_dict()
+            changes = {}
+            for key, path in sorted(_QUOTA_PATHS.items()):
+                if key in spec:
+                    old = _get_path(current, path)
+                    if old != spec[key]:
+                        changes[key] = (old, spec[key])
+            for policy, limit in sorted(
+                    (spec.get('storage_policies') or {}).items()):
+                old = _get_path(current, ('storage', 'storage_policies',
+                                          policy, 'limit'))
+                if old != limit:
+                    changes['storage_policies.{}'.format(policy)] = (old,
+                                                                      limit)
+            if not changes:
+                continue
+
+            kwargs = dict((key, new) for key, (_old, new) in changes.items()
+                          if key in _QUOTA_PATHS)
+            policies = [(key.split('.', 1)[1], new)
+                        for key, (_old, new) in sorted(changes.items())
+                        if key.startswith('storage_policies.')]
+            if policies:
+                kwargs['storage_policies'] = policies
+            operations.append(Operation(
+                'quota', 'update', project,
+                functools.partial(manager.update, project, **kwargs),
+                changes=changes))
+        return operations
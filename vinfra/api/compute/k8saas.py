@@ -1,8 +1,12 @@
+import logging
+
 from vinfra import api_versions
 from vinfra import exceptions
 from vinfra.api import base
 from vinfra.api.compute.base import Manager
-from vinfra.utils import flatten_args
+from vinfra.utils import concurrent_imap, concurrent_map, flatten_args
+
+LOG = logging.getLogger(__name__)
 
 
 class K8saasClusterCreateTask(base.PollTask):
@@ -109,6 +113,66 @@ class K8saasClusterUpgradeTask(base.StatusTask):
     status = 'ACTIVE'
 
 
+class K8saasFleetHealth(object):
+    def __init__(self, manager, clusters, nodegroups=True, concurrency=None):
+        """Check health of many Kubernetes clusters concurrently.
+
+        Iterating yields one summary per cluster as soon as its checks are
+        finished, i.e. not in the order of clusters.
+
+        :param manager: Kubernetes cluster manager
+        :param clusters: clusters to check
+        :param nodegroups: check statuses of worker groups as well
+        :param concurrency: max number of clusters checked at once
+        """
+        self.manager = manager
+        self.clusters = list(clusters)
+        self.nodegroups = nodegroups
+        self.concurrency = concurrency
+
+    def check(self, cluster):
+        """Return a health summary of one cluster."""
+        summary = {
+            'id': base.get_id(cluster),
+            'name': cluster.name,
+            'status': cluster.status,
+            'healthy': False,
+            'workergroups': None,
+            'workergroups_not_active': [],
+            'servers': None,
+            'servers_not_responding': [],
+            'error': None,
+        }
+        try:
+            if self.nodegroups:
+                nodegroups = cluster.nodegroups_manager.list()
+                summary['workergroups'] = len(nodegroups)
+                summary['workergroups_not_active'] = sorted(
+                    ng.name for ng in nodegroups if ng.status != 'ACTIVE')
+
+            health = self.manager.healthcheck(cluster)
+            if health is not None:
+                servers = [server for ng in health.nodegroups
+                           for server in ng['servers']]
+                summary['servers'] = len(servers)
+                summary['servers_not_responding'] = sorted(
+                    server['id'] for server in servers
+                    if server['agent_status'] != 'active')
+        except Exception as err:  # pylint: disable=broad-except
+            summary['error'] = str(err)
+            return summary
+
+        summary['healthy'] = (cluster.status == 'ACTIVE' and
+                              not summary['workergroups_not_active'] and
+                              not summary['servers_not_responding'])
+        return summary
+
+    def __iter__(self):
+        for _cluster, summary, _error in concurrent_imap(
+                self.check, self.clusters, concurrency=self.concurrency):
+            yield summary
+
+
 class K8saasCluster(base.Resource):
     @property
     def nodegroups_manager(self):
@@ -208,6 +272,52 @@ class K8saasClusterManager(Manager):
         cluster_id = base.get_id(cluster)
         return self._get("{}/{}/health".format(self.base_url, cluster_id))
 
+    def fleet_health(self, clusters=None, **kwargs):
+        """Return a K8saasFleetHealth for the clusters, all of them by
+        default. See K8saasFleetHealth for arguments.
+        """
+        if clusters is None:
+            clusters = self.list()
+        return K8saasFleetHealth(self, clusters, **kwargs)
+
+    def update_nodegroups_async(self, updates, concurrency=None):
+        """Update worker groups of many clusters concurrently.
+
+        :param updates: list of (nodegroup, params) pairs, where params are
+                        K8saasNodeGroupManager.update_async arguments
+        :param concurrency: max number of concurrent requests
+        :return: K8saasNodeGroupBatchUpdateTask
+        """
+        updates = list(updates)
+
+        def update(item):
+            nodegroup, params = item
+            return nodegroup.update_async(**params).get_info()
+
+        nodegroups = concurrent_map(update, updates, concurrency=concurrency,
+                                    return_exceptions=True)
+        expected = dict(
+            (base.get_id(nodegroup), flatten_args(**dict(
+                (key, params.get(key))
+                for key in K8saasNodeGroupBatchUpdateTask.expected_keys)))
+            for nodegroup, params in updates)
+        # nodegroup doesn't provide updated_at, so the update of every
+        # cluster is gated with K8saasClusterStartUpdateTask
+        start_tasks = {}
+        for (nodegroup, _params), result in zip(updates, nodegroups):
+            if not isinstance(result, Exception):
+                cluster = nodegroup.manager.cluster
+                start_tasks.setdefault(
+                    base.get_id(cluster),
+                    K8saasClusterStartUpdateTask(cluster.manager, cluster))
+        return K8saasNodeGroupBatchUpdateTask(
+            self, nodegroups, expected=expected, start_tasks=start_tasks,
+            concurrency=concurrency)
+
+    @base.async_wait
+    def update_nodegroups(self, *args, **kwargs):
+        return self.update_nodegroups_async(*args, **kwargs)
+
     def get_defaults(self, version=None):
         url = '{}/defaults/{}'.format(
             self.base_url, version if version else '')
@@ -282,6 +392,80 @@ class K8saasNodeGroupUpgradeTask(base.StatusTask):
     status = 'ACTIVE'
 
 
+class K8saasNodeGroupBatchUpdateTask(base.BatchStatusTask):
+    """Wait for worker groups of many clusters to get ACTIVE.
+
+    Worker groups are polled with one list request per cluster, clusters
+    are polled concurrently. Like for a single worker group, worker groups
+    of a cluster are not polled until the cluster update has started:
+    right after the update request they are still ACTIVE and may already
+    have the requested node counts. A worker group is ready once it is
+    ACTIVE and its node counts are equal to the requested ones. Statuses
+    like UPDATE_FAILED are failures.
+    """
+    status = 'ACTIVE'
+    expected_keys = ('node_count', 'min_node_count', 'max_node_count')
+
+    def __init__(self, manager, nodegroups, expected=None, start_tasks=None,
+                 concurrency=None):
+        """
+        :param manager: Kubernetes cluster manager
+        :param nodegroups: worker groups to wait for
+        :param expected: expected attributes per worker group ID
+        :param start_tasks: K8saasClusterStartUpdateTask per cluster ID
+        :param concurrency: max number of concurrent list requests
+        """
+        super(K8saasNodeGroupBatchUpdateTask, self).__init__(manager,
+                                                             nodegroups)
+        self.expected = expected or {}
+        self.start_tasks = dict(start_tasks or {})
+        self.concurrency = concurrency
+
+    def _list(self, cluster_id, manager):
+        start_task = self.start_tasks.get(cluster_id)
+        if start_task is not None:
+            if start_task.poll() is None:
+                return []  # the cluster update has not started yet
+            del self.start_tasks[cluster_id]
+        return manager.list()
+
+    def fetch(self, ids):
+        ids = set(ids)
+        managers = {}
+        for resource in self.resources:
+            if (not isinstance(resource, Exception) and
+                    base.get_id(resource) in ids):
+                managers.setdefault(base.get_id(resource.manager.cluster),
+                                    resource.manager)
+
+        nodegroups = []
+        for cluster_id, result in zip(
+                managers, concurrent_map(
+                    lambda cluster_id: self._list(cluster_id,
+                                                  managers[cluster_id]),
+                    list(managers), concurrency=self.concurrency,
+                    return_exceptions=True)):
+            if isinstance(result, Exception):
+                # the worker groups are polled again on the next round
+                LOG.warning("Failed to list worker groups of the Kubernetes "
+                            "cluster %s: %s", cluster_id, result)
+                continue
+            nodegroups.extend(result)
+        return nodegroups
+
+    def is_failed(self, resource):
+        return (resource.status.endswith('_FAILED') or
+                super(K8saasNodeGroupBatchUpdateTask, self).is_failed(
+                    resource))
+
+    def is_ready(self, resource):
+        if resource.status != self.status:
+            return False
+        expected = self.expected.get(base.get_id(resource), {})
+        return all(getattr(resource, key, value) == value
+                   for key, value in expected.items())
+
+
 class K8saasNodeGroup(base.Resource):
     def delete_async(self):
         return self.manager.delete_async(self)
@@ -0,0 +1,131 @@
+import collections
+import datetime
+import time
+
+from vinfra.api import base
+from vinfra.request_cache import expire_cached_requests
+from vinfra.utils import concurrent_map
+
+__all__ = ['StatSampler', 'SampleBuffer', 'flatten_stat']
+
+Sample = collections.namedtuple(
+    'Sample', ['timestamp', 'server_id', 'server_name', 'values', 'error'])
+
+
+def flatten_stat(data, prefix=''):
+    """Flatten nested statistics to a dict with dot separated keys.
+
+    >>> flatten_stat({'cpu': {'usage': 10}, 'disks': [{'read': 1}]})
+    {'cpu.usage': 10, 'disks.0.read': 1}
+    """
+    rv = {}
+    if isinstance(data, dict):
+        items = data.items()
+    elif isinstance(data, (list, tuple)):
+        items = enumerate(data)
+    else:
+        return {prefix: data}
+
+    for key, value in items:
+        key = '{}.{}'.format(prefix, key) if prefix else '{}'.format(key)
+        rv.update(flatten_stat(value, key))
+    return rv
+
+
+class SampleBuffer(object):
+    def __init__(self, size):
+        """Last samples of one server.
+
+        Metric names are kept once per buffer, a sample is stored as a
+        timestamp and a tuple of values in the order of the names.
+
+        :param size: max number of samples to keep
+        """
+        self.fields = ()
+        self._indexes = {}
+        self._samples = collections.deque(maxlen=size)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def append(self, timestamp, values):
+        for key in sorted(values):
+            if key not in self._indexes:
+                self._indexes[key] = len(self.fields)
+                self.fields += (key,)
+
+        row = [None] * len(self.fields)
+        for key, value in values.items():
+            row[self._indexes[key]] = value
+        self._samples.append((timestamp, tuple(row)))
+
+    def samples(self):
+        """Return (timestamp, {metric: value}) pairs, the oldest first."""
+        return [(timestamp, dict(zip(self.fields, row)))
+                for timestamp, row in self._samples]
+
+    def series(self, field):
+        """Return (timestamp, value) pairs of one metric."""
+        index = self._indexes.get(field)
+        if index is None:
+            return []
+        return [(timestamp, row[index] if index < len(row) else None)
+                for timestamp, row in self._samples]
+
+
+class StatSampler(object):
+    def __init__(self, manager, servers, interval=None, count=None,
+                 concurrency=None, history=60):
+        """Sample statistics of many servers with bounded concurrency.
+
+        :param manager: server manager
+        :param servers: servers to sample
+        :param interval: time between the starts of sampling rounds,
+                         in seconds
+        :param count: number of rounds, infinite if not specified
+        :param concurrency: max number of concurrent requests
+        :param history: number of samples kept per server
+        """
+        self.manager = manager
+        self.servers = list(servers)
+        self.interval = interval
+        self.count = count
+        self.concurrency = concurrency
+        self.buffers = dict((base.get_id(server), SampleBuffer(history))
+                            for server in self.servers)
+
+    def _stat(self, server):
+        timestamp = datetime.datetime.utcnow()
+        try:
+            data = self.manager.stat(server)
+        except Exception as err:  # pylint: disable=broad-except
+            return timestamp, None, err
+        return timestamp, flatten_stat(data or {}), None
+
+    def sample(self):
+        """Run one sampling round and return a list of samples."""
+        samples = []
+        for server, (timestamp, values, error) in zip(
+                self.servers,
+                concurrent_map(self._stat, self.servers,
+                               concurrency=self.concurrency)):
+            server_id = base.get_id(server)
+            if values is not None:
+                self.buffers[server_id].append(timestamp, values)
+            samples.append(Sample(
+                timestamp=timestamp, server_id=server_id,
+                server_name=getattr(server, 'name', None), values=values,
+                error=str(error) if error is not None else None))
+        return samples
+
+    def __iter__(self):
+        """Yield a list of samples for every round."""
+        rounds = 0
+        started = None
+        while self.count is None or rounds < self.count:
+            if started is not None and self.interval:
+                time.sleep(max(self.interval - (time.time() - started), 0))
+            started = time.time()
+            expire_cached_requests()
+            yield self.sample()
+            rounds += 1
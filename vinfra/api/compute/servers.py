@@ -1,9 +1,12 @@
+import copy
 import time
 
 from vinfra import api_versions
 from vinfra import exceptions
 from vinfra.api import base
 from vinfra.api.compute.base import Manager
+from vinfra.api.compute.sampler import StatSampler
+from vinfra.utils import concurrent_map
 
 
 class StartTask(base.StatusTask):
@@ -14,6 +17,10 @@ class CreateTask(base.StatusTask):
     status = 'ACTIVE'
 
 
+class BatchCreateTask(base.BatchStatusTask):
+    status = 'ACTIVE'
+
+
 class StopTask(base.StatusTask):
     status = 'SHUTOFF'
 
@@ -359,6 +366,54 @@ class ServerManager(Manager):
     def create(self, *args, **kwargs):
         return self.create_async(*args, **kwargs)
 
+    @staticmethod
+    def _check_shared_resources(networks, volumes):
+        for net in networks:
+            if 'port_id' in net or 'mac_addr' in net:
+                raise exceptions.VinfraError(
+                    "Ports and MAC addresses cannot be shared between "
+                    "multiple servers.")
+            for fixed_ip in net.get('fixed_ips') or []:
+                if fixed_ip.get('ip_address'):
+                    raise exceptions.VinfraError(
+                        "Fixed IP addresses cannot be shared between "
+                        "multiple servers.")
+        for volume in volumes:
+            if volume.get('source_type') == 'volume':
+                raise exceptions.VinfraError(
+                    "Existing volumes cannot be shared between multiple "
+                    "servers.")
+
+    def create_many_async(self, names, flavor, networks, volumes,
+                          concurrency=None, **kwargs):
+        """Create servers with the same configuration concurrently.
+
+        Flavor, networks and volumes must be already resolved to IDs, they
+        are shared by all the servers. Other arguments are the same as for
+        create_async.
+
+        :param names: names of servers to create
+        :param concurrency: max number of concurrent create requests
+        :return: BatchCreateTask; its result has a server or an exception
+                 for every name
+        """
+        names = list(names)
+        if len(names) > 1:
+            self._check_shared_resources(networks, volumes)
+
+        def create(name):
+            task = self.create_async(name, flavor, copy.deepcopy(networks),
+                                     copy.deepcopy(volumes), **kwargs)
+            return task.get_info()
+
+        servers = concurrent_map(create, names, concurrency=concurrency,
+                                 return_exceptions=True)
+        return BatchCreateTask(self, servers)
+
+    @base.async_wait
+    def create_many(self, *args, **kwargs):
+        return self.create_many_async(*args, **kwargs)
+
     def update(self, server, name=None, description=None, ha_enabled=None,
                traits=None, allow_live_resize=None):
         data = {}
@@ -462,6 +517,12 @@ class ServerManager(Manager):
         url = "{}/{}/stat".format(self.base_url, base.get_id(server))
         return self.client.get(url)
 
+    def sampler(self, servers=None, **kwargs):
+        """Return a StatSampler for the servers, all of them by default."""
+        if servers is None:
+            servers = self.list(limit=-1)
+        return StatSampler(self, servers, **kwargs)
+
     def log(self, server):
         url = "{}/{}/log".format(self.base_url, base.get_id(server))
         return self.client.get(url)
@@ -1,7 +1,11 @@
+import logging
+
 from vinfra import exceptions
 from vinfra.api import base
 from vinfra.api.compute.base import Manager
-from vinfra.utils import flatten_args
+from vinfra.utils import concurrent_map, flatten_args
+
+LOG = logging.getLogger(__name__)
 
 
 class VolumeSnapshotCreateTask(base.PollTask):
@@ -39,6 +43,30 @@ class VolumeSnapshotCreateTask(base.PollTask):
         return self.resource
 
 
+class VolumeSnapshotBatchCreateTask(base.BatchStatusTask):
+    status = 'available'
+    pending_statuses = ('creating',)
+
+    def __init__(self, manager, resources, concurrency=None):
+        super(VolumeSnapshotBatchCreateTask, self).__init__(manager,
+                                                            resources)
+        self.concurrency = concurrency
+
+    def fetch(self, ids):
+        # the snapshot listing is not known to filter by ID
+        resources = []
+        for snapshot_id, result in zip(ids, concurrent_map(
+                self.manager.get, ids, concurrency=self.concurrency,
+                return_exceptions=True)):
+            if isinstance(result, Exception):
+                # the snapshot is polled again on the next round
+                LOG.debug("Failed to get volume snapshot %s: %s",
+                          snapshot_id, result)
+                continue
+            resources.append(result)
+        return resources
+
+
 class VolumeSnapshotDeleteTask(base.PollTask):
     def __init__(self, manager, volume_id, resource):
         self.manager = manager
@@ -132,6 +160,28 @@ class VolumeSnapshotManager(Manager):
     def create(self, volume_id, **kwargs):
         return self.create_async(volume_id, **kwargs)
 
+    def create_many_async(self, volume_ids, name=None, description=None,
+                          concurrency=None):
+        """Snapshot many volumes concurrently, one snapshot per volume.
+
+        :param volume_ids: IDs of volumes to snapshot
+        :param concurrency: max number of concurrent create requests
+        :return: VolumeSnapshotBatchCreateTask
+        """
+        def create(volume_id):
+            return self.create_async(volume_id, name=name,
+                                     description=description).get_info()
+
+        snapshots = concurrent_map(create, volume_ids,
+                                   concurrency=concurrency,
+                                   return_exceptions=True)
+        return VolumeSnapshotBatchCreateTask(self, snapshots,
+                                             concurrency=concurrency)
+
+    @base.async_wait
+    def create_many(self, *args, **kwargs):
+        return self.create_many_async(*args, **kwargs)
+
     def delete_async(self, volume_snapshot):
         snapshot_id = base.get_id(volume_snapshot)
         self._delete("{}/{}".format(self.base_url, snapshot_id))
@@ -1,7 +1,7 @@
 from vinfra import exceptions
 from vinfra.api import base
 from vinfra.api.compute.base import Manager
-from vinfra.utils import flatten_args
+from vinfra.utils import concurrent_map, flatten_args
 
 
 class VolumeCreateTask(base.PollTask):
@@ -36,6 +36,11 @@ class VolumeCreateTask(base.PollTask):
         return self.resource
 
 
+class VolumeBatchCreateTask(base.BatchStatusTask):
+    status = 'available'
+    pending_statuses = ('creating', 'downloading')
+
+
 class VolumeExtendTask(base.PollTask):
     def __init__(self, resource):
         self.resource = resource
@@ -160,6 +165,26 @@ class VolumeManager(Manager):
     def create(self, size, storage_policy_name, **kwargs):
         return self.create_async(size, storage_policy_name, **kwargs)
 
+    def create_many_async(self, names, size, storage_policy_name,
+                          concurrency=None, **kwargs):
+        """Create volumes with the same parameters concurrently.
+
+        :param names: names of volumes to create
+        :param concurrency: max number of concurrent create requests
+        :return: VolumeBatchCreateTask
+        """
+        def create(name):
+            return self.create_async(size, storage_policy_name, name=name,
+                                     **kwargs).get_info()
+
+        volumes = concurrent_map(create, names, concurrency=concurrency,
+                                 return_exceptions=True)
+        return VolumeBatchCreateTask(self, volumes)
+
+    @base.async_wait
+    def create_many(self, *args, **kwargs):
+        return self.create_many_async(*args, **kwargs)
+
     def delete_async(self, volume):
         volume_id = base.get_id(volume)
         self._delete("{}/{}".format(self.base_url, volume_id))
@@ -204,6 +229,27 @@ class VolumeManager(Manager):
         new_volume = self._post(url, json=json)
         return VolumeCreateTask(new_volume)
 
+    def clone_many_async(self, volume, names, storage_policy_name=None,
+                         size=None, concurrency=None):
+        """Create many clones of the volume concurrently.
+
+        :param names: names of new volumes
+        :param concurrency: max number of concurrent clone requests
+        :return: VolumeBatchCreateTask
+        """
+        def clone(name):
+            return self.clone_async(
+                volume, name, storage_policy_name=storage_policy_name,
+                size=size).get_info()
+
+        volumes = concurrent_map(clone, names, concurrency=concurrency,
+                                 return_exceptions=True)
+        return VolumeBatchCreateTask(self, volumes)
+
+    @base.async_wait
+    def clone_many(self, *args, **kwargs):
+        return self.clone_many_async(*args, **kwargs)
+
     def upload_to_image_async(self, volume, name=None):
         volume_id = base.get_id(volume)
         json = flatten_args(
@@ -5,6 +5,7 @@ from requests import adapters
 from urllib3.connection import HTTPConnection
 
 from vinfra import api_versions
+from vinfra.compat import urlparse
 from vinfra import exceptions
 from vinfra.api import base
 
@@ -62,6 +63,35 @@ class HaConfig(object):
             raise exceptions.VinfraError("No HA configuration exists")
         return ha_config
 
+    def get_endpoints(self):
+        """Return URLs of the management endpoints of the HA configuration.
+
+        Virtual IPs go first, then hostnames of the HA nodes. The scheme
+        and the port are the ones of the session URL.
+        """
+        config = self.get()
+        url = urlparse(self.api.session.url)
+
+        hosts = [vip['ip'] for vip in config.get('virtual_ips') or []
+                 if vip.get('ip')]
+        node_ids = set(node['id'] if isinstance(node, dict) else node
+                       for node in config.get('nodes') or [])
+        if node_ids:
+            hosts.extend(node.host for node in self.api.nodes.list()
+                         if node.id in node_ids and
+                         getattr(node, 'host', None))
+
+        endpoints = []
+        for host in hosts:
+            if ':' in host:  # IPv6 address
+                host = '[{}]'.format(host)
+            if url.port:
+                host = '{}:{}'.format(host, url.port)
+            endpoint = '{}://{}'.format(url.scheme, host)
+            if endpoint not in endpoints:
+                endpoints.append(endpoint)
+        return endpoints
+
     def create_async(self, nodes, virtual_ips, force=None):
         data = {
             'nodes': [base.get_id(node) for node in nodes],
@@ -9,9 +9,27 @@ class BaseResource(base.Resource):
     class Schema(ma.Schema):
         pass
 
+    # schema instances keyed by (resource class, strict)
+    _schemas = {}
+
     @classmethod
     def schema(cls, strict=True):
-        return cls.Schema(strict=strict)
+        key = (cls, strict)
+        schema = cls._schemas.get(key)
+        if schema is None:
+            schema = cls._schemas.setdefault(key, cls.Schema(strict=strict))
+        return schema
+
+    @classmethod
+    def load_many(cls, manager, data):
+        """Build resources from a list response with a single schema load."""
+        items = []
+        for info in cls.schema().load(data or [], many=True).data:
+            obj = cls.__new__(cls)
+            obj.manager = manager
+            obj.__dict__.update(info)
+            items.append(obj)
+        return items
 
     # pylint: disable=super-init-not-called
     # noinspection PyMissingConstructor
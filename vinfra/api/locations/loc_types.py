@@ -105,6 +105,9 @@ class LocationsManager(base.Manager):
     def list(self):
         return self._list(self._url())
 
+    def _make_resources(self, data):
+        return self.resource_class.load_many(self, data)
+
     def create(self, parent_id, name):
         return self._post(
             self._parent_url(parent_id),
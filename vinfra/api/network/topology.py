@@ -0,0 +1,111 @@
+import threading
+
+from vinfra import exceptions
+from vinfra.api import base
+
+
+def _node_display_name(node):
+    return getattr(node, 'host', None) or base.get_id(node)
+
+
+class TopologyResolver(object):
+    def __init__(self, api, concurrency=None):
+        """Node network topology fetched once per operation.
+
+        Networks are listed once and node interfaces are fetched
+        concurrently with a node inventory. Create a new resolver for every
+        operation: nothing is ever refreshed.
+
+        :param api: vinfra api
+        :param concurrency: max number of concurrent requests
+        """
+        self.api = api
+        self.concurrency = concurrency
+        self._networks = None
+        self._ifaces = {}
+        self._lock = threading.Lock()
+
+    @property
+    def networks(self):
+        if self._networks is None:
+            self._networks = self.api.networks.list()
+        return self._networks
+
+    def find_network(self, traffic_type):
+        for network in self.networks:
+            if traffic_type in network.traffic_types:
+                return network
+        return None
+
+    def get_network(self, traffic_type):
+        network = self.find_network(traffic_type)
+        if not network:
+            msg = "Network with {!r} traffic type not found".format(
+                traffic_type)
+            raise exceptions.VinfraError(msg)
+        return network
+
+    def _node_obj(self, node):
+        if getattr(node, 'ifaces_manager', None) is None:
+            return self.api.node_obj(base.get_id(node))
+        return node
+
+    def _fetch_ifaces(self, node):
+        ifaces = self._node_obj(node).ifaces_manager.list()
+        with self._lock:
+            self._ifaces[base.get_id(node)] = ifaces
+        return ifaces
+
+    def prefetch(self, nodes):
+        """Fetch interfaces of all the nodes which are not fetched yet.
+
+        They are fetched as one node inventory. Nodes failing it are fetched
+        again on demand, which raises their errors.
+        """
+        missing = []
+        seen = set()
+        for node in nodes:
+            node_id = base.get_id(node)
+            if node_id not in self._ifaces and node_id not in seen:
+                seen.add(node_id)
+                missing.append(self._node_obj(node))
+        if not missing:
+            return
+        inventory = self.api.nodes.snapshot(nodes=missing, phases=['ifaces'],
+                                            concurrency=self.concurrency)
+        with self._lock:
+            self._ifaces.update(inventory.ifaces)
+
+    def get_ifaces(self, node):
+        ifaces = self._ifaces.get(base.get_id(node))
+        if ifaces is None:
+            ifaces = self._fetch_ifaces(node)
+        return ifaces
+
+    def find_iface(self, node, network):
+        for iface in self.get_ifaces(node):
+            if iface.network == base.get_id(network):
+                return iface
+        return None
+
+    def resolve(self, nodes, traffic_type):
+        """Return interfaces with traffic_type assigned, one per node.
+
+        Errors for all misconfigured nodes are reported at once.
+        """
+        network = self.get_network(traffic_type)
+        self.prefetch(nodes)
+
+        ifaces = []
+        errors = []
+        for node in nodes:
+            iface = self.find_iface(node, network)
+            if iface is None:
+                errors.append(
+                    "Traffic type {!r} is not assigned on node {!r}".format(
+                        traffic_type, _node_display_name(node)))
+            ifaces.append(iface)
+
+        if errors:
+            raise exceptions.VinfraError("\n".join(errors))
+        return ifaces
@@ -1,6 +1,6 @@
 from vinfra import exceptions
 from vinfra.api import base
-from vinfra.utils import first
+from vinfra.api.network.topology import TopologyResolver
 
 
 def get_api_nodes(nodes):
@@ -57,50 +57,37 @@ class NodeManager(base.Manager):
         url = "{}/release-nodes".format(self.base_url)
         return self.client.post_async(url, json=data)
 
-    def _get_ostor_private_network(self):
-        ostor_private_network = first(
-            network for network in self.api.networks.list()
-            if self._ostor_private_traffic_type in network.traffic_types
-        )
-        if not ostor_private_network:
-            msg = "Network with traffic type {!r} not found".format(
-                self._ostor_private_traffic_type)
-            raise exceptions.VinfraError(msg)
-        return ostor_private_network
-
-    def _get_private_address(self, node, ostor_private_network):
-        priv_iface = first(
-            iface for iface in node.ifaces_manager.list()
-            if iface.network == ostor_private_network.id
-        )
-
-        if not priv_iface:
-            msg = "Traffic type {!r} is not assigned on node {!r}".format(
-                self._ostor_private_traffic_type, node)
-            raise exceptions.VinfraError(msg)
-
-        if not priv_iface.ipv4:
-            msg = "Interface {!r} on node {!r} does not have an " \
-                  "IP address".format(priv_iface, node)
-            raise exceptions.VinfraError(msg)
-
-        if len(priv_iface.ipv4) > 1:
-            msg = "Interface {!r} on node {!r} has a several IP addresses. " \
-                  "Specify which one to use.".format(priv_iface, node)
-            raise exceptions.VinfraError(msg)
-        return priv_iface.ipv4[0].split('/')[0]
+    @staticmethod
+    def _check_private_iface(node, iface):
+        if not iface.ipv4:
+            return "Interface {!r} on node {!r} does not have an " \
+                   "IP address".format(iface, node)
+
+        if len(iface.ipv4) > 1:
+            return "Interface {!r} on node {!r} has a several IP addresses. " \
+                   "Specify which one to use.".format(iface, node)
+        return None
 
     def _adjust_nodes(self, nodes):
         for item in nodes:
             item['id'] = base.get_id(item['node'])
 
-        if all((item['ip_address'] for item in nodes)):
+        missing = [item for item in nodes if not item['ip_address']]
+        if not missing:
             return nodes
 
-        ostor_private_network = self._get_ostor_private_network()
-        for item in nodes:
-            if item['ip_address']:
-                continue
-            item['ip_address'] = self._get_private_address(
-                item['node'], ostor_private_network)
+        topology = TopologyResolver(self.api)
+        ifaces = topology.resolve([item['node'] for item in missing],
+                                  self._ostor_private_traffic_type)
+
+        errors = []
+        for item, iface in zip(missing, ifaces):
+            error = self._check_private_iface(item['node'], iface)
+            if error:
+                errors.append(error)
+            else:
+                item['ip_address'] = iface.ipv4[0].split('/')[0]
+
+        if errors:
+            raise exceptions.VinfraError("\n".join(errors))
         return nodes
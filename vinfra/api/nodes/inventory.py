@@ -0,0 +1,117 @@
+import time
+
+from vinfra.api import base
+from vinfra.utils import concurrent_map
+
+__all__ = ['NodeInventory']
+
+
+class NodeInventory(object):
+    phases = ('disks', 'ifaces', 'iscsi')
+
+    def __init__(self, nodes, timestamp=None):
+        """Cluster nodes with their sub-resources fetched at one moment.
+
+        :param nodes: list of nodes
+        :param timestamp: time the snapshot has been started at
+        """
+        self.nodes = list(nodes)
+        self.timestamp = timestamp or time.time()
+        self.disks = {}
+        self.ifaces = {}
+        self.iscsi = {}
+        self.timings = {}
+        self.errors = {}
+
+    @classmethod
+    def fetch(cls, manager, nodes=None, phases=None, concurrency=None):
+        """Fetch the inventory with bounded concurrency.
+
+        Phases run one after another, the nodes within a phase are fetched
+        concurrently. A failed fetch does not fail the snapshot: the error
+        is recorded in errors[node_id][phase].
+
+        :param manager: node manager
+        :param nodes: nodes to fetch, all the nodes if not specified
+        :param phases: sub-resources to fetch, all of phases by default
+        :param concurrency: max number of concurrent requests
+        """
+        started = time.time()
+        timings = {}
+        if nodes is None:
+            nodes = manager.list()
+            timings['nodes'] = time.time() - started
+
+        inventory = cls(nodes, timestamp=started)
+        inventory.timings.update(timings)
+        for phase in phases or cls.phases:
+            inventory.fetch_phase(phase, concurrency=concurrency)
+        inventory.timings['total'] = time.time() - started
+        return inventory
+
+    def fetch_phase(self, phase, concurrency=None):
+        if phase not in self.phases:
+            raise ValueError("Unknown inventory phase: {}".format(phase))
+
+        fetch = getattr(self, '_fetch_{}'.format(phase))
+        started = time.time()
+        results = concurrent_map(fetch, self.nodes, concurrency=concurrency,
+                                 return_exceptions=True)
+        self.timings[phase] = time.time() - started
+
+        data = getattr(self, phase)
+        for node, result in zip(self.nodes, results):
+            node_id = base.get_id(node)
+            if isinstance(result, Exception):
+                self.errors.setdefault(node_id, {})[phase] = str(result)
+            else:
+                data[node_id] = result
+
+    @staticmethod
+    def _fetch_disks(node):
+        return node.disks_manager.list()
+
+    @staticmethod
+    def _fetch_ifaces(node):
+        return node.ifaces_manager.list()
+
+    @staticmethod
+    def _fetch_iscsi(node):
+        return node.iscsi_manager.get()
+
+    def get_node(self, node):
+        node_id = base.get_id(node)
+        for item in self.nodes:
+            if base.get_id(item) == node_id:
+                return item
+        return None
+
+    def get_disks(self, node):
+        return self.disks.get(base.get_id(node))
+
+    def get_ifaces(self, node):
+        return self.ifaces.get(base.get_id(node))
+
+    def get_iscsi(self, node):
+        return self.iscsi.get(base.get_id(node))
+
+    def node_to_dict(self, node):
+        node_id = base.get_id(node)
+        data = node.to_dict()
+        if node_id in self.disks:
+            data['disks'] = [disk.to_dict() for disk in self.disks[node_id]]
+        if node_id in self.ifaces:
+            data['ifaces'] = [iface.to_dict() for iface in self.ifaces[node_id]]
+        if node_id in self.iscsi:
+            iscsi = self.iscsi[node_id]
+            data['iscsi_target'] = iscsi.to_dict() if iscsi else None
+        if node_id in self.errors:
+            data['errors'] = dict(self.errors[node_id])
+        return data
+
+    def to_dict(self):
+        return {
+            'timestamp': self.timestamp,
+            'nodes': [self.node_to_dict(node) for node in self.nodes],
+            'timings': dict(self.timings),
+        }
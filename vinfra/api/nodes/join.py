@@ -0,0 +1,211 @@
+import collections
+import logging
+import time
+
+from requests import exceptions as request_exceptions
+
+from vinfra import exceptions
+from vinfra.api import base
+from vinfra.api.tasks import TaskIndex
+from vinfra.request_cache import expire_cached_requests
+from vinfra.utils import DEFAULT_CONCURRENCY, concurrent_map
+
+__all__ = ['NodeJoin']
+
+LOG = logging.getLogger(__name__)
+
+
+class NodeJoin(object):
+    # responses of a backend which cannot accept one more operation now
+    busy_status_codes = (409, 429, 503)
+    busy_delay = 5
+    max_busy_delay = 60
+    poll_interval = 2
+    default_timeout = 3600
+
+    def __init__(self, cluster, nodes, disks=None, concurrency=None):
+        """Join many nodes to the cluster.
+
+        All the nodes are validated and their join configurations are
+        fetched concurrently before anything is submitted, so a bad disk
+        layout of one node joins none of them. Then no more than
+        concurrency joins are in progress at a time: a new join is
+        submitted as soon as one of them finishes. A busy backend delays
+        the next submission instead of failing it, a node failing to be
+        submitted does not stop joining the others. All the join tasks are
+        polled with one task listing.
+
+        :param cluster: cluster to join the nodes to
+        :param nodes: nodes to join
+        :param disks: dict node ID -> disk configuration; nodes missing in
+                      it are joined with their default configuration
+        :param concurrency: max number of joins in progress
+        """
+        self.cluster = cluster
+        self.api = cluster.manager.api
+        self.nodes = list(nodes)
+        self.disks = dict(disks or {})
+        self.concurrency = concurrency or DEFAULT_CONCURRENCY
+        self.configs = None
+        self.results = collections.OrderedDict(
+            (base.get_id(node), {
+                'node_id': base.get_id(node),
+                'host': getattr(node, 'host', None),
+                'task_id': None,
+                'state': 'pending',
+                'error': None,
+                'elapsed': None,
+            }) for node in self.nodes)
+        self._started = {}
+        self._delay = self.busy_delay
+
+    def _fetch_config(self, node):
+        disks = self.disks.get(base.get_id(node))
+        if disks is None:
+            return self.cluster.get_join_config(node)
+        return self.cluster.set_join_config(node, disks)
+
+    def validate(self):
+        """Check all the nodes and fetch their join configurations.
+
+        :raises VinfraError: describing all the nodes which cannot join
+        """
+        problems = []
+        seen = set()
+        for node in self.nodes:
+            name = getattr(node, 'host', None) or base.get_id(node)
+            if base.get_id(node) in seen:
+                problems.append("{}: specified more than once".format(name))
+            seen.add(base.get_id(node))
+            if getattr(node, 'is_assigned', False):
+                problems.append("{}: already in the cluster".format(name))
+            elif getattr(node, 'is_online', True) is False:
+                problems.append("{}: offline".format(name))
+
+        configs = concurrent_map(self._fetch_config, self.nodes,
+                                 concurrency=self.concurrency,
+                                 return_exceptions=True)
+        for node, config in zip(self.nodes, configs):
+            if isinstance(config, Exception):
+                problems.append("{}: failed to get join configuration: "
+                                "{}".format(getattr(node, 'host', None) or
+                                            base.get_id(node), config))
+        if problems:
+            raise exceptions.VinfraError(
+                "Cannot join nodes:\n{}".format('\n'.join(problems)))
+        self.configs = dict((base.get_id(node), config)
+                            for node, config in zip(self.nodes, configs))
+
+    def _get_busy_delay(self, err):
+        response = getattr(err, 'response', None)
+        if (response is None or
+                response.status_code not in self.busy_status_codes):
+            return None
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return self._delay
+
+    def _finish(self, node_id, state, error=None):
+        result = self.results[node_id]
+        result['state'] = state
+        result['error'] = error
+        if node_id in self._started:
+            result['elapsed'] = round(time.time() - self._started[node_id], 1)
+
+    def _submit(self, pending, running, now):
+        """Submit joins until the limit is reached or the backend is busy.
+
+        Return the time to retry at if the backend is busy.
+        """
+        while pending and len(running) < self.concurrency:
+            node = pending[0]
+            node_id = base.get_id(node)
+            try:
+                task = self.cluster.join_node_async(
+                    node, disks=self.disks.get(node_id))
+            except request_exceptions.HTTPError as err:
+                delay = self._get_busy_delay(err)
+                if delay is None:
+                    pending.popleft()
+                    self._finish(node_id, 'failed', str(err))
+                    continue
+                LOG.info("The backend is busy, joining %s in %s seconds",
+                         self.results[node_id]['host'] or node_id, delay)
+                self._delay = min(self._delay * 2, self.max_busy_delay)
+                return now + delay
+            except (exceptions.VinfraError,
+                    request_exceptions.ConnectionError,
+                    request_exceptions.Timeout) as err:
+                pending.popleft()
+                self._finish(node_id, 'failed', str(err))
+                continue
+
+            pending.popleft()
+            self._delay = self.busy_delay
+            task_id = task.data['task_id']
+            running[task_id] = node_id
+            self._started[node_id] = now
+            self.results[node_id].update(task_id=task_id, state='running')
+        return None
+
+    def _poll(self, running, index):
+        expire_cached_requests()
+        try:
+            index.refresh()
+        except (request_exceptions.ConnectionError,
+                request_exceptions.Timeout) as err:
+            # the running joins are polled again on the next round
+            LOG.warning("Failed to list tasks: %s", err)
+            return
+        for task_id, node_id in list(running.items()):
+            try:
+                task = index.get(task_id) or self.api.tasks.get(task_id)
+            except (request_exceptions.ConnectionError,
+                    request_exceptions.Timeout) as err:
+                LOG.warning("Failed to get task %s: %s", task_id, err)
+                continue
+            try:
+                if not self.api.tasks.check_finished(task):
+                    continue
+            except exceptions.TaskError as err:
+                self._finish(node_id, 'failed', str(err))
+            else:
+                self._finish(node_id, task.state)
+            del running[task_id]
+
+    def run(self, timeout=None):
+        """Join the nodes and return the result of every node.
+
+        A failed node does not stop joining the others.
+
+        :param timeout: timeout for all the joins, in seconds
+        :return: list of dicts with node_id, host, task_id, state, error
+                 and elapsed time of every node
+        """
+        if self.configs is None:
+            self.validate()
+
+        timeout = timeout or self.default_timeout
+        deadline = time.time() + timeout
+        pending = collections.deque(self.nodes)
+        running = collections.OrderedDict()
+        index = TaskIndex(self.api.tasks)
+        retry_at = 0
+        self._delay = self.busy_delay
+        while pending or running:
+            now = time.time()
+            if now >= deadline:
+                break
+            if now >= retry_at:
+                retry_at = self._submit(pending, running, now) or 0
+            if running:
+                self._poll(running, index)
+            if pending or running:
+                time.sleep(self.poll_interval)
+
+        for result in self.results.values():
+            if result['state'] in ('pending', 'running'):
+                result['error'] = ("Joining exceeded {} second(s) "
+                                   "timeout".format(timeout))
+        return list(self.results.values())
@@ -0,0 +1,272 @@
+import logging
+
+from vinfra import exceptions
+from vinfra.api import base
+from vinfra.api.tasks import TaskIndex
+from vinfra.utils import concurrent_map
+
+__all__ = ['RollingMaintenance']
+
+LOG = logging.getLogger(__name__)
+
+# phases of a node in rolling maintenance, a node having a task ID is
+# moving to the next phase
+PENDING = 'pending'
+BLOCKED = 'blocked'
+MAINTENANCE = 'maintenance'
+READY = 'ready'  # to exit maintenance
+DONE = 'done'
+
+
+class RollingMaintenance(object):
+    def __init__(self, manager, nodes, batch_size=1, concurrency=None,
+                 state=None, on_change=None, action=None, timeout=None,
+                 skip_blocked=False, start_params=None, stop_params=None,
+                 failure_domains=None):
+        """Put nodes into maintenance and back batch by batch.
+
+        Maintenance prechecks of all the nodes run concurrently first.
+        Nodes passing them are split into batches of up to batch_size
+        nodes of one failure domain, so a batch never takes down more than
+        one failure domain. Nodes with no known failure domain are
+        maintained one by one, and the primary node goes last in a batch
+        of its own. Then every batch enters maintenance, action is called
+        for each of its nodes, and the batch exits maintenance before the
+        next one starts. Tasks of a batch are polled with one task listing.
+
+        The progress is kept in state, a JSON-serializable dict passed to
+        on_change after every step. Passing the saved state back resumes
+        an interrupted run: finished steps are skipped and running tasks
+        are waited for instead of being started again.
+
+        :param manager: node manager
+        :param nodes: nodes to maintain
+        :param batch_size: max number of nodes in maintenance at a time
+        :param concurrency: max number of concurrent requests
+        :param state: state of an interrupted run to resume
+        :param on_change: callable(state) saving the state
+        :param action: callable(node) called while the node is in
+                       maintenance, e.g. to update it
+        :param timeout: timeout of every maintenance step, in seconds
+        :param skip_blocked: maintain the nodes passed prechecks if some
+                             nodes fail them instead of stopping
+        :param start_params: maintenance_start() arguments
+        :param stop_params: maintenance_stop() arguments
+        :param failure_domains: failure domain by node ID, e.g. the rack
+                                of the node
+        """
+        if batch_size < 1:
+            raise ValueError("The batch size must be positive.")
+        self.manager = manager
+        self.nodes = dict((base.get_id(node), node) for node in nodes)
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.on_change = on_change
+        self.action = action
+        self.timeout = timeout
+        self.skip_blocked = skip_blocked
+        self.start_params = start_params or {}
+        self.stop_params = stop_params or {}
+        self.failure_domains = failure_domains or {}
+
+        if state is None:
+            state = {
+                'nodes': dict((node_id, {
+                    'host': getattr(node, 'host', None),
+                    'phase': PENDING,
+                    'batch': None,
+                    'task_id': None,
+                    'error': None,
+                }) for node_id, node in self.nodes.items()),
+                'batches': None,
+                'batch': 0,
+            }
+        elif set(state['nodes']) != set(self.nodes):
+            raise exceptions.VinfraError(
+                "The saved rolling maintenance is for other nodes.")
+        self.state = state
+        self._index = TaskIndex(manager.api.tasks)
+
+    def _save(self):
+        if self.on_change is not None:
+            self.on_change(self.state)
+
+    def _wait(self, node_ids):
+        """Wait for tasks of the nodes, return errors by node ID."""
+        node_ids = [node_id for node_id in node_ids
+                    if self.state['nodes'][node_id]['task_id']]
+        results = self.manager.api.tasks.wait_many(
+            [self.state['nodes'][node_id]['task_id'] for node_id in node_ids],
+            timeout=self.timeout, index=self._index, return_exceptions=True)
+        errors = {}
+        for node_id, result in zip(node_ids, results):
+            # a timed out task is waited for again on resume
+            if not isinstance(result, exceptions.TimeoutError):
+                self.state['nodes'][node_id]['task_id'] = None
+            if isinstance(result, Exception):
+                errors[node_id] = str(result)
+        return errors
+
+    def _submit(self, node_ids, submit):
+        """Start tasks of the nodes not having running ones yet."""
+        node_ids = [node_id for node_id in node_ids
+                    if not self.state['nodes'][node_id]['task_id']]
+        tasks = concurrent_map(lambda node_id: submit(self.nodes[node_id]),
+                               node_ids, concurrency=self.concurrency,
+                               return_exceptions=True)
+        errors = {}
+        for node_id, task in zip(node_ids, tasks):
+            if isinstance(task, Exception):
+                errors[node_id] = str(task)
+            else:
+                self.state['nodes'][node_id]['task_id'] = task.data['task_id']
+        self._save()
+        return errors
+
+    def _step(self, node_ids, phase, next_phase, submit):
+        """Move the nodes in phase to next_phase by tasks started by submit.
+
+        Failed nodes stay in phase, so the step is repeated on resume.
+        """
+        node_ids = [node_id for node_id in node_ids
+                    if self.state['nodes'][node_id]['phase'] == phase]
+        if not node_ids:
+            return {}
+        errors = self._submit(node_ids, submit)
+        errors.update(self._wait([node_id for node_id in node_ids
+                                  if node_id not in errors]))
+        for node_id in node_ids:
+            node_state = self.state['nodes'][node_id]
+            if node_id in errors:
+                node_state['error'] = errors[node_id]
+            else:
+                node_state.update(phase=next_phase, error=None)
+        self._save()
+        return errors
+
+    def precheck(self):
+        """Run maintenance prechecks of all the nodes concurrently.
+
+        Nodes failing them are blocked and left out of the schedule.
+        """
+        node_ids = sorted(self.nodes)
+        tasks = concurrent_map(
+            lambda node_id: self.nodes[node_id].maintenance_precheck(),
+            node_ids, concurrency=self.concurrency, return_exceptions=True)
+        submitted = [(node_id, task) for node_id, task in zip(node_ids, tasks)
+                     if not isinstance(task, Exception)]
+        results = dict(zip(node_ids, tasks))
+        if submitted:
+            results.update(zip(
+                [node_id for node_id, _task in submitted],
+                self.manager.api.tasks.wait_many(
+                    [task.data['task_id'] for _node_id, task in submitted],
+                    timeout=self.timeout, index=self._index,
+                    return_exceptions=True)))
+
+        for node_id, result in results.items():
+            if isinstance(result, Exception):
+                self.state['nodes'][node_id].update(phase=BLOCKED,
+                                                    error=str(result))
+            else:
+                self.state['nodes'][node_id].update(phase=PENDING, error=None)
+        self._save()
+        return dict((node_id, node_state['error'])
+                    for node_id, node_state in self.state['nodes'].items()
+                    if node_state['phase'] == BLOCKED)
+
+    def schedule(self):
+        """Split nodes passed prechecks into batches.
+
+        Nodes of a batch share a failure domain.
+        """
+        node_ids = sorted(
+            (node_id for node_id, node_state in self.state['nodes'].items()
+             if node_state['phase'] != BLOCKED),
+            key=lambda node_id: self.state['nodes'][node_id]['host'] or '')
+        primary = [node_id for node_id in node_ids
+                   if getattr(self.nodes[node_id], 'is_primary', False)]
+        others = [node_id for node_id in node_ids if node_id not in primary]
+
+        batches = []
+        filling = {}  # failure domain -> its last batch
+        for node_id in others:
+            domain = self.failure_domains.get(node_id)
+            batch = filling.get(domain) if domain is not None else None
+            if batch is None or len(batch) >= self.batch_size:
+                batch = [node_id]
+                batches.append(batch)
+                if domain is not None:
+                    filling[domain] = batch
+            else:
+                batch.append(node_id)
+        batches.extend([node_id] for node_id in primary)
+        for idx, batch in enumerate(batches):
+            for node_id in batch:
+                self.state['nodes'][node_id]['batch'] = idx + 1
+        self.state['batches'] = batches
+        self._save()
+        return batches
+
+    def _run_action(self, node_ids):
+        errors = {}
+        for node_id in node_ids:
+            node_state = self.state['nodes'][node_id]
+            if node_state['phase'] != MAINTENANCE:
+                continue
+            if self.action is not None:
+                try:
+                    self.action(self.nodes[node_id])
+                except Exception as err:  # pylint: disable=broad-except
+                    LOG.debug("Action failed on %s: %s", node_id, err)
+                    node_state['error'] = errors[node_id] = str(err)
+                    continue
+            node_state.update(phase=READY, error=None)
+        self._save()
+        return errors
+
+    def run(self):
+        """Run the remaining batches.
+
+        :raises VinfraError: if a step of a batch fails; the failed step is
+                             repeated when the run is resumed
+        """
+        if self.state['batches'] is None:
+            blocked = self.precheck()
+            if blocked and not self.skip_blocked:
+                raise exceptions.VinfraError(
+                    "Maintenance prechecks failed: {}".format('; '.join(
+                        '{}: {}'.format(
+                            self.state['nodes'][node_id]['host'] or node_id,
+                            error)
+                        for node_id, error in sorted(blocked.items()))))
+            self.schedule()
+
+        batches = self.state['batches']
+        while self.state['batch'] < len(batches):
+            node_ids = batches[self.state['batch']]
+            LOG.info("Batch %d of %d: %s", self.state['batch'] + 1,
+                     len(batches), ', '.join(
+                         self.state['nodes'][node_id]['host'] or node_id
+                         for node_id in node_ids))
+
+            errors = self._step(
+                node_ids, PENDING, MAINTENANCE,
+                lambda node: node.maintenance_start(**self.start_params))
+            if not errors:
+                errors = self._run_action(node_ids)
+            if not errors:
+                errors = self._step(
+                    node_ids, READY, DONE,
+                    lambda node: node.maintenance_stop(**self.stop_params))
+            if errors:
+                raise exceptions.VinfraError(
+                    "Batch {} failed: {}".format(
+                        self.state['batch'] + 1, '; '.join(
+                            '{}: {}'.format(
+                                self.state['nodes'][node_id]['host'] or
+                                node_id, error)
+                            for node_id, error in sorted(errors.items()))))
+            self.state['batch'] += 1
+            self._save()
+        return self.state
@@ -1,7 +1,9 @@
 from vinfra.api import base
 from vinfra.api.nodes.disks import DiskManager
 from vinfra.api.nodes.ifaces import InterfaceManager
+from vinfra.api.nodes.inventory import NodeInventory
 from vinfra.api.nodes.iscsi import IscsiManager
+from vinfra.api.nodes.maintenance import RollingMaintenance
 from vinfra.utils import flatten_args
 
 
@@ -52,6 +54,24 @@ class NodeManager(base.Manager):
         node_id = base.get_id(node)
         return self._get("{}/{}".format(self.base_url, node_id))
 
+    def snapshot(self, nodes=None, phases=None, concurrency=None):
+        """Fetch nodes with their disks, interfaces and iSCSI targets.
+
+        :param nodes: nodes to include, all the nodes by default
+        :param phases: sub-resources to fetch, see NodeInventory.phases
+        :param concurrency: max number of concurrent requests
+        :return: NodeInventory
+        """
+        return NodeInventory.fetch(self, nodes=nodes, phases=phases,
+                                   concurrency=concurrency)
+
+    def rolling_maintenance(self, nodes, **kwargs):
+        """Return a RollingMaintenance of the nodes.
+
+        See RollingMaintenance for arguments.
+        """
+        return RollingMaintenance(self, nodes, **kwargs)
+
     def release_async(self, node, force=None):
         """ release node from cluster """
         json = flatten_args(force=force)
@@ -3,6 +3,7 @@ import json
 from vinfra import exceptions
 from vinfra.api import base, failure_domains
 from vinfra.api.compute.storage_policies import get_api_redundancy
+from vinfra.api.network.topology import TopologyResolver
 from vinfra.utils import flatten_args
 
 
@@ -24,32 +25,15 @@ class S3Api(base.VinfraApi):
         # Note(akurbatov): backend has outdated API and requires to pass
         # exclusive ostor private interface. But ostor private iface can be
         # auto detected.
-        ostor_private_traffic_type = 'OSTOR private'
-        ostor_private_network = None
-        for network in self.api.networks.list():
-            if ostor_private_traffic_type in network.traffic_types:
-                ostor_private_network = network
-                break
-        else:
-            msg = "Network with {!r} traffic type not found".format(
-                ostor_private_traffic_type)
-            raise exceptions.VinfraError(msg)
-
-        nodes_data = []
-        for node in nodes:
-            for iface in node.ifaces_manager.list():
-                if iface.network == ostor_private_network.id:
-                    nodes_data.append({
-                        'id': base.get_id(node),
-                        'priv_net_if': iface.name
-                    })
-                    break
-            else:
-                msg = "Traffic type {!r} is not assigned on node {!r}".format(
-                    ostor_private_traffic_type, node)
-                raise exceptions.VinfraError(msg)
-
-        return nodes_data
+        topology = TopologyResolver(self.api)
+        ifaces = topology.resolve(nodes, 'OSTOR private')
+        return [
+            {
+                'id': base.get_id(node),
+                'priv_net_if': iface.name
+            }
+            for node, iface in zip(nodes, ifaces)
+        ]
 
     @staticmethod
     def _get_stream(stream):
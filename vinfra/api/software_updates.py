@@ -32,6 +32,8 @@ class SoftwareUpdatesManager(object):
             return self.api.client.get('/software_updates')
 
     def start_async(self, req):
+        # the update changes the backend version: never rely on the cached one
+        self.api.reset_versions()
         params = {
             'accept_eula': req.get('accept_eula', False)
         }
@@ -1,12 +1,67 @@
+import datetime
+import fnmatch
 import logging
+import threading
 import time
 
+import six
+
 from vinfra import exceptions
 from vinfra.api import base
+from vinfra.progress import report_progress
+from vinfra.request_cache import expire_cached_requests
+from vinfra.utils import parse_timestamp
 
 
 LOG = logging.getLogger(__name__)
 
+ACTIVE_STATES = ('running', 'scheduled', 'cancelling')
+FINAL_STATES = ('aborted', 'cancelled', 'failed', 'success')
+STATES = ACTIVE_STATES + FINAL_STATES
+# fields holding the task start time in different backend versions
+TIME_FIELDS = ('created_at', 'started_at', 'created', 'start_time')
+
+
+def get_task_time(data):
+    """Return the start time of a raw task as a naive UTC datetime."""
+    for field in TIME_FIELDS:
+        value = data.get(field)
+        if value is None:
+            continue
+        if isinstance(value, six.integer_types + (float,)):
+            return datetime.datetime.utcfromtimestamp(value)
+        try:
+            return parse_timestamp(value)
+        except (ValueError, AttributeError):
+            return None
+    return None
+
+
+class TaskFilter(object):
+    def __init__(self, states=None, name=None, since=None):
+        """Filter of raw tasks.
+
+        :param states: task states to match
+        :param name: shell-style pattern of task names
+        :param since: naive UTC datetime, match tasks started after it;
+                      tasks without a start time are matched too
+        """
+        self.states = set(states) if states else None
+        self.name = name
+        self.since = since
+
+    def matches(self, data):
+        if self.states is not None and data.get('state') not in self.states:
+            return False
+        if self.name and not fnmatch.fnmatchcase(data.get('name') or '',
+                                                 self.name):
+            return False
+        if self.since is not None:
+            started = get_task_time(data)
+            if started is not None and started < self.since:
+                return False
+        return True
+
 
 class Task(base.Resource):
     ID_ATTR = 'task_id'
@@ -22,47 +77,211 @@ class Task(base.Resource):
         return self.manager.wait(self, **kwargs)
 
 
+class TaskIndex(object):
+    def __init__(self, manager):
+        """Tasks of one listing indexed by ID and by state.
+
+        Raw tasks are kept instead of resources, so a large history stays
+        cheap, and waiters of several tasks share one listing per poll.
+
+        :param manager: task manager
+        """
+        self.manager = manager
+        self.tasks = {}
+        self.by_state = {}
+        self.timestamp = None
+        self._lock = threading.Lock()
+
+    def refresh(self, max_age=None):
+        """List tasks once and return IDs of new or changed tasks.
+
+        :param max_age: keep the listing if it is younger than max_age
+                        seconds, so waiters sharing the index list tasks
+                        once per poll interval
+        """
+        with self._lock:
+            if (max_age is not None and self.timestamp is not None and
+                    time.time() - self.timestamp < max_age):
+                return set()
+            return self._refresh()
+
+    def _refresh(self):
+        previous = self.tasks
+        self.tasks = {}
+        self.by_state = {}
+        for data in self.manager.list_raw():
+            task_id = data.get(Task.ID_ATTR)
+            self.tasks[task_id] = data
+            self.by_state.setdefault(data.get('state'), set()).add(task_id)
+        self.timestamp = time.time()
+        return set(task_id for task_id, data in self.tasks.items()
+                   if previous.get(task_id) != data)
+
+    def __contains__(self, task):
+        return base.get_id(task) in self.tasks
+
+    def get(self, task):
+        data = self.tasks.get(base.get_id(task))
+        if data is None:
+            return None
+        return Task(self.manager, dict(data))
+
+    def count(self, state):
+        return len(self.by_state.get(state, ()))
+
+    def select(self, states=None, name=None, since=None):
+        """Return tasks matching the filter, see TaskFilter."""
+        task_filter = TaskFilter(states=states, name=name, since=since)
+        if states:
+            task_ids = set()
+            for state in states:
+                task_ids.update(self.by_state.get(state, ()))
+        else:
+            task_ids = self.tasks
+        return [Task(self.manager, dict(self.tasks[task_id]))
+                for task_id in sorted(task_ids)
+                if task_filter.matches(self.tasks[task_id])]
+
+
 class TaskManager(base.Manager):
     resource_class = Task
     default_timeout = 600
+    poll_interval = 1
+    # wait_many fetches up to that many pending tasks one by one instead of
+    # listing the whole task history
+    max_task_gets = 5
 
-    def list(self):
-        return self._list("/tasks")
+    def list_raw(self):
+        data = self.client.get("/tasks")
+        if isinstance(data, dict):
+            data = data.get("data")
+        return data or []
+
+    def iterate(self, states=None, name=None, since=None):
+        """Iterate over tasks matching the filter, see TaskFilter.
+
+        Tasks are filtered before resources are made of them.
+        """
+        task_filter = TaskFilter(states=states, name=name, since=since)
+        for data in self.list_raw():
+            if task_filter.matches(data):
+                yield self.resource_class(self, data)
+
+    def list(self, states=None, name=None, since=None):
+        return list(self.iterate(states=states, name=name, since=since))
+
+    def index(self):
+        """Return a TaskIndex of the current tasks."""
+        index = TaskIndex(self)
+        index.refresh()
+        return index
 
     def get(self, task, **kwargs):
         url = "/tasks/{}".format(base.get_id(task))
         return self._get(url, **kwargs)
 
     # pylint: disable=no-member
+    @staticmethod
+    def check_finished(task, request_id=None):
+        """Return True if the task is finished, raise TaskError on failure."""
+        if task.state in ACTIVE_STATES:
+            return False
+
+        if task.state == 'failed':
+            details = task.details or "internal error"
+            message = "Task {} failed. {}".format(task.task_id, details)
+            raise exceptions.TaskError(message, request_id=request_id)
+
+        if task.state not in FINAL_STATES:
+            message = "Unknown task {} state '{}'".format(task.task_id,
+                                                          task.state)
+            raise exceptions.TaskError(message, request_id=request_id)
+
+        # Even task is success its subtasks can fail
+        if isinstance(task.result, dict) and task.result.get('errors'):
+            errors = [err['message'] for err in task.result['errors']]
+            message = "Task {} failed. {}".format(task.task_id,
+                                                  ', '.join(errors))
+            raise exceptions.TaskError(message, request_id=request_id)
+        return True
+
     def wait(self, task, timeout=None, request_id=None, **kwargs):
         wait_timeout = timeout or self.default_timeout
         stime = time.time()
         while time.time() - stime < wait_timeout:
+            expire_cached_requests()
             task = self.get(task, request_id=request_id, **kwargs)
-            if task.state in ('running', 'scheduled', 'cancelling'):
+            report_progress(state=task.state,
+                            progress=getattr(task, 'progress', None),
+                            task_id=task.task_id)
+            if not self.check_finished(task, request_id=request_id):
                 time.sleep(1)
                 continue
+            return task
 
-            if task.state == 'failed':
-                details = task.details or "internal error"
-                message = "Task {} failed. {}".format(task.task_id, details)
-                raise exceptions.TaskError(message, request_id=request_id)
+        seconds = "second{}".format('' if wait_timeout == 1 else 's')
+        message = ("Task {} waiting exceeded {} {} timeout"
+                   .format(base.get_id(task), wait_timeout, seconds))
+        raise exceptions.TimeoutError(message)
 
-            if task.state not in ('aborted', 'cancelled', 'failed', 'success'):
-                message = "Unknown task {} state '{}'".format(task.task_id,
-                                                              task.state)
-                raise exceptions.TaskError(message, request_id=request_id)
+    def wait_many(self, tasks, timeout=None, index=None, request_id=None,
+                  return_exceptions=False):
+        """Wait for several tasks polling one listing instead of each task.
 
-            # Even task is success its subtasks can fail
-            if isinstance(task.result, dict) and task.result.get('errors'):
-                errors = [err['message'] for err in task.result['errors']]
-                message = "Task {} failed. {}".format(task.task_id,
-                                                      ', '.join(errors))
-                raise exceptions.TaskError(message, request_id=request_id)
+        Tasks missing in the listing are fetched one by one. Without a
+        shared index, a few pending tasks are fetched one by one as well.
 
-            return task
+        :param tasks: tasks or task IDs
+        :param timeout: timeout for all the tasks, in seconds
+        :param index: TaskIndex to share with other waiters, it is listed
+                      once per poll interval whoever of them refreshes it
+        :param return_exceptions: return errors of failed tasks in place of
+                                  the tasks instead of raising the first one
+        :return: list of finished tasks in the same order
+        """
+        wait_timeout = timeout or self.default_timeout
+        task_ids = [base.get_id(task) for task in tasks]
+        shared = index is not None
+        index = index or TaskIndex(self)
+        finished = {}
+        stime = time.time()
+        while time.time() - stime < wait_timeout:
+            expire_cached_requests()
+            pending = set(task_ids) - set(finished)
+            listed = shared or len(pending) > self.max_task_gets
+            if listed:
+                # another waiter may have listed the tasks just now, but
+                # tasks submitted after that need a new listing
+                fresh = shared and all(task_id in index
+                                       for task_id in pending)
+                index.refresh(
+                    max_age=self.poll_interval if fresh else None)
+            for task_id in task_ids:
+                if task_id in finished:
+                    continue
+                task = index.get(task_id) if listed else None
+                if task is None:
+                    task = self.get(task_id, request_id=request_id)
+                try:
+                    if self.check_finished(task, request_id=request_id):
+                        finished[task_id] = task
+                except exceptions.TaskError as err:
+                    if not return_exceptions:
+                        raise
+                    finished[task_id] = err
+            if len(finished) == len(set(task_ids)):
+                return [finished[task_id] for task_id in task_ids]
+            # the share of finished tasks
+            report_progress(progress=100.0 * len(finished) /
+                            len(set(task_ids)))
+            time.sleep(self.poll_interval)
 
+        pending = [task_id for task_id in task_ids if task_id not in finished]
         seconds = "second{}".format('' if wait_timeout == 1 else 's')
-        message = ("Task {} waiting exceeded {} {} timeout"
-                   .format(base.get_id(task), wait_timeout, seconds))
+        if return_exceptions:
+            return [finished.get(task_id) or exceptions.TimeoutError(
+                "Task {} waiting exceeded {} {} timeout".format(
+                    task_id, wait_timeout, seconds)) for task_id in task_ids]
+        message = ("Tasks {} waiting exceeded {} {} timeout"
+                   .format(', '.join(pending), wait_timeout, seconds))
         raise exceptions.TimeoutError(message)
@@ -1,11 +1,20 @@
 import collections
 import functools
+import json
+import logging
+import os
 import re
+import time
+
+from requests.exceptions import HTTPError
 
 from vinfra import compat, exceptions
 
+LOG = logging.getLogger(__name__)
 
 _METHODS = collections.defaultdict(list)
+# (function name, version key) -> method resolved for the version
+_DISPATCH = {}
 Method = collections.namedtuple('Method', ['name', 'func', 'start_version',
                                            'end_version'])
 
@@ -39,38 +48,48 @@ class APIVersion(object):
 
         return cls(version)
 
-    def __lt__(self, other):
+    @property
+    def key(self):
+        return self.ver_major, self.ver_middle, self.ver_minor
+
+    @classmethod
+    def _coerce(cls, other):
         if isinstance(other, (str, compat.basestring)):
-            other = APIVersion(other)
+            version = _PARSED_VERSIONS.get(other)
+            if version is None:
+                version = _PARSED_VERSIONS[other] = cls(other)
+            return version
 
         assert isinstance(other, APIVersion)
-        return ((self.ver_major, self.ver_middle, self.ver_minor) <
-                (other.ver_major, other.ver_middle, other.ver_minor))
+        return other
 
-    def __eq__(self, other):
-        if isinstance(other, (str, compat.basestring)):
-            other = APIVersion(other)
+    def __lt__(self, other):
+        return self.key < self._coerce(other).key
 
-        assert isinstance(other, APIVersion)
-        return ((self.ver_major, self.ver_middle, self.ver_minor) ==
-                (other.ver_major, other.ver_middle, other.ver_minor))
+    def __eq__(self, other):
+        return self.key == self._coerce(other).key
 
     def __gt__(self, other):
-        if isinstance(other, (str, compat.basestring)):
-            other = APIVersion(other)
-
-        assert isinstance(other, APIVersion)
-        return ((self.ver_major, self.ver_middle, self.ver_minor) >
-                (other.ver_major, other.ver_middle, other.ver_minor))
+        return self.key > self._coerce(other).key
 
     def __le__(self, other):
-        return self < other or self == other
+        return self.key <= self._coerce(other).key
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
     def __ge__(self, other):
-        return self > other or self == other
+        return self.key >= self._coerce(other).key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return "<APIVersion {}>".format(self.version)
+
+
+# version strings compared with APIVersion objects are parsed only once
+_PARSED_VERSIONS = {}
 
 
 def _get_methods(func_name, api_version):
@@ -83,6 +102,29 @@ def _get_methods(func_name, api_version):
     return methods
 
 
+def _resolve_method(func_name, api_version):
+    dispatch_key = (func_name, api_version.key)
+    try:
+        return _DISPATCH[dispatch_key]
+    except KeyError:
+        pass
+
+    methods = _get_methods(func_name, api_version)
+    if not methods:
+        raise exceptions.VinfraError(
+            "Function {!r} not found for version {}"
+            .format(func_name, api_version))
+
+    method = _DISPATCH[dispatch_key] = methods[-1]
+    return method
+
+
+def is_version_error(err):
+    """Check if an HTTP error can be caused by a wrong backend version."""
+    response = getattr(err, 'response', None)
+    return response is not None and response.status_code in (400, 404)
+
+
 def version_wrap(start_version, end_version="latest"):
     start_version = APIVersion.from_string(start_version, extend_by='0')
     end_version = APIVersion.from_string(end_version, extend_by='latest')
@@ -92,16 +134,20 @@ def version_wrap(start_version, end_version="latest"):
 
         method = Method(func_name, func, start_version, end_version)
         _METHODS[func_name].append(method)
+        _DISPATCH.clear()
 
         @functools.wraps(func)
         def inner(obj, *args, **kwargs):
-            methods = _get_methods(func_name, obj.api.api_version)
-            if not methods:
-                raise exceptions.VinfraError(
-                    "Function {!r} not found for version {}"
-                    .format(func_name, obj.api.api_version))
-
-            return methods[-1].func(obj, *args, **kwargs)
+            method = _resolve_method(func_name, obj.api.api_version)
+            try:
+                return method.func(obj, *args, **kwargs)
+            except HTTPError as err:
+                # the backend could be updated since its version was cached
+                if (not is_version_error(err) or
+                        not obj.api.recheck_versions()):
+                    raise
+            method = _resolve_method(func_name, obj.api.api_version)
+            return method.func(obj, *args, **kwargs)
 
         return inner
 
@@ -118,3 +164,54 @@ HCI_VER_47 = APIVersion('4.7.0')
 HCI_VER_50 = APIVersion('5.0.0')
 HCI_VER_51 = APIVersion('5.1.0')
 HCI_VER_52 = APIVersion('5.2.0')
+
+
+class VersionCache(object):
+    default_ttl = 3600  # seconds
+
+    def __init__(self, filename, ttl=None):
+        """Persistent cache of backend versions.
+
+        A cached version is revalidated, i.e. requested from the backend
+        again, once it is older than ttl seconds.
+
+        :param filename: cache file name
+        :param ttl: cache entry lifetime in seconds
+        """
+        self.filename = filename
+        self.ttl = self.default_ttl if ttl is None else ttl
+
+    def _load(self):
+        try:
+            with open(self.filename, 'r') as fp:
+                data = json.load(fp)
+        except (IOError, OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def get(self, name):
+        entry = self._load().get(name)
+        if not isinstance(entry, dict):
+            return None
+        if time.time() - entry.get('checked_at', 0) > self.ttl:
+            return None
+        return entry.get('version')
+
+    def set(self, name, version):
+        data = self._load()
+        data[name] = {'version': version, 'checked_at': time.time()}
+        # The cache is an optimization only, do not fail on write errors.
+        try:
+            dirname = os.path.dirname(self.filename)
+            if dirname and not os.path.exists(dirname):
+                os.makedirs(dirname, 0o700)
+            with open(self.filename, 'w') as fp:
+                json.dump(data, fp)
+        except (IOError, OSError) as err:
+            LOG.debug("Failed to save versions cache: %s", err)
+
+    def invalidate(self):
+        try:
+            os.remove(self.filename)
+        except (IOError, OSError):
+            pass
@@ -0,0 +1,311 @@
+"""Recording and replaying of HTTP exchanges.
+
+A cassette is a newline-delimited JSON file where every line describes one
+request/response exchange. Secrets are never written to a cassette: headers
+are scrubbed with the session header filter, passwords are removed from
+request bodies and tokens are hashed in response bodies.
+"""
+import base64
+import collections
+import gzip
+import hashlib
+import io
+import json
+import logging
+import re
+import threading
+import time
+
+from requests import adapters
+from requests.cookies import extract_cookies_to_jar
+from urllib3 import HTTPResponse as Urllib3Response
+
+from vinfra import exceptions
+from vinfra.compat import cookielib, urlparse
+
+LOG = logging.getLogger(__name__)
+
+_SECURE_REQUEST_FIELDS = ('password', 'current_password', 'new_password')
+_SECURE_RESPONSE_FIELDS = ('token', 'scoped_token')
+# the body is stored decoded, so transport level headers are dropped
+_SKIPPED_RESPONSE_HEADERS = ('content-encoding', 'content-length',
+                             'transfer-encoding')
+_COOKIE_EXPIRES_REGEX = re.compile(r'(?i)(;\s*)expires=([^;]*)')
+
+
+def _hash_value(value):
+    hasher = hashlib.sha256()
+    hasher.update(value.encode('utf-8'))
+    return '{SHA256}%s' % hasher.hexdigest()
+
+
+def _request_key(method, url):
+    parsed = urlparse(url)
+    path = parsed.path
+    if parsed.query:
+        path += '?' + parsed.query
+    return method.upper(), path
+
+
+def _encode_body(content):
+    if not content:
+        return None
+    if not isinstance(content, bytes):
+        return {'text': content}
+    try:
+        return {'text': content.decode('utf-8')}
+    except UnicodeDecodeError:
+        return {'base64': base64.b64encode(content).decode('ascii')}
+
+
+def _decode_body(body):
+    if not body:
+        return b''
+    if 'base64' in body:
+        return base64.b64decode(body['base64'])
+    return body['text'].encode('utf-8')
+
+
+def _scrub_json(body, fields, replace):
+    try:
+        data = json.loads(body)
+    except (TypeError, ValueError):
+        return body
+    if not isinstance(data, dict):
+        return body
+
+    scrubbed = False
+    for field in fields:
+        if isinstance(data.get(field), (str, type(u''))):
+            data[field] = replace(data[field])
+            scrubbed = True
+    if not scrubbed:
+        return body
+    return json.dumps(data)
+
+
+def _relative_cookie_expiry(header_value, now):
+    """Replace absolute cookie 'Expires' with a relative 'Max-Age'.
+
+    Replay happens later than recording, so absolute expiration dates of
+    recorded cookies are in the past by then.
+    """
+    match = _COOKIE_EXPIRES_REGEX.search(header_value)
+    if not match:
+        return header_value
+    expires = cookielib.http2time(match.group(2).strip())
+    if expires is None:
+        return header_value
+    max_age = max(int(expires - now), 0)
+    return _COOKIE_EXPIRES_REGEX.sub(
+        r'\g<1>Max-Age={}'.format(max_age), header_value, count=1)
+
+
+class Exchange(collections.namedtuple('Exchange', [
+        'method', 'url', 'request_body', 'status', 'reason', 'headers',
+        'body', 'elapsed'])):
+    """A single recorded request/response pair."""
+
+    @property
+    def key(self):
+        return _request_key(self.method, self.url)
+
+    def to_dict(self):
+        return dict(self._asdict())
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**dict((field, data.get(field)) for field in cls._fields))
+
+
+class Cassette(object):
+    def __init__(self, filename):
+        """Cassette file with recorded HTTP exchanges.
+
+        :param filename: path to the cassette; '.gz' suffix enables
+            compression
+        """
+        self.filename = filename
+        self._lock = threading.Lock()
+
+    def _open(self, mode):
+        try:
+            if self.filename.endswith('.gz'):
+                return gzip.open(self.filename, mode + 'b')
+            return open(self.filename, mode + 'b')
+        except (IOError, OSError) as err:
+            raise exceptions.VinfraError(
+                "Can not open cassette {}: {}".format(self.filename, err))
+
+    def truncate(self):
+        self._open('w').close()
+
+    def append(self, exchange):
+        line = json.dumps(exchange.to_dict(), separators=(',', ':'),
+                          sort_keys=True)
+        with self._lock:
+            with self._open('a') as fp:
+                fp.write(line.encode('utf-8') + b'\n')
+
+    def load(self):
+        exchanges = []
+        with self._open('r') as fp:
+            for line in fp:
+                line = line.strip()
+                if not line:
+                    continue
+                exchanges.append(
+                    Exchange.from_dict(json.loads(line.decode('utf-8'))))
+        return exchanges
+
+
+class RecordingHTTPAdapter(adapters.BaseAdapter):
+    def __init__(self, cassette, adapter, header_filter):
+        """Transport adapter writing every exchange into a cassette.
+
+        :param cassette: cassette to record exchanges to
+        :type cassette: vinfra.cassette.Cassette
+        :param adapter: adapter which performs real requests
+        :param header_filter: callable(name, value) -> (name, value) used to
+            scrub secrets from the recorded headers
+        """
+        super(RecordingHTTPAdapter, self).__init__()
+        self.cassette = cassette
+        self.adapter = adapter
+        self.header_filter = header_filter
+
+    def _request_body(self, request):
+        body = request.body
+        if body is None or hasattr(body, 'read'):
+            # streams (e.g. image uploads) are never recorded
+            return None
+        if isinstance(body, bytes):
+            try:
+                body = body.decode('utf-8')
+            except UnicodeDecodeError:
+                return None
+        return _scrub_json(body, _SECURE_REQUEST_FIELDS,
+                           lambda value: '<removed>')
+
+    def _response_headers(self, resp):
+        now = time.time()
+        headers = []
+        raw_headers = getattr(resp.raw, 'headers', None) or resp.headers
+        items = getattr(raw_headers, 'iteritems', raw_headers.items)
+        for name, value in items():
+            if name.lower() in _SKIPPED_RESPONSE_HEADERS:
+                continue
+            name, value = self.header_filter(name, value)
+            if name.lower() == 'set-cookie':
+                value = _relative_cookie_expiry(value, now)
+            headers.append([name, value])
+        return headers
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        stime = time.time()
+        resp = self.adapter.send(request, **kwargs)
+        elapsed = time.time() - stime
+
+        body = resp.content
+        if resp.headers.get('Content-Type') == 'application/json':
+            body = _scrub_json(body, _SECURE_RESPONSE_FIELDS, _hash_value)
+
+        exchange = Exchange(
+            method=request.method,
+            url=request.url,
+            request_body=self._request_body(request),
+            status=resp.status_code,
+            reason=resp.reason,
+            headers=self._response_headers(resp),
+            body=_encode_body(body),
+            elapsed=round(elapsed, 4),
+        )
+        self.cassette.append(exchange)
+        return resp
+
+    def close(self):
+        self.adapter.close()
+
+
+class _ReplayedMessage(object):
+    """Minimal http message to let requests extract replayed cookies."""
+
+    def __init__(self, headers):
+        self._headers = headers
+
+    def get_all(self, name, default=None):
+        values = [value for key, value in self._headers
+                  if key.lower() == name.lower()]
+        return values or default
+
+    def getheaders(self, name):
+        return self.get_all(name, [])
+
+
+class _ReplayedResponse(object):
+    def __init__(self, headers):
+        self.msg = _ReplayedMessage(headers)
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def isclosed():
+        return True
+
+
+class ReplayHTTPAdapter(adapters.BaseAdapter):
+    def __init__(self, exchanges, latency_scale=1.0):
+        """Transport adapter serving responses from recorded exchanges.
+
+        Exchanges are matched by method, path and query in the recorded
+        order. Once the recorded responses for a request are exhausted, the
+        last one is served again: this keeps polling loops deterministic.
+
+        :param exchanges: list of vinfra.cassette.Exchange
+        :param latency_scale: multiplier applied to the recorded latency,
+            0 disables sleeping
+        """
+        super(ReplayHTTPAdapter, self).__init__()
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._exchanges = collections.defaultdict(collections.deque)
+        self._last = {}
+        for exchange in exchanges:
+            self._exchanges[exchange.key].append(exchange)
+
+    def _next_exchange(self, request):
+        key = _request_key(request.method, request.url)
+        with self._lock:
+            queue = self._exchanges.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+            exchange = self._last.get(key)
+
+        if exchange is None:
+            raise exceptions.VinfraError(
+                "No recorded response for {} {}".format(*key))
+        return exchange
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        exchange = self._next_exchange(request)
+        if self.latency_scale and exchange.elapsed:
+            time.sleep(exchange.elapsed * self.latency_scale)
+
+        headers = [tuple(header) for header in exchange.headers or []]
+        raw = Urllib3Response(
+            body=io.BytesIO(_decode_body(exchange.body)),
+            headers=headers,
+            status=exchange.status,
+            reason=exchange.reason,
+            preload_content=False,
+            decode_content=False,
+        )
+
+        resp = adapters.HTTPAdapter().build_response(request, raw)
+        raw._original_response = _ReplayedResponse(headers)  # pylint: disable=protected-access
+        extract_cookies_to_jar(resp.cookies, request, raw)
+        return resp
+
+    def close(self):
+        pass
@@ -4,6 +4,7 @@ import json
 
 from vinfra.api.base import BackendTask
 from vinfra.compat import urlencode
+from vinfra.request_cache import expire_cached_requests
 
 
 Response = collections.namedtuple('Response', ['data', 'request_id'])
@@ -56,7 +57,22 @@ class Client(object):
     def api_version(self):
         return self.__api_version
 
+    @property
+    def request_cache(self):
+        return getattr(self.api, 'request_cache', None)
+
     def send_request_raw(self, method, url, **kwargs):
+        if method.lower() == 'get':
+            return self._send_request_raw(method, url, **kwargs)
+
+        expire_cached_requests()
+        try:
+            return self._send_request_raw(method, url, **kwargs)
+        finally:
+            # responses sent while the request was running can be stale
+            expire_cached_requests()
+
+    def _send_request_raw(self, method, url, **kwargs):
         params = kwargs.pop('params', None)
         query_params = kwargs.pop('query_params', None)
         if params and query_params:
@@ -73,6 +89,15 @@ class Client(object):
         return response
 
     def send_request(self, method, url, **kwargs):
+        cache = self.request_cache
+        if cache is not None and cache.active and method.lower() == 'get':
+            key = cache.make_key(self.api_version, url, **kwargs)
+            if key is not None:
+                return cache.fetch(
+                    key, lambda: self._send_request(method, url, **kwargs))
+        return self._send_request(method, url, **kwargs)
+
+    def _send_request(self, method, url, **kwargs):
         response = self.send_request_raw(method, url, **kwargs)
         content_type = response.headers.get('Content-Type')
         request_id = response.headers.get('x-request-id')
@@ -7,6 +7,7 @@ if sys.version_info[0] == 2:
     from urllib2 import urlopen, addinfourl
     from httplib import HTTPResponse
     from urllib import urlencode
+    import cookielib
 
     basestring = basestring
 
@@ -14,5 +15,6 @@ elif sys.version_info[0] == 3:
     from urllib.parse import urlparse, urlencode
     from urllib.request import urlopen, addinfourl
     from http.client import HTTPResponse
+    from http import cookiejar as cookielib
 
     basestring = str
@@ -0,0 +1,223 @@
+"""Export of the cluster inventory to a SQLite database.
+
+Every collection is saved to a table of the same name. The whole
+resource is kept in the "data" column as JSON to be queried with
+json_extract(), and the fields listed in TABLES are copied to indexed
+columns:
+
+    SELECT s.name, v.size FROM servers s JOIN volumes v
+        ON json_extract(v.data, '$.attachments[0].server_id') = s.id;
+
+Collections having updated_at are refreshed incrementally: resources
+are listed from the most recently updated ones, and listing stops at
+the last update seen by the previous export. Deleted resources are
+only dropped by a full refresh.
+"""
+import collections
+import json
+import logging
+import sqlite3
+import time
+
+from vinfra.api import base
+from vinfra.exceptions import VinfraError
+from vinfra.utils import concurrent_imap, concurrent_map
+
+LOG = logging.getLogger(__name__)
+
+# table -> indexed columns
+TABLES = collections.OrderedDict([
+    ('servers', ('name', 'status', 'project_id', 'host', 'created_at',
+                 'updated_at')),
+    ('volumes', ('name', 'status', 'project_id', 'size',
+                 'storage_policy_name', 'created_at', 'updated_at')),
+    ('images', ('name', 'status', 'project_id', 'size', 'created_at',
+                'updated_at')),
+    ('networks', ('name', 'project_id', 'type', 'created_at',
+                  'updated_at')),
+    ('nodes', ('host', 'is_assigned', 'is_online')),
+    ('disks', ('node_id', 'device', 'role', 'status')),
+    ('projects', ('domain_id', 'name', 'enabled')),
+])
+INCREMENTAL = ('servers', 'volumes', 'images', 'networks')
+META_TABLE = '_export'
+
+
+def _column_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True)
+    return value
+
+
+class SqliteExport(object):
+    page_size = 500
+
+    def __init__(self, api, path, tables=None, full=False, concurrency=None):
+        """Export of collections to a SQLite database.
+
+        :param api: Vinfra instance
+        :param path: database file, it is created if missing
+        :param tables: collections to export, all of TABLES by default
+        :param full: refresh all the collections from scratch
+        :param concurrency: max number of concurrent requests
+        """
+        tables = list(tables or TABLES)
+        for table in tables:
+            if table not in TABLES:
+                raise ValueError("Unknown collection: {}".format(table))
+        self.api = api
+        self.path = path
+        self.tables = tables
+        self.full = full
+        self.concurrency = concurrency
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS {} (name TEXT PRIMARY KEY, '
+            'updated_at TEXT, refreshed_at REAL)'.format(META_TABLE))
+        for table, columns in TABLES.items():
+            conn.execute('CREATE TABLE IF NOT EXISTS {} (id TEXT PRIMARY KEY, '
+                         '{}, data TEXT NOT NULL)'.format(
+                             table, ', '.join(columns)))
+            for column in columns:
+                conn.execute('CREATE INDEX IF NOT EXISTS {0}_{1} '
+                             'ON {0} ({1})'.format(table, column))
+        conn.commit()
+        return conn
+
+    # fetchers return dicts of resources
+
+    def _list_updated(self, manager, since):
+        if since is None:
+            return [res.to_dict() for res in manager.list(limit=-1)]
+
+        rv = []
+        marker = None
+        while True:
+            page = manager.list(limit=self.page_size, marker=marker,
+                                sort='updated_at:desc')
+            for resource in page:
+                data = resource.to_dict()
+                if (data.get('updated_at') or '') < since:
+                    return rv
+                rv.append(data)
+            if len(page) < self.page_size:
+                return rv
+            marker = base.get_id(page[-1])
+
+    def _fetch_servers(self, since):
+        return self._list_updated(self.api.compute.servers, since)
+
+    def _fetch_volumes(self, since):
+        return self._list_updated(self.api.compute.volumes, since)
+
+    def _fetch_images(self, since):
+        return self._list_updated(self.api.compute.images, since)
+
+    def _fetch_networks(self, since):
+        return self._list_updated(self.api.compute.networks, since)
+
+    def _fetch_nodes(self, since):  # pylint: disable=unused-argument
+        return [node.to_dict() for node in self.api.nodes.list()]
+
+    def _fetch_disks(self, since):  # pylint: disable=unused-argument
+        inventory = self.api.nodes.snapshot(phases=['disks'],
+                                            concurrency=self.concurrency)
+        if inventory.errors:
+            raise VinfraError("Failed to list disks of {} node(s): {}".format(
+                len(inventory.errors), '; '.join(
+                    errors['disks'] for errors in inventory.errors.values())))
+        rv = []
+        for node_id, disks in inventory.disks.items():
+            for disk in disks:
+                data = disk.to_dict()
+                data['node_id'] = node_id
+                rv.append(data)
+        return rv
+
+    def _fetch_projects(self, since):  # pylint: disable=unused-argument
+        domains = self.api.domains.list()
+        projects = concurrent_map(
+            lambda domain: domain.projects_manager.list(), domains,
+            concurrency=self.concurrency)
+        rv = []
+        for domain, domain_projects in zip(domains, projects):
+            for project in domain_projects:
+                data = project.to_dict()
+                data['domain_id'] = domain.id
+                rv.append(data)
+        return rv
+
+    def _save(self, conn, table, rows, incremental):
+        columns = TABLES[table]
+        with conn:
+            if not incremental:
+                conn.execute('DELETE FROM {}'.format(table))
+            conn.executemany(
+                'INSERT OR REPLACE INTO {} (id, {}, data) VALUES ({})'.format(
+                    table, ', '.join(columns),
+                    ', '.join('?' * (len(columns) + 2))),
+                [[str(row.get('id'))] +
+                 [_column_value(row.get(column)) for column in columns] +
+                 [json.dumps(row, sort_keys=True)] for row in rows])
+
+            updated_at = max([row.get('updated_at') or '' for row in rows] +
+                             [self._get_watermark(conn, table) or ''])
+            conn.execute(
+                'INSERT OR REPLACE INTO {} (name, updated_at, refreshed_at) '
+                'VALUES (?, ?, ?)'.format(META_TABLE),
+                (table, updated_at or None, time.time()))
+            total = conn.execute(
+                'SELECT COUNT(*) FROM {}'.format(table)).fetchone()[0]
+        return total
+
+    @staticmethod
+    def _get_watermark(conn, table):
+        row = conn.execute('SELECT updated_at FROM {} WHERE name = ?'.format(
+            META_TABLE), (table,)).fetchone()
+        return row[0] if row else None
+
+    def __iter__(self):
+        """Export the collections concurrently.
+
+        A result is yielded for every collection as soon as it is saved:
+        a dict with the table name, mode ('full' or 'incremental'),
+        number of saved rows, total number of rows, elapsed time and an
+        error message.
+        """
+        conn = self._connect()
+        try:
+            since = {}
+            for table in self.tables:
+                if table in INCREMENTAL and not self.full:
+                    since[table] = self._get_watermark(conn, table)
+
+            def fetch(table):
+                started = time.time()
+                rows = getattr(self, '_fetch_{}'.format(table))(
+                    since.get(table))
+                return rows, time.time() - started
+
+            for table, result, err in concurrent_imap(
+                    fetch, self.tables, concurrency=self.concurrency):
+                incremental = since.get(table) is not None
+                rv = {'table': table,
+                      'mode': 'incremental' if incremental else 'full',
+                      'rows': None, 'total': None, 'elapsed': None,
+                      'error': None}
+                if err is not None:
+                    LOG.debug("Failed to export %s: %s", table, err)
+                    rv['error'] = str(err)
+                else:
+                    rows, elapsed = result
+                    rv['total'] = self._save(conn, table, rows, incremental)
+                    rv['rows'] = len(rows)
+                    rv['elapsed'] = round(elapsed, 3)
+                yield rv
+        finally:
+            conn.close()
+
+    def run(self):
+        """Export the collections and return the list of results."""
+        return list(self)
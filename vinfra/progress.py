@@ -0,0 +1,111 @@
+"""Progress of operations being waited for.
+
+Loops polling for an operation to finish call report_progress() after
+every poll. A ProgressListener entered in the same thread gets every
+report as an event along with the elapsed time and the estimated time
+left, so a waiting command renders the backend progress from the poll
+loop itself instead of a separate thread:
+
+    with ProgressListener(print):
+        task.wait()
+
+Events are dicts with 'event' set to 'start', 'progress' or 'finish'.
+Progress events have task_id, state, progress (percent or None), elapsed
+and eta (seconds or None). The finish event has elapsed and error (None
+on success).
+"""
+import threading
+import time
+
+import six
+
+_local = threading.local()
+
+
+def _get_listeners():
+    if not hasattr(_local, 'listeners'):
+        _local.listeners = []
+    return _local.listeners
+
+
+def get_percent(progress):
+    """Return the progress reported by the backend in percent or None.
+
+    The backend reports either a number of percent, a string like '42%'
+    or a dict having the number in 'percent' or 'progress'.
+    """
+    if isinstance(progress, dict):
+        progress = progress.get('percent', progress.get('progress'))
+    if isinstance(progress, six.string_types):
+        progress = progress.strip().rstrip('%')
+    if isinstance(progress, bool):
+        return None
+    try:
+        percent = float(progress)
+    except (TypeError, ValueError):
+        return None
+    return min(max(percent, 0.0), 100.0)
+
+
+def report_progress(state=None, progress=None, task_id=None):
+    """Pass the progress seen by a poll to the listeners of the thread."""
+    for listener in list(_get_listeners()):
+        listener.update(state=state, progress=progress, task_id=task_id)
+
+
+class ProgressListener(object):
+    def __init__(self, callback):
+        """
+        :param callback: callable(event) called for every event
+        """
+        self.callback = callback
+        self.started = None
+        self._first = None  # (time, percent) the estimation starts from
+
+    def __enter__(self):
+        self.started = time.time()
+        self._first = None
+        _get_listeners().append(self)
+        self.callback({'event': 'start', 'time': self.started})
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _get_listeners().remove(self)
+        now = time.time()
+        self.callback({
+            'event': 'finish',
+            'time': now,
+            'elapsed': round(now - self.started, 1),
+            'error': None if exc_val is None else str(exc_val),
+        })
+
+    def estimate(self, percent, now):
+        """Return seconds left at the average rate since the first report.
+
+        The estimation restarts if the progress goes back, e.g. when the
+        backend proceeds to the next stage of an operation.
+        """
+        if percent is None:
+            return None
+        if self._first is None or percent < self._first[1]:
+            self._first = (now, percent)
+            return None
+        first_time, first_percent = self._first
+        if percent <= first_percent or now <= first_time:
+            return None
+        rate = (percent - first_percent) / (now - first_time)
+        return (100.0 - percent) / rate
+
+    def update(self, state=None, progress=None, task_id=None):
+        now = time.time()
+        percent = get_percent(progress)
+        eta = self.estimate(percent, now)
+        self.callback({
+            'event': 'progress',
+            'time': now,
+            'task_id': task_id,
+            'state': state,
+            'progress': percent,
+            'elapsed': round(now - self.started, 1),
+            'eta': None if eta is None else round(eta, 1),
+        })
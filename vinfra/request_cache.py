@@ -0,0 +1,115 @@
+"""Memoization of GET requests within an operation.
+
+Commands often send the same GET request several times, e.g. list
+networks or clusters in different helpers. While a RequestCache is
+entered, identical GET requests sent at the same time are coalesced into
+one, and their responses are reused until the cache is left:
+
+    with api.request_cache:
+        api.networks.list()
+        api.networks.list()  # no request is sent
+
+Any request other than GET expires all the cached responses, as changes
+of one resource often show in others, e.g. creating a server changes its
+volumes and ports. Loops polling for a state change must call
+expire_cached_requests() before every poll.
+"""
+import copy
+import json
+import threading
+
+_EPOCH_LOCK = threading.Lock()
+_epoch = [0]
+
+
+def expire_cached_requests():
+    """Expire responses cached by all the request caches."""
+    with _EPOCH_LOCK:
+        _epoch[0] += 1
+
+
+class _Call(object):
+    def __init__(self, stamp):
+        self.stamp = stamp
+        self.event = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class RequestCache(object):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._depth = 0
+        self._responses = {}
+        self._calls = {}
+
+    def __enter__(self):
+        with self._lock:
+            self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        with self._lock:
+            self._depth -= 1
+            if not self._depth:
+                self._responses.clear()
+
+    @property
+    def active(self):
+        return self._depth > 0
+
+    @staticmethod
+    def make_key(version, url, params=None, query_params=None, **kwargs):
+        """Return the cache key of a GET request.
+
+        None is returned for requests which cannot be cached, e.g. ones
+        with custom headers or streamed responses.
+        """
+        if kwargs:
+            return None
+        try:
+            params = json.dumps([params, query_params], sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return version, url.strip('/'), params
+
+    def fetch(self, key, send):
+        """Return a cached response of the request or call send()."""
+        with self._lock:
+            if not self._depth:
+                call = None
+            else:
+                cached = self._responses.get(key)
+                if cached is not None and cached[0] == _epoch[0]:
+                    return copy.deepcopy(cached[1])
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = _Call(_epoch[0])
+                    self._calls[key] = call
+        if call is None:
+            return send()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.response)
+
+        try:
+            response = send()
+        except Exception as err:
+            call.error = err
+            raise
+        else:
+            call.response = copy.deepcopy(response)
+            return response
+        finally:
+            with self._lock:
+                del self._calls[key]
+                # do not cache responses which could be sent before a
+                # mutating request or a poll
+                if (call.error is None and self._depth and
+                        call.stamp == _epoch[0]):
+                    self._responses[key] = (call.stamp, call.response)
+            call.event.set()
@@ -6,17 +6,22 @@ import logging
 import os
 import socket
 import sys
+import threading
 import time
 import warnings
 from datetime import datetime
 
 import requests
 from requests.adapters import HTTPAdapter
-from six.moves import http_client
+from six.moves import http_client, queue
 from urllib3.connection import HTTPConnection
+from urllib3.exceptions import ConnectTimeoutError
 
+from vinfra import cassette as vinfra_cassette
 from vinfra import exceptions
+from vinfra import transport
 from vinfra.compat import addinfourl, urlparse, HTTPResponse
+from vinfra.utils import concurrent_map, is_uuid
 
 LOG = logging.getLogger(__name__)
 
@@ -60,20 +65,38 @@ class _JsonEncoder(json.JSONEncoder):
 
 
 class Auth(object):
-    def __init__(self, username, password, domain=None, project=None):
+    # renew the session this many seconds before it expires
+    default_renew_margin = 60
+
+    def __init__(self, username, password, domain=None, project=None,
+                 renew_margin=None):
         self.username = username
         self.password = password
         self.domain = domain
         self.project = project
+        if renew_margin is None:
+            renew_margin = _get_int_env('VINFRA_SESSION_RENEW_MARGIN',
+                                        self.default_renew_margin)
+        self.renew_margin = renew_margin
 
         self.token = None
         self.domain_id = None
         self.token = None
         self.scoped_token = None
-
-    def _make_project_authenticate(self, session):
+        self.project_id = None
+        self.session_lifetime = None
+        # incremented on every login to let concurrent callers find out
+        # whether the session has been already renewed
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+    def _find_project_id(self, session):
+        # Ask the backend to filter by name, but still match on the client
+        # side: the filter is only a hint for old backends.
         projects = session.get(
-            "/api/v2/accounts/projects", authenticated=False).json()['data']
+            "/api/v2/accounts/projects", authenticated=False,
+            params={'name': self.project}).json()['data']
 
         count = 0
         project_id = None
@@ -86,7 +109,10 @@ class Auth(object):
                 project_id = project['id']
 
         if count == 0:
-            if not projects:
+            any_projects = session.get(
+                "/api/v2/accounts/projects", authenticated=False,
+                params={'limit': 1}).json()['data']
+            if not any_projects:
                 # there is no projects at all
                 raise exceptions.VinfraError(
                     "Login has been disabled by the administrator")
@@ -95,7 +121,10 @@ class Auth(object):
         elif count > 1:
             raise exceptions.VinfraError("More than one project exists with "
                                          "the name '{}'.".format(self.project))
+        return project_id
 
+    @staticmethod
+    def _authenticate_project(session, project_id):
         # NOTE(akurbatov): authenticated=False is essential here to avoid
         # recursion
         resp = session.post(
@@ -103,10 +132,51 @@ class Auth(object):
             authenticated=False, log=False)
         return resp.json()
 
+    def _make_project_authenticate(self, session):
+        # Avoid listing projects if the project ID is already known: it is
+        # either given by the user or resolved by a previous login.
+        project_id = self.project_id
+        if not project_id and is_uuid(self.project):
+            project_id = self.project
+
+        if project_id:
+            try:
+                data = self._authenticate_project(session, project_id)
+            except requests.HTTPError as err:
+                if (err.response is None or
+                        err.response.status_code not in (403, 404)):
+                    raise
+                LOG.debug("Project %s authentication failed, looking the "
+                          "project up by name", project_id)
+            else:
+                self.project_id = project_id
+                return data
+
+        self.project_id = self._find_project_id(session)
+        return self._authenticate_project(session, self.project_id)
+
     @staticmethod
-    def needs_reauthenticate(session):
+    def get_session_expiration(session):
+        """Return the session cookie expiration timestamp.
+
+        None is returned if there is no session cookie or it has no
+        expiration time.
+        """
         for cookie in session.cookies:
-            if cookie.name == 'session' and not cookie.is_expired():
+            if cookie.name == 'session':
+                return cookie.expires
+        return None
+
+    def needs_reauthenticate(self, session):
+        # Renew the session a bit before the expiration to never send a
+        # request which is rejected with 401 and has to be sent again.
+        margin = self.renew_margin
+        if self.session_lifetime:
+            # do not login on every request if sessions are short-lived
+            margin = min(margin, self.session_lifetime / 2)
+        now = time.time() + margin
+        for cookie in session.cookies:
+            if cookie.name == 'session' and not cookie.is_expired(now):
                 break
         else:
             return True
@@ -132,18 +202,47 @@ class Auth(object):
         self.domain_id = resp['domain_id']
         self.token = resp['token']
         self.make_scoped_authenticate(session)
+        self.generation += 1
+
+        expiration = self.get_session_expiration(session)
+        if expiration:
+            self.session_lifetime = max(expiration - time.time(), 0)
+            LOG.debug("Session is valid for %ds", self.session_lifetime)
 
     def make_scoped_authenticate(self, session):
         if self.project:
             data = self._make_project_authenticate(session)
             self.scoped_token = data['token']
 
+    def renew(self, session, generation):
+        """Authenticate again unless somebody has already done it.
+
+        :param generation: value of the generation attribute seen when
+            the rejected request was sent
+        """
+        with self._lock:
+            if self.generation == generation:
+                self.make_authenticate(session)
+
+    @property
+    def headers_generation(self):
+        """Generation of the last headers returned in this thread.
+
+        It is to be passed to renew() if the request sent with the headers
+        is rejected.
+        """
+        return getattr(self._local, 'generation', None)
+
     def get_headers(self, session):
-        if self.needs_reauthenticate(session):
-            self.make_authenticate(session)
+        # Concurrent callers wait for a single login instead of making
+        # their own ones.
+        with self._lock:
+            if self.needs_reauthenticate(session):
+                self.make_authenticate(session)
 
-        if self.needs_scoped_reauthenticate():
-            self.make_scoped_authenticate(session)
+            if self.needs_scoped_reauthenticate():
+                self.make_scoped_authenticate(session)
+            self._local.generation = self.generation
 
         headers = {}
         if self.scoped_token:
@@ -172,30 +271,188 @@ class TCPKeepAliveHTTPAdapter(HTTPAdapter):
                                                                      **kwargs)
 
 
+class EndpointPool(object):
+    """Management endpoints of one cluster to fail over between.
+
+    Requests go to the endpoint which has answered last. An endpoint
+    failing to connect is put to the end of the list for down_time
+    seconds, after which it is probed in the background and gets back
+    once it accepts connections.
+    """
+    default_down_time = 30  # seconds
+    # connect timeout of a request when there are other endpoints to try
+    connect_timeout = 2  # seconds
+    probe_timeout = 1  # seconds
+
+    def __init__(self, urls, down_time=None):
+        self.urls = []
+        for url in urls:
+            url = url.rstrip('/')
+            if url not in self.urls:
+                self.urls.append(url)
+        if not self.urls:
+            raise ValueError("No endpoints")
+        self.down_time = (self.default_down_time if down_time is None
+                          else down_time)
+        self.current = self.urls[0]
+        self._down = {}  # url -> time it is marked down at
+        self._probing = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.urls)
+
+    def candidates(self):
+        """Return endpoints in the order to try them."""
+        now = time.time()
+        with self._lock:
+            up = [url for url in self.urls if url not in self._down]
+            if self.current in up:
+                up.remove(self.current)
+                up.insert(0, self.current)
+            down = sorted(self._down, key=self._down.get)
+            expired = [url for url in down
+                       if now - self._down[url] >= self.down_time and
+                       url not in self._probing]
+            self._probing.update(expired)
+        for url in expired:
+            thread = threading.Thread(target=self._probe_in_background,
+                                      args=(url,))
+            thread.daemon = True
+            thread.start()
+        return up + down
+
+    def mark_up(self, url):
+        with self._lock:
+            self._down.pop(url, None)
+            self.current = url
+
+    def mark_down(self, url):
+        with self._lock:
+            self._down[url] = time.time()
+            if self.current == url:
+                up = [u for u in self.urls if u not in self._down]
+                if up:
+                    self.current = up[0]
+
+    def probe(self, url):
+        """Check the endpoint accepts TCP connections."""
+        parsed = urlparse(url)
+        port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        sock = socket.create_connection((parsed.hostname, port),
+                                        timeout=self.probe_timeout)
+        sock.close()
+
+    def _probe_in_background(self, url):
+        try:
+            self.probe(url)
+        except (socket.error, socket.timeout):
+            with self._lock:
+                self._down[url] = time.time()
+        else:
+            with self._lock:
+                self._down.pop(url, None)
+        finally:
+            with self._lock:
+                self._probing.discard(url)
+
+    def check(self):
+        """Probe all the endpoints concurrently.
+
+        Return endpoints accepting connections.
+        """
+        results = concurrent_map(self.probe, self.urls,
+                                 return_exceptions=True)
+        healthy = []
+        for url, result in zip(self.urls, results):
+            if isinstance(result, Exception):
+                LOG.debug("Endpoint %s is down: %s", url, result)
+                with self._lock:
+                    self._down[url] = time.time()
+            else:
+                healthy.append(url)
+                with self._lock:
+                    self._down.pop(url, None)
+        with self._lock:
+            if healthy and self.current not in healthy:
+                self.current = healthy[0]
+        return healthy
+
+
 class Session(object):
     def __init__(self, url, auth=None, session=None):
         """Session controlled communication client.
 
-        :param url: backend url
+        :param url: backend url, unix:///path/to/socket for a backend on
+            the same host, see vinfra.transport
         :param auth: session authentication implementation
         :type auth: vinfra.session.BaseAuth
         :param session: session for rest requests
         :type session: requests.Session
         """
-        self.url = url
+        self.url = transport.normalize_url(url)
         self.auth = auth
+        self.endpoints = None
+        self.hedge_delay = None
         self._json = _JsonEncoder()
 
         if not session:
             session = requests.Session()
             for schema in list(session.adapters):
                 session.mount(schema, TCPKeepAliveHTTPAdapter())
+        if transport.is_unix_url(self.url):
+            session.mount(transport.UNIX_SCHEME + '://',
+                          transport.UnixHTTPAdapter())
 
         self.session = session
 
         self.session.verify = False
         warnings.filterwarnings('ignore', 'Unverified HTTPS request')
 
+    def set_endpoints(self, urls, hedge_delay=None, check=False):
+        """Fail over between management endpoints of the cluster.
+
+        Requests are sent to another endpoint at once if the current one
+        does not accept connections, instead of retrying it.
+
+        :param urls: other endpoints of the backend, e.g. URLs of the
+            management nodes, the session URL is always the first one
+        :param hedge_delay: send a GET request to the second endpoint
+            too if the first one has not responded in so many seconds,
+            the first response is used
+        :param check: probe all the endpoints at once
+        """
+        self.endpoints = EndpointPool([self.url] + list(urls))
+        self.hedge_delay = hedge_delay
+        if check:
+            self.endpoints.check()
+
+    def record(self, filename):
+        """Record all the following request/response exchanges.
+
+        Tokens and cookies are scrubbed the same way as in the debug log.
+
+        :param filename: cassette file name, it is truncated first
+        """
+        cassette = vinfra_cassette.Cassette(filename)
+        cassette.truncate()
+        for schema, adapter in list(self.session.adapters.items()):
+            self.session.mount(schema, vinfra_cassette.RecordingHTTPAdapter(
+                cassette, adapter, self._process_header))
+
+    def replay(self, filename, latency_scale=1.0):
+        """Serve requests from a cassette instead of the backend.
+
+        :param filename: cassette file name made by :meth:`record`
+        :param latency_scale: multiplier for the recorded latencies,
+            use 0 to reply immediately
+        """
+        exchanges = vinfra_cassette.Cassette(filename).load()
+        adapter = vinfra_cassette.ReplayHTTPAdapter(
+            exchanges, latency_scale=latency_scale)
+        for schema in list(self.session.adapters):
+            self.session.mount(schema, adapter)
+
     @staticmethod
     def _process_header(header_name, header_value):
         secure_headers = ('x-auth-token',)
@@ -322,13 +579,16 @@ class Session(object):
             auth_headers = self.auth.get_headers(self)
             headers.update(auth_headers)
 
-        if not urlparse(url).netloc:
-            url = "{}/{}".format(self.url.rstrip('/'), url.lstrip('/'))
-
         if json is not None:
             headers.setdefault('Content-Type', 'application/json')
 
-        resp = self._send_request(method, url, json=json, **kwargs)
+        if urlparse(url).netloc:
+            resp = self._send_request(method, url, json=json, **kwargs)
+        elif self.endpoints is not None and len(self.endpoints) > 1:
+            resp = self._send_to_endpoints(method, url, json=json, **kwargs)
+        else:
+            url = "{}/{}".format(self.url.rstrip('/'), url.lstrip('/'))
+            resp = self._send_request(method, url, json=json, **kwargs)
         if raise_exc:
             resp.raise_for_status()
 
@@ -354,6 +614,118 @@ class Session(object):
         return isinstance(err, (requests.exceptions.ConnectionError,
                                 requests.exceptions.Timeout))
 
+    @staticmethod
+    def _is_connect_phase_error(err):
+        # the request has surely not reached the backend
+        if isinstance(err, requests.exceptions.ConnectTimeout):
+            return True
+        if not (isinstance(err, requests.exceptions.ConnectionError) and
+                err.args):
+            return False
+        reason = getattr(err.args[0], 'reason', err.args[0])
+        return isinstance(reason, ConnectTimeoutError)
+
+    def _can_fail_over(self, method, err):
+        if method.lower() in ('get', 'head'):
+            return self._is_connect_error(err)
+        return self._is_connect_phase_error(err)
+
+    def _send_to_endpoint(self, method, base_url, path, **kwargs):
+        url = "{}/{}".format(base_url, path.lstrip('/'))
+        host = urlparse(base_url).hostname
+        if host != urlparse(self.url).hostname:
+            # session cookies are bound to the host of the session URL
+            kwargs['cookies'] = dict((cookie.name, cookie.value)
+                                     for cookie in self.session.cookies)
+        resp = self._send_request(method, url, **kwargs)
+        if host != urlparse(self.url).hostname:
+            for cookie in resp.cookies:
+                self.session.cookies.set(
+                    cookie.name, cookie.value, path=cookie.path,
+                    expires=cookie.expires,
+                    domain=urlparse(self.url).hostname)
+        return resp
+
+    def _send_to_endpoints(self, method, path, connect_retries=0,
+                           connect_retry_delay=0.5, **kwargs):
+        """Send the request failing over between the endpoints.
+
+        GET requests are hedged: if hedge_delay is set and the first
+        endpoint has not answered in time, the request is sent to the
+        next one as well and the first response wins.
+        """
+        timeout = kwargs['timeout']
+        if isinstance(timeout, tuple):
+            conn_timeout, read_timeout = timeout
+        else:
+            conn_timeout = read_timeout = timeout
+        if conn_timeout is None:
+            conn_timeout = self.endpoints.connect_timeout
+        kwargs['timeout'] = (conn_timeout, read_timeout)
+        hedge_delay = None
+        if method.lower() == 'get':
+            hedge_delay = self.hedge_delay
+
+        results = queue.Queue()
+
+        def send(base_url):
+            try:
+                resp = self._send_to_endpoint(method, base_url, path,
+                                              **kwargs)
+            except Exception as err:  # pylint: disable=broad-except
+                results.put((base_url, None, err))
+            else:
+                results.put((base_url, resp, None))
+
+        def start(base_url):
+            if hedge_delay is None:
+                send(base_url)
+                return
+            thread = threading.Thread(target=send, args=(base_url,))
+            thread.daemon = True
+            thread.start()
+
+        while True:
+            candidates = self.endpoints.candidates()
+            start(candidates.pop(0))
+            pending = 1
+            hedged = False
+            last_err = None
+            while pending:
+                timeout = None
+                if hedge_delay is not None and not hedged and candidates:
+                    timeout = hedge_delay
+                try:
+                    base_url, resp, err = results.get(timeout=timeout)
+                except queue.Empty:
+                    LOG.debug("No response in %.2fs, hedging the request",
+                              hedge_delay)
+                    hedged = True
+                    start(candidates.pop(0))
+                    pending += 1
+                    continue
+
+                pending -= 1
+                if err is None:
+                    self.endpoints.mark_up(base_url)
+                    return resp
+                if not self._can_fail_over(method, err):
+                    raise err
+                LOG.debug("Endpoint %s failed: %s", base_url, err)
+                self.endpoints.mark_down(base_url)
+                last_err = err
+                if candidates and not pending:
+                    start(candidates.pop(0))
+                    pending += 1
+
+            connect_retries -= 1
+            if connect_retries < 0:
+                raise last_err
+            LOG.debug('All endpoints failed. Retrying in %.1fs.',
+                      connect_retry_delay)
+            time.sleep(connect_retry_delay)
+            connect_retry_delay *= 2
+
     def _send_request(self, method, url, json=None, log=True,
                       connect_retries=0, connect_retry_delay=0.5,
                       _bad_status_line_retries=3, **kwargs):
@@ -0,0 +1,112 @@
+"""Transports of the backend session selected by the URL scheme.
+
+Besides https:// (and http:// for loopback addresses), the session can
+talk to a backend on the same host over its Unix socket, which saves the
+DNS lookup and the TLS handshake of every connection:
+
+    Session('unix:///path/to/backend.sock')
+
+Such URLs are converted to http+unix://<quoted socket path> URLs, so
+that the socket path stays the host part when request paths are
+appended to the session URL. Connections to a socket are pooled and
+reused like TCP ones.
+"""
+import socket
+import threading
+
+from requests.adapters import HTTPAdapter
+from six.moves.urllib.parse import quote, unquote, urlparse
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+
+UNIX_SCHEME = 'http+unix'
+LOOPBACK_HOSTS = ('localhost', '127.0.0.1', '::1')
+
+
+def is_unix_url(url):
+    return urlparse(url).scheme in ('unix', UNIX_SCHEME)
+
+
+def is_loopback_url(url):
+    return urlparse(url).hostname in LOOPBACK_HOSTS
+
+
+def normalize_url(url):
+    """Convert unix:///path/to/socket to the http+unix:// form.
+
+    Other URLs are returned as is.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme != 'unix':
+        return url
+    path = parsed.netloc + parsed.path
+    if not path:
+        raise ValueError("No socket path in {!r}".format(url))
+    return '{}://{}'.format(UNIX_SCHEME, quote(path, safe=''))
+
+
+def get_socket_path(url):
+    return unquote(urlparse(normalize_url(url)).netloc)
+
+
+class UnixHTTPConnection(HTTPConnection):
+    def __init__(self, *args, **kwargs):
+        self.socket_path = kwargs.pop('socket_path')
+        super(UnixHTTPConnection, self).__init__(*args, **kwargs)
+
+    def _new_conn(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # the timeout may be a sentinel of the default one
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except Exception:
+            sock.close()
+            raise
+        return sock
+
+
+class UnixHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = UnixHTTPConnection
+
+    def __init__(self, socket_path, **kwargs):
+        # the host is only sent in the Host header
+        super(UnixHTTPConnectionPool, self).__init__(
+            'localhost', socket_path=socket_path, **kwargs)
+        self.socket_path = socket_path
+
+
+class UnixHTTPAdapter(HTTPAdapter):
+    """Send requests to http+unix:// URLs over the Unix socket."""
+
+    def __init__(self, *args, **kwargs):
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+        super(UnixHTTPAdapter, self).__init__(*args, **kwargs)
+
+    def get_connection(self, url, proxies=None):  # pylint: disable=unused-argument
+        socket_path = get_socket_path(url)
+        with self._pools_lock:
+            pool = self._pools.get(socket_path)
+            if pool is None:
+                pool = UnixHTTPConnectionPool(
+                    socket_path, maxsize=self._pool_maxsize,
+                    block=self._pool_block)
+                self._pools[socket_path] = pool
+        return pool
+
+    # pylint: disable=unused-argument
+    def get_connection_with_tls_context(self, request, verify, proxies=None,
+                                        cert=None):
+        return self.get_connection(request.url, proxies)
+
+    def request_url(self, request, proxies):
+        return request.path_url
+
+    def close(self):
+        super(UnixHTTPAdapter, self).close()
+        with self._pools_lock:
+            for pool in self._pools.values():
+                pool.close()
+            self._pools.clear()
@@ -1,5 +1,14 @@
+import datetime
+import re
+import uuid
+from multiprocessing.pool import ThreadPool
+
 from vinfra import exceptions
 
+_TIMESTAMP_REGEX = re.compile(
+    r'^(?P<datetime>\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2})'
+    r'(?:\.(?P<fraction>\d+))?(?P<offset>Z|[+-]\d{2}:\d{2})?$')
+
 
 def flatten_args(**kwargs):
     """ Return kwargs where value is not None.
@@ -28,3 +37,105 @@ def get_stream(stream):
         except Exception as err:
             raise exceptions.VinfraError(err)
     return stream
+
+
+def is_uuid(value):
+    try:
+        uuid.UUID(value)
+        return True
+    except (ValueError, AttributeError, TypeError):
+        return False
+
+
+DEFAULT_CONCURRENCY = 8
+
+
+def concurrent_map(func, items, concurrency=None, return_exceptions=False):
+    """Call func for every item in a bounded pool of threads.
+
+    Results are returned in the order of items. If return_exceptions is
+    set, an exception raised by func is returned in place of the result,
+    otherwise the first one is raised once all the calls are finished.
+    """
+    items = list(items)
+    if concurrency is None:
+        concurrency = DEFAULT_CONCURRENCY
+
+    def call(item):
+        try:
+            return True, func(item)
+        except Exception as err:  # pylint: disable=broad-except
+            return False, err
+
+    if concurrency <= 1 or len(items) <= 1:
+        outcomes = [call(item) for item in items]
+    else:
+        pool = ThreadPool(min(concurrency, len(items)))
+        try:
+            outcomes = pool.map(call, items)
+        finally:
+            pool.close()
+            pool.join()
+
+    results = []
+    for success, value in outcomes:
+        if not success and not return_exceptions:
+            raise value
+        results.append(value)
+    return results
+
+
+def concurrent_imap(func, items, concurrency=None):
+    """Call func for every item in a bounded pool of threads.
+
+    Unlike concurrent_map, (item, result, error) tuples are yielded as
+    soon as the calls finish, in the order of completion. The error is
+    None if func has succeeded, the result is None otherwise.
+    """
+    items = list(items)
+    if concurrency is None:
+        concurrency = DEFAULT_CONCURRENCY
+
+    def call(item):
+        try:
+            return item, func(item), None
+        except Exception as err:  # pylint: disable=broad-except
+            return item, None, err
+
+    if concurrency <= 1 or len(items) <= 1:
+        for item in items:
+            yield call(item)
+        return
+
+    pool = ThreadPool(min(concurrency, len(items)))
+    try:
+        for outcome in pool.imap_unordered(call, items):
+            yield outcome
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def parse_timestamp(value):
+    """Convert an ISO 8601 timestamp to a naive UTC datetime.
+
+    >>> parse_timestamp('2020-10-02T15:10:11.842410+03:00')
+    datetime.datetime(2020, 10, 2, 12, 10, 11, 842410)
+    """
+    match = _TIMESTAMP_REGEX.match(value.strip())
+    if not match:
+        raise ValueError("Invalid timestamp {!r}".format(value))
+
+    dtime = datetime.datetime.strptime(
+        match.group('datetime').replace(' ', 'T'), '%Y-%m-%dT%H:%M:%S')
+    fraction = match.group('fraction')
+    if fraction:
+        dtime = dtime.replace(microsecond=int(fraction[:6].ljust(6, '0')))
+
+    offset = match.group('offset')
+    if offset and offset != 'Z':
+        sign = -1 if offset[0] == '-' else 1
+        hours, minutes = offset[1:].split(':')
+        dtime -= sign * datetime.timedelta(hours=int(hours),
+                                           minutes=int(minutes))
+    return dtime
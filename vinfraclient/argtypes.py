@@ -1,6 +1,10 @@
 import argparse
+import datetime
+import re
 from argparse import ArgumentTypeError
 
+from vinfra.utils import parse_timestamp
+
 
 def parse_dict_options(value, optional_keys=None):
     optional_keys = set(optional_keys or [])
@@ -161,3 +165,22 @@ def size_limited_string(value, chars_limit):
     if len(value) > chars_limit:
         raise ArgumentTypeError("max string length is %i" % chars_limit)
     return value
+
+
+_TIME_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def timestamp(value):
+    """Parse an ISO 8601 time (UTC by default) or a relative time like
+    '30m' (30 minutes ago) into a naive UTC datetime."""
+    match = re.match(r'^(\d+)([smhd])$', value.strip())
+    if match:
+        seconds = int(match.group(1)) * _TIME_UNITS[match.group(2)]
+        return datetime.datetime.utcnow() - datetime.timedelta(seconds=seconds)
+    try:
+        return parse_timestamp(value)
+    except ValueError:
+        raise ArgumentTypeError(
+            "invalid time {!r} (use ISO 8601 format, e.g. "
+            "2020-10-02T15:10:11, or a relative time, e.g. 30m, 2h, "
+            "7d)".format(value))
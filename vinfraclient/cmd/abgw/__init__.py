@@ -627,6 +627,7 @@ class ReleaseBackupService(TaskCommand):
 
 class ShowBackupService(ShowOne):
     _description = "Display backup cluster details."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         cluster = get_cluster(self.app.vinfra)
@@ -655,6 +656,7 @@ class AddNodes(TaskCommand):
 
 class ListNodes(Lister):
     _description = "List backup nodes."
+    multi_portal = True
 
     @property
     def _default_fields(self):
@@ -697,6 +699,7 @@ class ReleaseNode(TaskCommand):
 
 class ShowStorageParams(ShowOne):
     _description = "Display storage parameters."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         cluster = get_cluster(self.app.vinfra)
@@ -733,6 +736,7 @@ class ChangeStorageParams(Command):
 
 class ShowVolumeParams(ShowOne):
     _description = "Display volume parameters."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         cluster = get_cluster(self.app.vinfra)
@@ -776,6 +780,7 @@ class ChangeVolumeParams(TaskCommand):
 
 class ShowSysinfoConfig(ShowOne):
     _description = "Show backup storage sysinfo configuration properties."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         cluster = get_cluster(self.app.vinfra)
@@ -889,6 +894,7 @@ class ClientLimits(TaskCommand):
 
 class ShowClientLimits(ShowOne):
     _description = "Show limits of the backup storage client."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         cluster = get_cluster(self.app.vinfra)
@@ -8,6 +8,7 @@ from vinfraclient.utils import get_cluster, get_stream
 
 class ShowGeoReplicationInfo(ShowOne):
     _description = "Display geo-replication configuration."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         cluster = get_cluster(self.app.vinfra)
@@ -85,6 +85,7 @@ class CreateAbgwRegistration(TaskCommand):
 class ListAbgwRegistration(Lister):
 
     _description = "List backup storage registrations."
+    multi_portal = True
     _default_fields = [
         'id', 'name', 'address', 'type'
     ]
@@ -98,6 +99,7 @@ class ListAbgwRegistration(Lister):
 class ShowAbgwRegistration(ShowOne):
 
     _description = "Display backup storage registration details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
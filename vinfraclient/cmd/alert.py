@@ -1,4 +1,6 @@
-from vinfraclient.cmd.base import Lister, ShowOne
+import json
+
+from vinfraclient.cmd.base import Command, Lister, ShowOne
 from vinfraclient.formatters import columns as fmt_columns
 from vinfraclient.utils import find_resource
 
@@ -14,6 +16,7 @@ def _alert_arg(parser):
 
 class ListAlert(Lister):
     _description = "List alert log entries"
+    multi_portal = True
     _default_fields = ['id', 'type', 'datetime', 'severity', 'enabled']
     _formatters = {'datetime': fmt_columns.DatetimeColumn}
 
@@ -38,8 +41,62 @@ class ListAlert(Lister):
         return alerts
 
 
+class WatchAlert(Command):
+    _description = ("Watch the alert log.\n"
+                    "Print new, changed and cleared alerts as JSON lines "
+                    "until interrupted. Polling slows down while nothing "
+                    "changes.")
+
+    def configure_parser(self, parser):
+        parser.add_argument(
+            "--all",
+            dest="all",
+            action="store_true",
+            help="Watch both enabled and disabled alerts."
+        )
+        parser.add_argument(
+            "--lang",
+            type=str,
+            default='en',
+            help="Language of alert message. Supported values: en, de, es, ja, pt, ru, tr, zh"
+        )
+        parser.add_argument(
+            "--interval",
+            metavar="<seconds>",
+            type=int,
+            default=5,
+            help="Minimal polling interval, in seconds (default: 5)."
+        )
+        parser.add_argument(
+            "--max-interval",
+            metavar="<seconds>",
+            type=int,
+            default=60,
+            help="Maximal polling interval reached while nothing changes, "
+                 "in seconds (default: 60)."
+        )
+        parser.add_argument(
+            "--changes-only",
+            action="store_true",
+            help="Do not print alerts existing at start."
+        )
+
+    def do_action(self, parsed_args):
+        watcher = self.app.vinfra.alerts.watch(
+            enabled=not parsed_args.all,
+            lang=parsed_args.lang,
+            interval=parsed_args.interval,
+            max_interval=parsed_args.max_interval,
+            initial=not parsed_args.changes_only,
+        )
+        for event in watcher:
+            self.app.stdout.write(json.dumps(event) + '\n')
+            self.app.stdout.flush()
+
+
 class ShowAlert(ShowOne):
     _description = "Show details of the specified alert log entry."
+    multi_portal = True
     _formatters = {'datetime': fmt_columns.DatetimeColumn}
 
     def configure_parser(self, parser):
@@ -4,6 +4,7 @@ from vinfraclient.cmd.base import Lister
 class ListAlertType(Lister):
 
     _description = "List alert types"
+    multi_portal = True
     _default_fields = ['type', 'group']
 
     def do_action(self, parsed_args):
@@ -1,20 +1,124 @@
+import json
+import time
+
+from requests import exceptions as request_exceptions
+
+from vinfra.request_cache import expire_cached_requests
+from vinfraclient import exceptions
+from vinfraclient.argtypes import timestamp
 from vinfraclient.cmd.base import Lister, ShowOne
 from vinfraclient.formatters import columns as fmt_columns
-from vinfraclient.utils import find_resource
+from vinfraclient.utils import load_state, save_state
 
 
 class ListAuditLog(Lister):
     _description = "List all audit log entries."
+    multi_portal = True
+    _single_portal_options = {'follow': '--follow',
+                              'checkpoint': '--checkpoint'}
     _default_fields = ['id', 'username', 'type', 'activity', 'timestamp']
     _formatters = {'timestamp': fmt_columns.DatetimeColumn}
 
+    def configure_parser(self, parser):
+        parser.add_argument(
+            '--limit',
+            metavar='<num>',
+            type=int,
+            help="The maximum number of audit log entries to list, the "
+                 "newest first."
+        )
+        parser.add_argument(
+            '--marker',
+            metavar='<auditlog>',
+            type=int,
+            help="List audit log entries older than the marker."
+        )
+        parser.add_argument(
+            '--since',
+            metavar='<time>',
+            type=timestamp,
+            help="List entries created after the time. The time is either "
+                 "in the ISO 8601 format in UTC (e.g. 2020-10-02T15:10:11) "
+                 "or relative to now (e.g. 30m, 2h, 7d)."
+        )
+        parser.add_argument(
+            '--until',
+            metavar='<time>',
+            type=timestamp,
+            help="List entries created before the time, in the same format "
+                 "as --since."
+        )
+        follow_group = parser.add_argument_group(
+            title="follow options",
+            description="incremental audit log tailing",
+        )
+        follow_group.add_argument(
+            '--follow',
+            action='store_true',
+            help="Poll for new entries and print them as JSON lines until "
+                 "interrupted."
+        )
+        follow_group.add_argument(
+            '--interval',
+            metavar='<seconds>',
+            type=int,
+            default=10,
+            help="Polling interval for --follow, in seconds (default: 10)."
+        )
+        follow_group.add_argument(
+            '--checkpoint',
+            metavar='<file>',
+            help="File to keep the last printed entry ID in. With --follow, "
+                 "entries after the saved one are printed first, so an "
+                 "interrupted run resumes without gaps or duplicates."
+        )
+
+    def _follow(self, parsed_args):
+        auditlog = self.app.vinfra.auditlog
+        state = {}
+        if parsed_args.checkpoint:
+            state = load_state(parsed_args.checkpoint, default={})
+        last_id = state.get('last_id')
+        if last_id is None:
+            last_id = auditlog.get_last_id()
+
+        while True:
+            expire_cached_requests()
+            for entry in auditlog.list_newer(last_id):
+                self.app.stdout.write(json.dumps(entry.to_dict()) + '\n')
+                last_id = entry.id
+            self.app.stdout.flush()
+            if parsed_args.checkpoint:
+                save_state(parsed_args.checkpoint, {'last_id': last_id})
+            time.sleep(parsed_args.interval)
+
+    def take_action(self, parsed_args):
+        if parsed_args.follow:
+            self._follow(parsed_args)
+        return super(ListAuditLog, self).take_action(parsed_args)
+
     def do_action(self, parsed_args):
-        auditlogs = self.app.vinfra.auditlog.list()
-        return auditlogs
+        auditlog = self.app.vinfra.auditlog
+        if parsed_args.since or parsed_args.until:
+            entries = []
+            for entry in auditlog.iterate(since=parsed_args.since,
+                                          until=parsed_args.until):
+                if parsed_args.marker and entry.id >= parsed_args.marker:
+                    continue
+                entries.append(entry)
+                if len(entries) == parsed_args.limit:
+                    break
+            return entries
+
+        if parsed_args.limit or parsed_args.marker:
+            return auditlog.list(limit=parsed_args.limit,
+                                 marker=parsed_args.marker, sort='id:desc')
+        return auditlog.list()
 
 
 class ShowAuditLog(ShowOne):
     _description = "Show details of an audit log entry."
+    multi_portal = True
     _formatters = {'timestamp': fmt_columns.DatetimeColumn}
 
     def configure_parser(self, parser):
@@ -26,4 +130,19 @@ class ShowAuditLog(ShowOne):
         )
 
     def do_action(self, parsed_args):
-        return find_resource(self.app.vinfra.auditlog, parsed_args.auditlog)
+        auditlog = self.app.vinfra.auditlog
+        try:
+            return auditlog.get(parsed_args.auditlog)
+        except request_exceptions.HTTPError as err:
+            if err.response is None or err.response.status_code not in (404, 405):
+                raise
+
+        # the backend does not support getting a single entry: fall back
+        # to scanning the log
+        for entry in auditlog.iterate():
+            if entry.id == parsed_args.auditlog:
+                return entry
+            if entry.id < parsed_args.auditlog:
+                break
+        raise exceptions.CommandError(
+            "No audit log with ID of '{}' exists.".format(parsed_args.auditlog))
@@ -3,6 +3,7 @@ from vinfraclient.cmd import base
 
 class ShowBackup(base.ShowOne):
     _description = "Show backup information"
+    multi_portal = True
 
     def do_action(self, parsed_args):
         return self.app.vinfra.backup.get()
@@ -1,4 +1,6 @@
 import argparse
+import collections
+import copy
 import json
 import inspect
 import logging
@@ -6,9 +8,7 @@ import string
 import uuid
 
 import abc
-import datetime
 import os
-import progressbar as pb
 import yaml
 from yaml.representer import SafeRepresenter
 from cliff import command as cliff_command
@@ -18,7 +18,9 @@ from requests import exceptions as request_exceptions
 
 from vinfra import exceptions as vinfra_exceptions
 from vinfra.api import base as vinfra_base
+from vinfra.api_versions import is_version_error
 from vinfraclient import exceptions
+from vinfraclient import query
 from vinfraclient import utils
 from vinfraclient.argtypes import parse_dict_options
 from vinfraclient.formatters import columns as fmt_columns
@@ -47,6 +49,20 @@ def flatten_args(parsed_args, arg_name_list):
     return res
 
 
+def make_names(template, count):
+    """Format the name template with {index} from 1 to count."""
+    if '{index' not in template:
+        raise exceptions.ValidationError(
+            "The name template must contain the {index} placeholder.")
+    try:
+        names = [template.format(index=index)
+                 for index in range(1, count + 1)]
+    except (KeyError, IndexError, ValueError) as err:
+        raise exceptions.ValidationError(
+            "Invalid name template: {}".format(err))
+    return names
+
+
 class FilterAction(argparse.Action):
     def __init__(self, *args, **kwargs):
         operators = kwargs.pop('operators', [])
@@ -99,6 +115,7 @@ class Command(cliff_command.Command):
     client_required = True
     auth_required = True
     deprecated_reason = None
+    _error_prefix = ''
 
     def __init__(self, app, app_args, cmd_name=None):
         # NOTE(akurbatov): cmd_name is needed only to load command hooks
@@ -147,6 +164,7 @@ class Command(cliff_command.Command):
         if isinstance(err, request_exceptions.HTTPError):
             message, stderr = self._get_http_error(err)
             self._produce_error(message, stderr=stderr)
+            self._recheck_versions(err)
             return HTTP_ERROR
 
         elif isinstance(err, exceptions.ValidationError):
@@ -178,6 +196,16 @@ class Command(cliff_command.Command):
 
         return None
 
+    def _recheck_versions(self, err):
+        # the next commands are not to use outdated cached versions
+        vinfra = getattr(self.app, 'vinfra', None)
+        if vinfra is None or not is_version_error(err):
+            return
+        try:
+            vinfra.recheck_versions()
+        except Exception:  # pylint: disable=broad-except
+            LOG.debug("Failed to recheck backend versions", exc_info=True)
+
     def _get_http_error(self, err):
         stderr = True
         error_params = self._get_http_error_params(err)
@@ -262,7 +290,7 @@ class Command(cliff_command.Command):
         return None
 
     def _produce_error(self, error_details, stderr=True):
-        message = error_details.rstrip('\n')
+        message = self._error_prefix + error_details.rstrip('\n')
         stream = self.app.stderr if stderr else self.app.stdout
         stream.write(message + '\n')
 
@@ -278,6 +306,14 @@ class Command(cliff_command.Command):
 
 class DisplayMixin(object):
     _formatters = {}
+    # read-only commands set it to run on multiple portals at once, their
+    # outputs are merged with the portal column
+    multi_portal = False
+    # options of multi-portal commands which stream output or keep local
+    # state, they are refused on multiple portals: dest -> option
+    _single_portal_options = {}
+    # set by commands showing results of partially failed operations
+    exit_code = 0
 
     def _formattable_entity(self, parsed_args, data):
         if not data:
@@ -315,9 +351,81 @@ class DisplayMixin(object):
         return super(DisplayMixin, self).produce_output(
             parsed_args, column_names, data)
 
+    def run(self, parsed_args):
+        portals = getattr(self.app, 'portals', None) or []
+        if not self.client_required or len(portals) < 2:
+            return (super(DisplayMixin, self).run(parsed_args) or
+                    self.exit_code)
+
+        used = [option for dest, option
+                in sorted(self._single_portal_options.items())
+                if getattr(parsed_args, dest, None) not in (None, False)]
+        if used:
+            raise exceptions.ValidationError(
+                "{} cannot be used on multiple portals.".format(
+                    ", ".join(used)))
+
+        self.formatter = self._formatter_plugins[parsed_args.formatter].obj
+
+        def take_action():
+            # commands may keep state on self or in parsed_args, every
+            # portal gets its own ones
+            cmd = type(self)(self.app, self.app_args,
+                             cmd_name=self._cmd_name)
+            return cmd.take_action(copy.copy(parsed_args)), cmd.exit_code
+
+        outcomes = self.app.run_on_portals(
+            take_action, auth_required=self.auth_required)
+
+        columns = ['portal']
+        records = []
+        retcode = 0
+        for portal, result, err, elapsed in outcomes:
+            if err is not None:
+                self._error_prefix = '{}: '.format(portal)
+                try:
+                    code = self.handle_exception(err)
+                    if not code:
+                        self._produce_error("command failed: {}".format(err))
+                        code = COMMAND_ERROR
+                finally:
+                    self._error_prefix = ''
+                retcode = retcode or code
+                self.app.print_message("%s: failed in %.2fs", portal, elapsed)
+                continue
+
+            (column_names, data), code = result
+            retcode = retcode or code
+            if not isinstance(self, cliff_lister.Lister):
+                data = [data]
+            columns.extend(name for name in column_names
+                           if name not in columns)
+            for row in data:
+                record = dict(zip(column_names, row))
+                record['portal'] = portal
+                records.append(record)
+            self.app.print_message("%s: done in %.2fs", portal, elapsed)
+
+        if records or not retcode:
+            if parsed_args.columns:
+                selected = [name for name in parsed_args.columns
+                            if name in columns and name != 'portal']
+                if not selected:
+                    raise exceptions.ValidationError(
+                        "No recognized column names: {}".format(
+                            parsed_args.columns))
+                columns = ['portal'] + selected
+            rows = [[record.get(name) for name in columns]
+                    for record in records]
+            self.formatter.emit_list(columns, rows, self.app.stdout,
+                                     parsed_args)
+        return retcode
+
 
 class Lister(Command, DisplayMixin, cliff_lister.Lister):
     __metaclass__ = abc.ABCMeta
+    # --where column -> option of the command filtering on the server side
+    _server_filters = {}
 
     @abc.abstractproperty
     def _default_fields(self):
@@ -342,19 +450,101 @@ class Lister(Command, DisplayMixin, cliff_lister.Lister):
         )
         super(Lister, self)._configure_parser_inner(parser)
 
+        query_group = parser.add_argument_group(
+            title="query options",
+            description="Filter and aggregate listed objects on the client "
+                        "side. Any field of objects can be used, including "
+                        "nested ones like metadata.key."
+        )
+        query_group.add_argument(
+            "--where",
+            metavar="<condition>",
+            action="append",
+            help="List objects matching the condition "
+                 "<field><operator><value>. Supported operators: {}. "
+                 "Specify this option multiple times to list objects "
+                 "matching all the conditions.".format(
+                     " ".join(query.OPERATORS))
+        )
+        query_group.add_argument(
+            "--group-by",
+            metavar="<field>",
+            action="append",
+            help="Group objects by the field and count them in every "
+                 "group. Specify this option multiple times to group by "
+                 "multiple fields."
+        )
+        query_group.add_argument(
+            "--sum",
+            metavar="<field>",
+            dest="sums",
+            action="append",
+            help="Sum up numeric field values in every group. Specify "
+                 "this option multiple times to sum up multiple fields."
+        )
+        query_group.add_argument(
+            "--order-by",
+            metavar="<field>[:asc|desc]",
+            action="append",
+            help="Order objects or groups by the field. Specify this "
+                 "option multiple times to order by multiple fields."
+        )
+        query_group.add_argument(
+            "--top",
+            metavar="<num>",
+            type=int,
+            help="List only the first <num> objects or groups."
+        )
+
+    def _make_query(self, parsed_args):
+        data_query = query.Query(
+            where=getattr(parsed_args, 'where', None),
+            group_by=getattr(parsed_args, 'group_by', None),
+            sums=getattr(parsed_args, 'sums', None),
+            order_by=getattr(parsed_args, 'order_by', None),
+            top=getattr(parsed_args, 'top', None))
+        if data_query.grouped:
+            unknown = [column for column, _desc in data_query.order_by
+                       if column not in data_query.columns]
+            if unknown:
+                raise exceptions.ValidationError(
+                    "Groups can only be ordered by: {}".format(
+                        ", ".join(data_query.columns)))
+
+        for cond in data_query.conditions:
+            dest = self._server_filters.get(cond.column)
+            if (cond.op != '=' or not dest or
+                    getattr(parsed_args, dest, None) is not None or
+                    ':' in cond.value or ',' in cond.value):
+                continue
+            LOG.debug("Filtering %s on the server side", cond.column)
+            setattr(parsed_args, dest, cond.value)
+        return data_query
+
     def take_action(self, parsed_args):
+        data_query = self._make_query(parsed_args)
         data = self.do_action(parsed_args)
         data = data if data else []
 
         columns = list(self._default_fields)
         all_columns = set()
-        formattable_data = []
-        for el in data:
-            el = self._formattable_entity(parsed_args, el)
-            formattable_data.append(el)
-            all_columns.update(el.keys())
 
-        if parsed_args.long:
+        def iter_entities():
+            for el in data:
+                el = self._formattable_entity(parsed_args, el)
+                all_columns.update(el.keys())
+                yield el
+
+        formattable_data = data_query.run(iter_entities())
+        if all_columns:
+            unknown = data_query.input_columns() - all_columns
+            if unknown:
+                raise exceptions.ValidationError(
+                    "Unknown fields: {}".format(", ".join(sorted(unknown))))
+
+        if data_query.grouped:
+            columns = data_query.columns
+        elif parsed_args.long:
             extra_columns = all_columns - set(columns)
             columns.extend(sorted(extra_columns))
 
@@ -395,26 +585,25 @@ class TaskCommand(ShowOne):
             help="A timeout for the operation to complete if --wait is "
                  "specified, in seconds (default: %d)" % self._default_timeout
         )
+        task_group.add_argument(
+            "--progress-format",
+            choices=utils.PROGRESS_FORMATS,
+            help="Show the progress of the operation if --wait is specified: "
+                 "'text' (default for the table format on a terminal) or "
+                 "'json', a JSON object per poll written to stderr."
+        )
         super(TaskCommand, self)._configure_parser_inner(parser)
 
     def task_wait(self, task, parsed_args):
         timeout = parsed_args.timeout
-        formatter = parsed_args.formatter
-
-        if formatter != 'table':
-            return task.wait(timeout)
-
-        if isinstance(task, vinfra_base.BackendTask):
-            self.app.print_message("Task ID: %s", task.data['task_id'])
-
-        timeout_str = datetime.timedelta(seconds=timeout)
-        format_pattern = ('Operation waiting [timeout: {}, elapsed time: %s] '
-                          ''.format(timeout_str))
-        widgets = [pb.Timer(format=format_pattern), pb.AnimatedMarker()]
-
-        pbar = pb.ProgressBar(maxval=80, term_width=80, widgets=widgets,
-                              fd=self.app.stderr)
-        with utils.progress_bar_context(self.app, pbar, timeout=timeout):
+        progress_format = parsed_args.progress_format
+        if parsed_args.formatter == 'table':
+            progress_format = progress_format or 'text'
+            if isinstance(task, vinfra_base.BackendTask):
+                self.app.print_message("Task ID: %s", task.data['task_id'])
+
+        with utils.task_progress_context(self.app, progress_format,
+                                         timeout=timeout):
             return task.wait(timeout=timeout)
 
     def take_action(self, parsed_args):
@@ -435,6 +624,38 @@ class TaskCommand(ShowOne):
         return keys, values
 
 
+class BulkTaskMixin(object):
+    """Show results of a BatchStatusTask for a TaskCommand.
+
+    Every resource is shown with its label as a key: its ID and status or
+    the error it has failed with, repeated labels get the item position
+    appended. The command exits with an error if any of the operations
+    has failed.
+    """
+
+    def bulk_task_output(self, parsed_args, task, labels):
+        if parsed_args.wait:
+            self.task_wait(task, parsed_args)
+
+        counts = collections.Counter(labels)
+        data = {}
+        failed = 0
+        for idx, (label, item) in enumerate(zip(labels, task.get_report())):
+            if counts[label] > 1:
+                # e.g. a volume snapshotted twice, every item is shown
+                label = '{} ({})'.format(label, idx + 1)
+            if item['error']:
+                failed += 1
+            data[label] = dict((k, v) for k, v in item.items()
+                               if v is not None)
+        if failed:
+            LOG.error("%d of %d operations failed.", failed, len(labels))
+            self.exit_code = COMMAND_ERROR
+
+        data = self._formattable_entity(parsed_args, data)
+        return self.dict2columns(data)
+
+
 class SuppressMixin(object):
     # This hack tells cliff to suppress the command and do not show in the help message
     deprecated = True
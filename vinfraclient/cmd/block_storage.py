@@ -24,6 +24,7 @@ def _parse_target(value):
 
 class ListTargetGroups(Lister):
     _description = "List target groups."
+    multi_portal = True
     _default_fields = ['id', 'name', 'type', 'state', 'running']
 
     def do_action(self, parsed_args):
@@ -33,6 +34,7 @@ class ListTargetGroups(Lister):
 
 class ShowTargetGroup(ShowOne):
     _description = "Show target group details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -206,6 +208,7 @@ class DeleteTargetGroup(TaskCommand):
 
 class ListTargets(Lister):
     _description = "List targets."
+    multi_portal = True
     _default_fields = ['node_id', 'iqn', 'state', 'portals']
 
     def configure_parser(self, parser):
@@ -225,6 +228,7 @@ class ListTargets(Lister):
 
 class ShowTarget(ShowOne):
     _description = "Show target details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -318,6 +322,7 @@ class DeleteTarget(TaskCommand):
 
 class ListVolumes(Lister):
     _description = "List volumes."
+    multi_portal = True
     _default_fields = ['id', 'serial', 'name', 'size', 'used_size',
                        'grp_name', 'grp_id', 'lun']
 
@@ -328,6 +333,7 @@ class ListVolumes(Lister):
 
 class ShowVolume(ShowOne):
     _description = "Show volume details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -481,6 +487,7 @@ class AttachVolume(TaskCommand):
 
 class ListTargetGroupVolumes(Lister):
     _description = "List target group volumes."
+    multi_portal = True
     _default_fields = ['id', 'serial', 'name', 'size', 'used_size']
 
     def configure_parser(self, parser):
@@ -500,6 +507,7 @@ class ListTargetGroupVolumes(Lister):
 
 class ShowTargetGroupVolume(ShowOne):
     _description = "Show target group volume details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -545,6 +553,7 @@ class DetachVolume(TaskCommand):
 
 class ListUsers(Lister):
     _description = "List users."
+    multi_portal = True
     _default_fields = ['name']
 
     def do_action(self, parsed_args):
@@ -554,6 +563,7 @@ class ListUsers(Lister):
 
 class ShowUser(ShowOne):
     _description = "Show user details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -644,6 +654,7 @@ class UpdateUser(TaskCommand):
 
 class ListACLs(Lister):
     _description = "List target group ACL rules."
+    multi_portal = True
     _default_fields = ['wwn', 'alias', 'luns']
 
     def configure_parser(self, parser):
@@ -764,6 +775,7 @@ class SetACL(TaskCommand):
 
 class ListTargetConnections(Lister):
     _description = "List target connections."
+    multi_portal = True
     _default_fields = ["ip_addr", "initiator", "target"]
 
     def configure_parser(self, parser):
@@ -5,6 +5,7 @@ import uuid
 import progressbar as pb
 
 from vinfra.exceptions import TimeoutError
+from vinfra.request_cache import expire_cached_requests
 from vinfraclient import utils
 from vinfraclient.cmd.base import Command, ShowOne, TaskCommand
 from vinfraclient.cmd.node.disk import DiskOption
@@ -13,6 +14,7 @@ from vinfraclient.exceptions import CommandError, AbortError
 
 class ShowCluster(ShowOne):
     _description = "Show cluster details"
+    multi_portal = True
 
     def do_action(self, parsed_args):
         cluster = utils.get_cluster(self.app.vinfra)
@@ -67,14 +69,7 @@ class CreateCluster(TaskCommand):
                 encryption['tier%s' % tier] = tier in parsed_args.encryptions
 
         if parsed_args.disks:
-            disks = []
-            for disk in parsed_args.disks:
-                disk.disk = utils.find_resource(
-                    node.disks_manager, disk.disk).id
-                if disk.params.get('journal_disk_id'):
-                    disk.params['journal_disk_id'] = utils.find_resource(
-                        node.disks_manager, disk.params['journal_disk_id']).id
-                disks.append(disk.to_dict())
+            disks = DiskOption.resolve(node.disks_manager, parsed_args.disks)
 
         return self.app.vinfra.clusters.create_async(
             node.id, parsed_args.name, encryption=encryption, disks=disks)
@@ -115,6 +110,7 @@ class DeleteCluster(Command):
                 _node = None
                 if endtime - time.time() < 0:
                     raise_timeout()
+                expire_cached_requests()
                 for _node in self.app.vinfra.nodes.list():
                     if _node.id == str(uuid.UUID(node_id)):
                         break
@@ -156,6 +152,7 @@ class DeleteCluster(Command):
 
 class Overview(ShowOne):
     _description = "Show storage cluster overview."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         cluster = utils.get_cluster(self.app.vinfra)
@@ -164,6 +161,7 @@ class Overview(ShowOne):
 
 class ShowPassword(ShowOne):
     _description = "Show storage cluster password."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         cluster = utils.get_cluster(self.app.vinfra)
@@ -181,6 +179,7 @@ class SetPassword(ShowOne):
 
 class GetJoinConfig(ShowOne):
     _description = "Get disk configurations for joining a node to the cluster"
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -0,0 +1,70 @@
+import logging
+import os
+
+from vinfra.utils import concurrent_map
+from vinfraclient import completion
+from vinfraclient.cmd.base import Lister
+from vinfraclient.session import get_cache_dir
+from vinfraclient.utils import save_state
+
+LOG = logging.getLogger(__name__)
+
+# list arguments returning all the resources instead of the first page
+_LIST_KWARGS = {
+    'servers': {'limit': -1},
+    'volumes': {'limit': -1},
+    'images': {'limit': -1},
+    'networks': {'limit': -1},
+    'routers': {'limit': -1},
+    'security_groups': {'limit': -1},
+}
+
+
+class RefreshCompletion(Lister):
+    _description = ("Refresh names of compute resources used by shell "
+                    "completion.\n"
+                    "Names are cached under ~/.vinfra/HOST/completion. "
+                    "Completion refreshes them in the background once "
+                    "they are older than VINFRA_COMPLETION_TTL seconds "
+                    "(default: 300).")
+    _default_fields = ['kind', 'count', 'error']
+
+    def configure_parser(self, parser):
+        parser.add_argument(
+            "--kind",
+            dest="kinds",
+            action="append",
+            choices=sorted(set(completion.RESOURCE_KINDS.values())),
+            help="Resource kind to refresh. Specify this option multiple "
+                 "times to refresh multiple kinds. All kinds are refreshed "
+                 "by default."
+        )
+
+    def do_action(self, parsed_args):
+        compute = self.app.vinfra.compute
+        kinds = parsed_args.kinds or sorted(
+            set(completion.RESOURCE_KINDS.values()))
+        names_dir = os.path.join(get_cache_dir(self.app.vinfra.session.url),
+                                 'completion')
+        if not os.path.isdir(names_dir):
+            os.makedirs(names_dir)
+
+        def refresh(kind):
+            resources = getattr(compute, kind).list(
+                **_LIST_KWARGS.get(kind, {}))
+            names = sorted(set(
+                name for name in (getattr(resource, resource.NAME_ATTR, None)
+                                  for resource in resources) if name))
+            save_state(completion.get_names_path(names_dir, kind),
+                       {'names': names})
+            return len(names)
+
+        rv = []
+        for kind, result in zip(kinds, concurrent_map(
+                refresh, kinds, return_exceptions=True)):
+            if isinstance(result, Exception):
+                LOG.debug("Failed to refresh %s names: %s", kind, result)
+                rv.append({'kind': kind, 'count': None, 'error': str(result)})
+            else:
+                rv.append({'kind': kind, 'count': result, 'error': None})
+        return rv
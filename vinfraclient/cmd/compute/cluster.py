@@ -219,6 +219,7 @@ def _custom_params_from(parsed_args):
 
 class ShowCompute(ShowOne):
     _description = "Display compute cluster details."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         compute = self.app.vinfra.compute.cluster.get()
@@ -431,6 +432,7 @@ class DeleteNode(TaskCommand):
 
 class ClusterStat(ShowOne):
     _description = "Display compute cluster statistics"
+    multi_portal = True
 
     def do_action(self, parsed_args):
         return self.app.vinfra.compute.cluster.stat()
@@ -438,6 +440,7 @@ class ClusterStat(ShowOne):
 
 class BaselineCPU(ShowOne):
     _description = "Determine baseline CPU models for the compute cluster"
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -655,6 +658,7 @@ class SetComputeStorage(TaskCommand):
 
 class ListComputeStorage(Lister):
     _description = "List existing compute storages."
+    multi_portal = True
     _default_fields = ['name', 'params', 'secret_params', 'enabled', 'configured']
 
     def do_action(self, parsed_args):
@@ -663,6 +667,7 @@ class ListComputeStorage(Lister):
 
 class ShowComputeStorage(ShowOne):
     _description = "Show details of a compute storage."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -694,6 +699,7 @@ class RemoveComputeStorage(TaskCommand):
 
 class ShowTask(ShowOne):
     _description = "Show compute task details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
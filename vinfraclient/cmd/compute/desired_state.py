@@ -0,0 +1,82 @@
+import logging
+
+from vinfraclient.cmd.base import COMMAND_ERROR, Lister
+from vinfraclient.cmd.compute.cluster import yaml_config_file
+from vinfraclient.formatters import columns as fmt_columns
+
+LOG = logging.getLogger(__name__)
+
+
+class ChangesColumn(fmt_columns.BaseColumn):
+    def human_readable(self, value=None):
+        lines = []
+        for field, (old, new) in sorted((self._value or {}).items()):
+            if old is None:
+                lines.append('{}: {}'.format(field, new))
+            else:
+                lines.append('{}: {} -> {}'.format(field, old, new))
+        return '\n'.join(lines)
+
+    def machine_readable(self, value=None):
+        if self._output_formatter == 'value':
+            return self.human_readable()
+        return dict((field, {'old': old, 'new': new})
+                    for field, (old, new) in (self._value or {}).items())
+
+
+class ApplyState(Lister):
+    _description = ("Apply a desired state of compute resources.\n"
+                    "Flavors, security groups with their rules and project "
+                    "quotas are compared with the state described in a "
+                    "YAML file, and only the differences are applied. "
+                    "Independent operations run concurrently.")
+    _default_fields = ['kind', 'name', 'action', 'changes', 'state', 'error']
+    _formatters = {'changes': ChangesColumn}
+
+    def configure_parser(self, parser):
+        parser.add_argument(
+            "--file",
+            metavar="<path>",
+            dest="state",
+            required=True,
+            type=yaml_config_file,
+            help="Path to a YAML file with the desired state. Top-level "
+                 "keys are resource types: flavors, security_groups and "
+                 "quotas."
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show planned operations without applying them."
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Delete flavors, security groups and security group rules "
+                 "missing from the desired state. Resource types not "
+                 "listed in the file are not touched. Default egress "
+                 "rules are deleted only from security groups listing "
+                 "egress rules, and only security groups of the current "
+                 "project are deleted."
+        )
+        parser.add_argument(
+            "--concurrency",
+            metavar="<num>",
+            type=int,
+            help="Maximum number of concurrent requests."
+        )
+
+    def do_action(self, parsed_args):
+        plan = self.app.vinfra.compute.plan_state(
+            parsed_args.state or {}, prune=parsed_args.prune,
+            concurrency=parsed_args.concurrency)
+        if parsed_args.dry_run:
+            return list(plan)
+
+        operations = plan.execute(concurrency=parsed_args.concurrency)
+        failed = [op for op in operations if op.state != op.DONE]
+        if failed:
+            LOG.error("%d of %d operations failed or were skipped.",
+                      len(failed), len(operations))
+            self.exit_code = COMMAND_ERROR
+        return operations
@@ -4,6 +4,7 @@ from vinfraclient.utils import find_resource
 
 class ListFlavor(Lister):
     _description = "List compute flavors."
+    multi_portal = True
     _default_fields = ['id', 'name', 'ram', 'swap', 'vcpus']
 
     def configure_parser(self, parser):
@@ -27,6 +28,7 @@ class ListFlavor(Lister):
 
 class ShowFlavor(ShowOne):
     _description = "Display compute  flavor details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -34,6 +34,7 @@ def _add_floatingip_argument(parser):
 
 class ListFloatingIps(base.Lister):
     _description = "List floating IPs."
+    multi_portal = True
     _default_fields = ['id', 'fixed_ip_address', 'floating_ip_address',
                        'port_id', 'floating_network_id', 'attached_to']
 
@@ -113,6 +114,7 @@ class ListFloatingIps(base.Lister):
 
 class ShowFloatingIp(base.ShowOne):
     _description = "Display information about a floating IP."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _add_floatingip_argument(parser)
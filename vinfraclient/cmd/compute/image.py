@@ -70,9 +70,11 @@ def _common_set_options(parser):
 
 class ListImage(base.Lister):
     _description = "List compute images."
+    multi_portal = True
     _default_fields = ['id', 'name', 'size', 'status', 'disk_format']
     _sort_keys = ['id', 'name', 'status', 'created_at', 'updated_at'
                   'size', 'disk_format']
+    _server_filters = {'status': 'status', 'disk_format': 'disk_format'}
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -175,6 +177,7 @@ class ListImage(base.Lister):
 
 class ShowImage(base.ShowOne):
     _description = "Display compute image details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _image_arg(parser)
@@ -1,12 +1,14 @@
 import argparse
+import json
 import re
 
 from vinfra import exceptions as vinfra_exceptions
+from vinfra.utils import concurrent_map
 from vinfraclient import argtypes
 from vinfraclient.argtypes import parse_dict_options
 from vinfraclient.cmd import base
 from vinfraclient import exceptions
-from vinfraclient.utils import find_resource
+from vinfraclient.utils import find_resource, find_resources
 
 
 def _common_set_options(parser):
@@ -121,6 +123,7 @@ def check_agent_health(cluster):
 
 class ListK8saasCluster(base.Lister):
     _description = "List Kubernetes clusters."
+    multi_portal = True
     _default_fields = ['id', 'name', 'status']
 
     def do_action(self, parsed_args):
@@ -129,6 +132,7 @@ class ListK8saasCluster(base.Lister):
 
 class ShowK8saasCluster(base.ShowOne):
     _description = "Display Kubernetes cluster details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _cluster_arg(parser)
@@ -140,6 +144,7 @@ class ShowK8saasCluster(base.ShowOne):
 
 class ShowK8saasClusterHealth(base.ShowOne):
     _description = "Display Kubernetes cluster health details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _cluster_arg(parser)
@@ -150,6 +155,76 @@ class ShowK8saasClusterHealth(base.ShowOne):
         return cluster.healthcheck()
 
 
+class ListK8saasClusterHealth(base.Lister):
+    _description = ("Display health of Kubernetes clusters.\n"
+                    "Clusters are checked concurrently: worker group "
+                    "statuses and agent statuses of Kubernetes servers "
+                    "are summarized per cluster.")
+    multi_portal = True
+    _single_portal_options = {'stream': '--stream'}
+    _default_fields = ['id', 'name', 'status', 'healthy',
+                       'workergroups_not_active', 'servers_not_responding',
+                       'error']
+
+    def configure_parser(self, parser):
+        parser.add_argument(
+            "--cluster",
+            metavar="<cluster>",
+            dest="clusters",
+            action="append",
+            help="Cluster ID or name. Specify this option multiple times "
+                 "to check multiple clusters. All the clusters are checked "
+                 "by default."
+        )
+        parser.add_argument(
+            "--skip-workergroups",
+            action="store_true",
+            help="Do not check statuses of worker groups."
+        )
+        parser.add_argument(
+            "--concurrency",
+            metavar="<num>",
+            type=int,
+            help="Maximum number of clusters checked concurrently."
+        )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            help="Print each cluster as a JSON line as soon as it is "
+                 "checked."
+        )
+
+    def _fleet_health(self, parsed_args):
+        k8saas = self.app.vinfra.compute.k8saas
+        clusters = None
+        if parsed_args.clusters:
+            clusters = find_resources(k8saas, parsed_args.clusters)
+        return k8saas.fleet_health(
+            clusters=clusters,
+            nodegroups=not parsed_args.skip_workergroups,
+            concurrency=parsed_args.concurrency)
+
+    def take_action(self, parsed_args):
+        if not parsed_args.stream:
+            return super(ListK8saasClusterHealth, self).take_action(
+                parsed_args)
+
+        for summary in self._fleet_health(parsed_args):
+            self.app.stdout.write(json.dumps(summary) + '\n')
+            self.app.stdout.flush()
+        return (), ()
+
+    def produce_output(self, parsed_args, column_names, data):
+        if parsed_args.stream:
+            return None
+        return super(ListK8saasClusterHealth, self).produce_output(
+            parsed_args, column_names, data)
+
+    def do_action(self, parsed_args):
+        return sorted(self._fleet_health(parsed_args),
+                      key=lambda summary: summary['name'])
+
+
 class ShowK8saasClusterConfig(base.Command):
     _description = "Display Kubernetes cluster config."
 
@@ -218,6 +293,7 @@ class UpgradeK8saasCluster(base.TaskCommand):
 
 class K8saasDefaultsShow(base.ShowOne):
     _description = "Show default Kubernetes parameters values"
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -485,6 +561,7 @@ class DeleteK8saasCluster(base.TaskCommand):
 
 class ListK8saasWorkerGroup(base.Lister):
     _description = "List Kubernetes worker groups."
+    multi_portal = True
     _default_fields = ['id', 'name', 'status']
 
     def configure_parser(self, parser):
@@ -498,6 +575,7 @@ class ListK8saasWorkerGroup(base.Lister):
 
 class ShowK8saasWorkerGroup(base.ShowOne):
     _description = "Display Kubernetes worker group details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _cluster_arg(parser)
@@ -629,6 +707,74 @@ class SetK8saasWorkerGroup(base.TaskCommand):
         return nodegroup.update_async(**params)
 
 
+def parse_scale_target(value):
+    cluster, sep, rest = value.partition(':')
+    workergroup, sep2, node_count = rest.rpartition('=')
+    if not (sep and sep2 and cluster and workergroup and node_count.isdigit()):
+        raise argparse.ArgumentTypeError(
+            '"{}" is not in the cluster:worker-group=count format'.format(
+                value))
+    return cluster, workergroup, int(node_count)
+
+
+class ScaleK8saasWorkerGroups(base.BulkTaskMixin, base.TaskCommand):
+    _description = ("Scale Kubernetes worker groups of one or more clusters.\n"
+                    "Update requests are sent concurrently, and all the "
+                    "worker groups are waited for with one poller.")
+
+    def configure_parser(self, parser):
+        parser.add_argument(
+            "targets",
+            metavar="<cluster:worker-group=count>",
+            nargs="+",
+            type=parse_scale_target,
+            help="Cluster ID or name, worker group ID or name and the new "
+                 "amount of worker nodes in the worker group"
+        )
+        parser.add_argument(
+            "--concurrency",
+            metavar="<num>",
+            type=int,
+            help="Maximum number of concurrent requests."
+        )
+
+    def _updates(self, parsed_args):
+        k8saas = self.app.vinfra.compute.k8saas
+        names = []
+        for cluster_name, _workergroup, _count in parsed_args.targets:
+            if cluster_name not in names:
+                names.append(cluster_name)
+        clusters = find_resources(k8saas, names)
+
+        # worker groups are looked up with one list request per cluster
+        def find_workergroups(cluster_idx):
+            return find_resources(
+                clusters[cluster_idx].nodegroups_manager,
+                [workergroup for name, workergroup, _count
+                 in parsed_args.targets if name == names[cluster_idx]])
+
+        workergroups = dict(zip(names, concurrent_map(
+            find_workergroups, range(len(names)),
+            concurrency=parsed_args.concurrency)))
+
+        updates = []
+        for cluster_name, _workergroup, node_count in parsed_args.targets:
+            nodegroup = workergroups[cluster_name].pop(0)
+            updates.append((nodegroup, {'node_count': node_count}))
+        return updates
+
+    def do_action(self, parsed_args):
+        updates = self._updates(parsed_args)
+        return self.app.vinfra.compute.k8saas.update_nodegroups_async(
+            updates, concurrency=parsed_args.concurrency)
+
+    def take_action(self, parsed_args):
+        task = self.do_action(parsed_args)
+        labels = ['{}:{}'.format(cluster, workergroup)
+                  for cluster, workergroup, _count in parsed_args.targets]
+        return self.bulk_task_output(parsed_args, task, labels)
+
+
 class DeleteK8saasWorkerGroup(base.TaskCommand):
     _description = "Delete a Kubernetes worker group."
 
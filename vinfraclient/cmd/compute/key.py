@@ -10,6 +10,7 @@ from vinfraclient.utils import find_resource
 
 class ListComputeSshKey(Lister):
     _description = "List compute ssh keys."
+    multi_portal = True
     _default_fields = ['name', 'description', 'created_at']
 
     def do_action(self, parsed_args):
@@ -19,6 +20,7 @@ class ListComputeSshKey(Lister):
 
 class ShowComputeSshKey(ShowOne):
     _description = "Display compute ssh key details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -243,6 +243,7 @@ def _common_pool_args(parser, required):
 
 class ListLoadBalancers(base.Lister):
     _description = "List load balancers."
+    multi_portal = True
     _default_fields = [
         'id', 'name', 'status', 'address', 'project_id',
         'floating_ip', 'network_id',
@@ -255,6 +256,7 @@ class ListLoadBalancers(base.Lister):
 
 class ShowLoadBalancer(base.ShowOne):
     _description = "Display load balancer details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _load_balancer_arg(parser)
@@ -348,6 +350,7 @@ class CreateLoadBalancer(base.TaskCommand):
 
 class StatsLoadBalancer(base.ShowOne):
     _description = "Show statistics for a load balancer."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _load_balancer_arg(parser)
@@ -437,6 +440,7 @@ class CreatePool(base.TaskCommand):
 
 class ListPools(base.Lister):
     _description = "List load balancer pools."
+    multi_portal = True
     _default_fields = [
         'id', 'name', 'loadbalancer_id', 'protocol', 'protocol_port',
         'backend_protocol', 'backend_protocol_port', 'status', 'lb_algorithm',
@@ -463,6 +467,7 @@ class ListPools(base.Lister):
 
 class ShowPool(base.ShowOne):
     _description = "Display load balancer pool details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _pool_arg(parser)
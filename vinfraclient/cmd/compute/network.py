@@ -190,6 +190,7 @@ def _subnet_arg(parser):
 
 class ListNetwork(base.Lister):
     _description = "List compute networks."
+    multi_portal = True
     _default_fields = ['id', 'name', 'physical_network', 'cidr', 'enable_dhcp',
                        'gateway_ip', 'dns_nameservers', 'allocation_pools',
                        'rbac_policies']
@@ -307,6 +308,7 @@ class ListNetwork(base.Lister):
 
 class ShowNetwork(base.ShowOne):
     _description = "Display compute network details."
+    multi_portal = True
     _formatters = {
         'allocation_pools': AllocationPoolsColumn,
         'subnets': SubnetsColumn
@@ -638,6 +640,7 @@ class SetNetwork(base.ShowOne, NetworkMixin):
 
 class ListSubnet(base.Lister):
     _description = "List compute networks subnets."
+    multi_portal = True
     _default_fields = ['id', 'network_id', 'cidr', 'enable_dhcp', 'gateway_ip',
                        'dns_nameservers', 'allocation_pools']
     _formatters = {'allocation_pools': AllocationPoolsColumn}
@@ -663,6 +666,7 @@ class ListSubnet(base.Lister):
 
 class ShowSubnet(base.ShowOne):
     _description = "Display compute network subnet details."
+    multi_portal = True
     _formatters = {'allocation_pools': AllocationPoolsColumn}
 
     def configure_parser(self, parser):
@@ -17,6 +17,7 @@ def _node_arg(parser):
 
 class ListNode(Lister):
     _description = "List compute nodes."
+    multi_portal = True
     _default_fields = ['id', 'host', 'state', 'roles']
 
     def do_action(self, parsed_args):
@@ -29,6 +30,7 @@ class ListNode(Lister):
 
 class ShowNode(ShowOne):
     _description = "Display compute node details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
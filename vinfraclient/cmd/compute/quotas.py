@@ -13,6 +13,7 @@ LOG = logging.getLogger(__name__)
 
 class ShowComputeQuotas(ShowOne):
     _description = "List compute quotas."
+    multi_portal = True
 
     @classmethod
     def _flatten_dict(cls, dict_, parent_key=None):
@@ -103,6 +103,7 @@ def _common_set_options_validate(app, parsed_args):
 
 class ListRouters(base.Lister):
     _description = "List virtual routers."
+    multi_portal = True
     _default_fields = ['id', 'external_gateway_info', 'name', 'routes',
                        'project_id', 'status']
 
@@ -171,6 +172,7 @@ class ListRouters(base.Lister):
 
 class ShowRouter(base.ShowOne):
     _description = "Display information about a virtual router."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -340,6 +342,7 @@ class RouterInterfaceRemove(base.Lister):
 
 class RouterInterfaceList(base.Lister):
     _description = "List router interfaces."
+    multi_portal = True
     _default_fields = _router_iface_lister_default_fields
 
     def configure_parser(self, parser):
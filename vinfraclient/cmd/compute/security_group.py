@@ -5,6 +5,7 @@ from vinfraclient.exceptions import ValidationError
 
 class ListSecurityGroup(base.Lister):
     _description = "List security groups."
+    multi_portal = True
     _default_fields = ['id', 'name', 'description', 'project_id']
 
     def configure_parser(self, parser):
@@ -74,6 +75,7 @@ class ListSecurityGroup(base.Lister):
 
 class ShowSecurityGroup(base.ShowOne):
     _description = "Display information about a security group."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -155,6 +157,7 @@ class SetSecurityGroup(base.ShowOne):
 
 class ListSecurityGroupRule(base.Lister):
     _description = "List security group rules."
+    multi_portal = True
     _default_fields = ['id', 'security_group_id', 'direction', 'protocol',
                        'remote_ip_prefix', 'remote_group_id']
 
@@ -206,6 +209,7 @@ class ListSecurityGroupRule(base.Lister):
 
 class ShowSecurityGroupRule(base.ShowOne):
     _description = "Display information about a security group rule."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
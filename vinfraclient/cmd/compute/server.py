@@ -1,5 +1,7 @@
 import argparse
 import base64
+import csv
+import json
 import logging
 import re
 
@@ -7,11 +9,13 @@ from vinfra import api_versions
 from vinfra.api.compute.servers import ServerVolumeManager
 from vinfraclient.argtypes import parse_dict_options, parse_list_options, size_limited_string
 from vinfraclient.cmd.base import (
+    BulkTaskMixin,
     Command,
     Lister,
     ShowOne,
     TaskCommand,
     flatten_args,
+    make_names,
     KeyValuePair
 )
 from vinfraclient.exceptions import CommandError, ValidationError
@@ -278,8 +282,10 @@ class NetworksColumn(fmt_columns.BaseColumn):
 
 class ListServer(Lister):
     _description = "List compute servers."
+    multi_portal = True
     _default_fields = ['id', 'name', 'status', 'host', 'networks']
     _formatters = {'networks': NetworksColumn}
+    _server_filters = {'status': 'status', 'host': 'host'}
     _sort_keys = ['name', 'host', 'project_id', 'task_state', 'vm_state', 'vcpus',
                   'cpu_usage', 'mem_total', 'mem_usage', 'block_capacity', 'block_usage',
                   'created_at', 'updated_at']
@@ -398,6 +404,7 @@ class ListServer(Lister):
 
 class ShowServer(ShowOne):
     _description = "Display compute server details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _server_arg(parser)
@@ -408,7 +415,7 @@ class ShowServer(ShowOne):
         return server
 
 
-class CreateServer(TaskCommand):
+class CreateServer(BulkTaskMixin, TaskCommand):
     _description = "Create a new compute server."
 
     def configure_parser(self, parser):
@@ -446,6 +453,22 @@ class CreateServer(TaskCommand):
             help="If count is specified and greater than 1, the 'name' "
                  "argument is treated as a naming pattern.",
         )
+        parser.add_argument(
+            "--name-template",
+            metavar="<template>",
+            help="Create --count servers from the client side instead of "
+                 "a server named <server-name>. Their names are made from "
+                 "the template with the {index} placeholder, e.g. "
+                 "'web-{index:02d}'. Shared arguments are resolved once and "
+                 "the results are reported per server.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            metavar="<num>",
+            type=int,
+            help="Maximum number of servers created concurrently with "
+                 "--name-template.",
+        )
         parser.add_argument(
             "--network",
             metavar="id|<id=id[,mac=mac,fixed-ip=ip-addr[@subnet]>,"
@@ -505,6 +528,7 @@ class CreateServer(TaskCommand):
         parser.add_argument(
             "name",
             metavar="<server-name>",
+            nargs="?",
             help="A new name for the compute server"
         )
         parser.add_argument(
@@ -535,6 +559,18 @@ class CreateServer(TaskCommand):
         )
 
     def do_action(self, parsed_args):
+        names = None
+        if parsed_args.name_template:
+            if parsed_args.name:
+                raise ValidationError(
+                    "Specify either <server-name> or --name-template.")
+            if not parsed_args.count:
+                raise ValidationError("--name-template requires --count.")
+            names = make_names(parsed_args.name_template, parsed_args.count)
+        elif not parsed_args.name:
+            raise ValidationError(
+                "<server-name> is required without --name-template.")
+
         compute = self.app.vinfra.compute
         flavor = utils.find_resource(compute.flavors, parsed_args.flavor).id
 
@@ -579,10 +615,24 @@ class CreateServer(TaskCommand):
                                        'placements', 'allow_live_resize', 'uefi'])
         )
 
+        if parsed_args.name_template:
+            kwargs.pop('count', None)
+            return compute.servers.create_many_async(
+                names, flavor, networks, volumes,
+                concurrency=parsed_args.concurrency, **kwargs)
+
         task = compute.servers.create_async(
             parsed_args.name, flavor, networks, volumes, **kwargs)
         return task
 
+    def take_action(self, parsed_args):
+        if not parsed_args.name_template:
+            return super(CreateServer, self).take_action(parsed_args)
+
+        task = self.do_action(parsed_args)
+        names = make_names(parsed_args.name_template, parsed_args.count)
+        return self.bulk_task_output(parsed_args, task, names)
+
 
 class DeleteServer(TaskCommand):
     _description = "Delete a compute server."
@@ -844,10 +894,128 @@ class ConsoleServer(ShowOne):
 
 
 class StatServer(ShowOne):
-    _description = "Display compute server statistics."
+    _description = ("Display compute server statistics.\n"
+                    "With sampling options, statistics of many servers are "
+                    "collected periodically and printed as JSON lines or "
+                    "CSV.")
+    multi_portal = True
+    # samples are printed as they are taken
+    _single_portal_options = {'all': '--all', 'interval': '--interval',
+                              'count': '--count'}
+    _timestamp_format = '%Y-%m-%dT%H:%M:%S.%f+00:00'
+    _fixed_fields = ['timestamp', 'server_id', 'server_name', 'error']
 
     def configure_parser(self, parser):
-        _server_arg(parser)
+        parser.add_argument(
+            "server",
+            nargs="?",
+            metavar="<server>",
+            help="Compute server ID or name"
+        )
+        sampling_group = parser.add_argument_group(
+            title="sampling options",
+            description="periodic sampling of compute servers",
+        )
+        sampling_group.add_argument(
+            "--all",
+            action="store_true",
+            help="Sample all compute servers."
+        )
+        sampling_group.add_argument(
+            "--interval",
+            metavar="<seconds>",
+            type=int,
+            help="Time between samples, in seconds. Without --count, "
+                 "sampling continues until interrupted."
+        )
+        sampling_group.add_argument(
+            "--count",
+            metavar="<num>",
+            type=int,
+            help="Number of samples to take per server (default: 1 if "
+                 "--interval is not specified)."
+        )
+        sampling_group.add_argument(
+            "--concurrency",
+            metavar="<num>",
+            type=int,
+            help="Maximum number of concurrent requests."
+        )
+        sampling_group.add_argument(
+            "--stream-format",
+            choices=['ndjson', 'csv'],
+            default='ndjson',
+            help="Output format of samples (default: ndjson). CSV columns "
+                 "are taken from the first samples."
+        )
+
+    @staticmethod
+    def _is_sampling(parsed_args):
+        return (parsed_args.all or parsed_args.interval is not None or
+                parsed_args.count is not None)
+
+    def take_action(self, parsed_args):
+        if parsed_args.all and parsed_args.server:
+            raise ValidationError(
+                "The --all option cannot be used with a compute server.")
+        if not parsed_args.all and not parsed_args.server:
+            raise ValidationError("Specify a compute server or --all.")
+
+        if not self._is_sampling(parsed_args):
+            return super(StatServer, self).take_action(parsed_args)
+
+        self._sample(parsed_args)
+        return (), ()
+
+    def produce_output(self, parsed_args, column_names, data):
+        if self._is_sampling(parsed_args):
+            return None
+        return super(StatServer, self).produce_output(
+            parsed_args, column_names, data)
+
+    def _sample(self, parsed_args):
+        servers = None
+        if parsed_args.server:
+            servers = [utils.find_resource(self.app.vinfra.compute.servers,
+                                           parsed_args.server)]
+        count = parsed_args.count
+        if count is None and parsed_args.interval is None:
+            count = 1
+
+        sampler = self.app.vinfra.compute.servers.sampler(
+            servers=servers, interval=parsed_args.interval, count=count,
+            concurrency=parsed_args.concurrency)
+
+        writer = None
+        for samples in sampler:
+            if parsed_args.stream_format == 'csv':
+                if writer is None:
+                    metrics = set()
+                    for sample in samples:
+                        metrics.update(sample.values or {})
+                    writer = csv.DictWriter(
+                        self.app.stdout,
+                        self._fixed_fields + sorted(metrics),
+                        extrasaction='ignore', lineterminator='\n')
+                    writer.writeheader()
+                for sample in samples:
+                    row = dict(sample.values or {})
+                    row.update(self._sample_info(sample))
+                    writer.writerow(row)
+            else:
+                for sample in samples:
+                    data = self._sample_info(sample)
+                    data['stat'] = sample.values
+                    self.app.stdout.write(json.dumps(data) + '\n')
+            self.app.stdout.flush()
+
+    def _sample_info(self, sample):
+        return {
+            'timestamp': sample.timestamp.strftime(self._timestamp_format),
+            'server_id': sample.server_id,
+            'server_name': sample.server_name,
+            'error': sample.error,
+        }
 
     def do_action(self, parsed_args):
         server = utils.find_resource(self.app.vinfra.compute.servers,
@@ -987,6 +1155,7 @@ class UnrescueServer(TaskCommand):
 
 class NetworkList(Lister):
     _description = "List compute server networks."
+    multi_portal = True
     _default_fields = ['id', 'network_id', 'mac_addr', 'fixed_ips',
                        'spoofing_protection']
 
@@ -1103,6 +1272,7 @@ class NetworkDetach(Command):
 
 class VolumeList(Lister):
     _description = "List compute server volumes."
+    multi_portal = True
     _default_fields = ['id', 'device']
 
     def configure_parser(self, parser):
@@ -1121,6 +1291,7 @@ class VolumeList(Lister):
 
 class VolumeShow(ShowOne):
     _description = "Show details of a compute server volume."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -1318,6 +1489,7 @@ class TagDelete(ShowOne):
 
 class TagList(ShowOne):
     _description = "List compute server tags."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -1334,6 +1506,7 @@ class TagList(ShowOne):
 
 class EventList(Lister):
     _description = "List compute server events."
+    multi_portal = True
     _default_fields = ['project_id', 'server_id', 'request_id', 'action',
                        'start_time', 'user_id', 'username', 'status']
 
@@ -1353,6 +1526,7 @@ class EventList(Lister):
 
 class EventShow(ShowOne):
     _description = "Show details of a compute server event."
+    multi_portal = True
     _default_fields = ['project_id', 'server_id', 'request_id', 'action',
                        'start_time', 'user_id', 'username', 'status']
 
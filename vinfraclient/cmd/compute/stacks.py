@@ -61,6 +61,7 @@ class DeleteStack(Command):
 class ListStacks(Lister):
 
     _description = "List stacks."
+    multi_portal = True
     _default_fields = [
         "id",
         "stack_name",
@@ -74,6 +75,7 @@ class ListStacks(Lister):
 class ShowStack(ShowOne):
 
     _description = "Display stack details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _add_stack_id_param(parser)
@@ -86,6 +88,7 @@ class ShowStack(ShowOne):
 class GetStackResources(ShowOne):
 
     _description = "Get resources allocated for the stack."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _add_stack_id_param(parser)
@@ -101,6 +104,7 @@ class GetStackResources(ShowOne):
 class GetTemplateParameters(ShowOne):
 
     _description = "Get template parameters."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -176,6 +176,7 @@ class RedundancyColumn(fmt_columns.BaseColumn):
 
 class ListStoragePolicy(Lister):
     _description = "List existing storage policies."
+    multi_portal = True
     _default_fields = ['id', 'name', 'tier', 'redundancy', 'failure_domain', 'qos']
     _formatters = {'redundancy': RedundancyColumn}
 
@@ -186,6 +187,7 @@ class ListStoragePolicy(Lister):
 
 class ShowStoragePolicy(ShowOne):
     _description = "Show details of a storage policy."
+    multi_portal = True
     _formatters = {'redundancy': RedundancyColumn}
 
     def configure_parser(self, parser):
@@ -5,6 +5,7 @@ from vinfraclient.cmd.base import Command, Lister, ShowOne
 
 class ListTrait(Lister):
     _description = "List compute placements."
+    multi_portal = True
     _default_fields = [
         'id', 'name', 'description', 'nodes',
         'images', 'servers', 'flavors', 'isolated'
@@ -17,6 +18,7 @@ class ListTrait(Lister):
 
 class ShowTrait(ShowOne):
     _description = "Display compute placement details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
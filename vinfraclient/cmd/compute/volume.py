@@ -44,6 +44,22 @@ def _size_arg(parser, required=False):
     )
 
 
+def _bulk_args(parser):
+    parser.add_argument(
+        "--count",
+        metavar="<count>",
+        type=int,
+        help="Number of volumes to create. The volume name is treated as a "
+             "template with the {index} placeholder, e.g. 'data-{index}'."
+    )
+    parser.add_argument(
+        "--concurrency",
+        metavar="<num>",
+        type=int,
+        help="Maximum number of volumes created concurrently with --count."
+    )
+
+
 def _get_storage_policy_name(vinfra, args, kwargs):
     if not args.storage_policy:
         return kwargs
@@ -57,8 +73,10 @@ def _get_storage_policy_name(vinfra, args, kwargs):
 
 class ListVolume(base.Lister):
     _description = "List compute volumes."
+    multi_portal = True
     _default_fields = ['id', 'name', 'size', 'status', 'os-vol-host-attr:host']
     _sort_keys = ['id', 'name', 'size', 'status', 'created_at']
+    _server_filters = {'status': 'status'}
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -165,6 +183,7 @@ class ListVolume(base.Lister):
 
 class ShowVolume(base.ShowOne):
     _description = "Display compute volume details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _volume_arg(parser)
@@ -175,7 +194,7 @@ class ShowVolume(base.ShowOne):
         return volume
 
 
-class CreateVolume(base.TaskCommand):
+class CreateVolume(base.BulkTaskMixin, base.TaskCommand):
     _description = "Create a new compute volume."
 
     def configure_parser(self, parser):
@@ -191,6 +210,7 @@ class CreateVolume(base.TaskCommand):
             metavar="<snapshot>",
             help="Source compute volume snapshot ID or name"
         )
+        _bulk_args(parser)
         _storage_policy_arg(parser, required=True)
         _size_arg(parser, required=True)
         parser.add_argument(
@@ -217,9 +237,22 @@ class CreateVolume(base.TaskCommand):
             kwargs['snapshot'] = utils.find_resource(
                 self.app.vinfra.compute.volume_snapshots, parsed_args.snapshot)
 
+        if parsed_args.count:
+            names = base.make_names(kwargs.pop('name'), parsed_args.count)
+            return volume_manager.create_many_async(
+                names, *args, concurrency=parsed_args.concurrency, **kwargs)
+
         volume = volume_manager.create_async(*args, **kwargs)
         return volume
 
+    def take_action(self, parsed_args):
+        if not parsed_args.count:
+            return super(CreateVolume, self).take_action(parsed_args)
+
+        task = self.do_action(parsed_args)
+        names = base.make_names(parsed_args.name, parsed_args.count)
+        return self.bulk_task_output(parsed_args, task, names)
+
 
 class SetVolume(base.ShowOne):
     _description = "Modify volume parameters"
@@ -276,7 +309,7 @@ class ExtendVolume(base.TaskCommand):
         return volume.extend_async(parsed_args.size)
 
 
-class CloneVolume(base.TaskCommand):
+class CloneVolume(base.BulkTaskMixin, base.TaskCommand):
     _description = "Create a new compute volume from a compute volume."
 
     def configure_parser(self, parser):
@@ -286,6 +319,7 @@ class CloneVolume(base.TaskCommand):
             required=True,
             help="New volume name"
         )
+        _bulk_args(parser)
         _size_arg(parser)
         _storage_policy_arg(parser)
         _volume_arg(parser)
@@ -297,8 +331,21 @@ class CloneVolume(base.TaskCommand):
         kwargs = base.flatten_args(parsed_args, kwargs_names)
         _get_storage_policy_name(self.app.vinfra, parsed_args, kwargs)
 
+        if parsed_args.count:
+            names = base.make_names(parsed_args.name, parsed_args.count)
+            return self.app.vinfra.compute.volumes.clone_many_async(
+                volume, names, concurrency=parsed_args.concurrency, **kwargs)
+
         return volume.clone_async(parsed_args.name, **kwargs)
 
+    def take_action(self, parsed_args):
+        if not parsed_args.count:
+            return super(CloneVolume, self).take_action(parsed_args)
+
+        task = self.do_action(parsed_args)
+        names = base.make_names(parsed_args.name, parsed_args.count)
+        return self.bulk_task_output(parsed_args, task, names)
+
 
 class UploadToImage(base.TaskCommand):
     _description = "Create a compute image from a compute volume."
@@ -1,5 +1,5 @@
-from vinfraclient.cmd.base import Lister, ShowOne, TaskCommand
-from vinfraclient.utils import find_resource
+from vinfraclient.cmd.base import BulkTaskMixin, Lister, ShowOne, TaskCommand
+from vinfraclient.utils import find_resource, find_resources
 
 
 def _common_set_options(parser):
@@ -29,6 +29,7 @@ def _volume_arg(parser, required=False):
 
 class ListVolumeSnapshot(Lister):
     _description = "List compute volume snapshots."
+    multi_portal = True
     _default_fields = ['id', 'name', 'status', 'volume_id']
 
     def configure_parser(self, parser):
@@ -44,6 +45,7 @@ class ListVolumeSnapshot(Lister):
 
 class ShowVolumeSnapshot(ShowOne):
     _description = "Show details of a compute volume snapshot."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _volume_snapshot_arg(parser)
@@ -56,12 +58,26 @@ class ShowVolumeSnapshot(ShowOne):
         return volume_snapshot
 
 
-class CreateVolumeSnapshot(TaskCommand):
+class CreateVolumeSnapshot(BulkTaskMixin, TaskCommand):
     _description = "Create a new compute volume snapshot."
 
     def configure_parser(self, parser):
         _common_set_options(parser)
-        _volume_arg(parser, required=True)
+        parser.add_argument(
+            "--volume",
+            dest="volumes",
+            action="append",
+            metavar="<volume>",
+            required=True,
+            help="Volume ID or name. Specify this option multiple times to "
+                 "snapshot multiple volumes concurrently."
+        )
+        parser.add_argument(
+            "--concurrency",
+            metavar="<num>",
+            type=int,
+            help="Maximum number of snapshots created concurrently."
+        )
 
         parser.add_argument(
             "name",
@@ -71,8 +87,18 @@ class CreateVolumeSnapshot(TaskCommand):
 
     def do_action(self, parsed_args):
         volume_snapshot_manager = self.app.vinfra.compute.volume_snapshots
+        if len(parsed_args.volumes) > 1:
+            volumes = find_resources(self.app.vinfra.compute.volumes,
+                                     parsed_args.volumes)
+            return volume_snapshot_manager.create_many_async(
+                [volume.id for volume in volumes],
+                name=parsed_args.name,
+                description=parsed_args.description,
+                concurrency=parsed_args.concurrency
+            )
+
         volume = find_resource(
-            self.app.vinfra.compute.volumes, parsed_args.volume
+            self.app.vinfra.compute.volumes, parsed_args.volumes[0]
         )
         volume_snapshot = volume_snapshot_manager.create_async(
             volume.id,
@@ -81,6 +107,13 @@ class CreateVolumeSnapshot(TaskCommand):
         )
         return volume_snapshot
 
+    def take_action(self, parsed_args):
+        if len(parsed_args.volumes) == 1:
+            return super(CreateVolumeSnapshot, self).take_action(parsed_args)
+
+        task = self.do_action(parsed_args)
+        return self.bulk_task_output(parsed_args, task, parsed_args.volumes)
+
 
 class SetVolumeSnapshot(ShowOne):
     _description = "Modify a volume snapshot."
@@ -373,6 +373,7 @@ class SetIPsecSiteConnection(base.ShowOne, CreateUpdateMixin):
 
 class ListIPsecSiteConnection(base.Lister):
     _description = "List compute VPN connections."
+    multi_portal = True
     _default_fields = ['id', 'name', 'status', 'peer_address']
 
     def do_action(self, parsed_args):
@@ -415,6 +416,7 @@ class RestartIPsecSiteConnection(base.ShowOne):
 
 class ShowIPsecSiteConnection(base.ShowOne):
     _description = "Display compute VPN connection details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -437,6 +439,7 @@ class ShowIPsecSiteConnection(base.ShowOne):
 
 class ListIkePolicy(base.Lister):
     _description = "List compute VPN IKE policies."
+    multi_portal = True
     _default_fields = ['id', 'name', 'auth_algorithm', 'encryption_algorithm',
                        'pfs', 'ike_version']
 
@@ -446,6 +449,7 @@ class ListIkePolicy(base.Lister):
 
 class ShowIkePolicy(base.ShowOne):
     _description = "Display compute VPN IKE policy details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -461,6 +465,7 @@ class ShowIkePolicy(base.ShowOne):
 
 class ListIPsecPolicy(base.Lister):
     _description = "List compute VPN IPsec policies."
+    multi_portal = True
     _default_fields = ['id', 'name', 'auth_algorithm', 'encryption_algorithm',
                        'pfs']
 
@@ -470,6 +475,7 @@ class ListIPsecPolicy(base.Lister):
 
 class ShowIPsecPolicy(base.ShowOne):
     _description = "Display compute VPN IPsec policy details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -485,6 +491,7 @@ class ShowIPsecPolicy(base.ShowOne):
 
 class ListEndpointGroup(base.Lister):
     _description = "List compute VPN endpoint groups."
+    multi_portal = True
     _default_fields = ['id', 'name', 'type', 'endpoints']
 
     def do_action(self, parsed_args):
@@ -493,6 +500,7 @@ class ListEndpointGroup(base.Lister):
 
 class ShowEndpointGroup(base.ShowOne):
     _description = "Display compute VPN endpoint group details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -3,6 +3,7 @@ from vinfraclient.cmd.base import ShowOne
 
 class ShowSettings(ShowOne):
     _description = 'Show automatic disk replacement settings.'
+    multi_portal = True
 
     def do_action(self, parsed_args):
         return self.app.vinfra.automatic_disk_replacement.settings.show_params()
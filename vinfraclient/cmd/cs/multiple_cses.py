@@ -5,6 +5,7 @@ from vinfraclient.cmd.base import ShowOne
 
 class ShowSettings(ShowOne):
     _description = 'Show NVMe performance settings.'
+    multi_portal = True
 
     def do_action(self, parsed_args):
         return self.app.vinfra.multiple_cses.settings.show_params()
@@ -24,11 +24,13 @@ class DownIface(iface.DownIface):
 
 
 class ListIface(iface.ListIface):
+    multi_portal = True
     deprecated = True
     deprecated_reason = "Please use 'node iface list' command."
 
 
 class ShowIface(iface.ShowIface):
+    multi_portal = True
     deprecated = True
     deprecated_reason = "Please use 'node iface show' command."
 
@@ -69,11 +71,13 @@ class SetCompute(cluster.SetCompute):
 
 
 class ShowCompute(cluster.ShowCompute):
+    multi_portal = True
     deprecated = True
     deprecated_reason = "Please use 'service compute show' command."
 
 
 class ClusterStat(cluster.ClusterStat):
+    multi_portal = True
     deprecated = True
     deprecated_reason = "Please use 'service compute stat' command."
 
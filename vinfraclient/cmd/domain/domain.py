@@ -34,6 +34,7 @@ def _common_set_options(parser):
 
 class ListDomains(Lister):
     _description = "List all available domains."
+    multi_portal = True
     _default_fields = ['id', 'name', 'enabled', 'description']
 
     def do_action(self, parsed_args):
@@ -79,6 +80,7 @@ class SetDomain(ShowOne):
 
 class ShowDomain(ShowOne):
     _description = "Display information about a domain."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _domain_arg(parser)
@@ -158,6 +158,7 @@ class DeleteDomainGroup(Command):
 
 class ListDomainGroup(Lister):
     _description = "List all groups in a domain."
+    multi_portal = True
     _default_fields = ['id', 'name', 'description',
                        'domain_permissions', 'assigned_projects']
 
@@ -258,6 +259,7 @@ class SetDomainGroup(ShowOne):
 
 class ShowDomainGroup(ShowOne):
     _description = "Display information about a domain group."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _add_domain_option(parser)
@@ -271,6 +273,7 @@ class ShowDomainGroup(ShowOne):
 
 class ListDomainGroupUsers(Lister):
     _description = "List users of a group."
+    multi_portal = True
     _default_fields = ['id', 'name', 'description', 'role']
 
     def configure_parser(self, parser):
@@ -90,6 +90,7 @@ def _add_idp_optional(parser):
 
 class ListDomainIdPs(Lister):
     _description = "List domain identity providers."
+    multi_portal = True
     _default_fields = ['id', 'name', 'issuer', 'scope', 'domain_id']
 
     def configure_parser(self, parser):
@@ -102,6 +103,7 @@ class ListDomainIdPs(Lister):
 
 class ShowDomainIdP(ShowOne):
     _description = "Show details of a domain identity provider."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _add_domain_option(parser)
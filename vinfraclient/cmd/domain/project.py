@@ -61,6 +61,7 @@ def _add_user_option(parser):
 
 class ListDomainProjects(Lister):
     _description = "List domain projects."
+    multi_portal = True
     _default_fields = ['id', 'name', 'enabled', 'description', 'domain_id']
 
     def configure_parser(self, parser):
@@ -120,6 +121,7 @@ class ListDomainProjects(Lister):
 
 class ShowDomainProject(ShowOne):
     _description = "Show details of a domain project."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _add_domain_option(parser)
@@ -195,6 +197,7 @@ class SetDomainProject(ShowOne):
 
 class ListProjectUsers(Lister):
     _description = "List users of a project."
+    multi_portal = True
     _default_fields = ['id', 'name', 'description', 'role']
 
     def configure_parser(self, parser):
@@ -172,6 +172,7 @@ class DeleteDomainUser(Command):
 
 class ListDomainUser(Lister):
     _description = "List all users in a domain."
+    multi_portal = True
     _default_fields = ['id', 'name', 'email', 'enabled', 'description',
                        'domain_permissions', 'assigned_projects']
 
@@ -289,6 +290,7 @@ class SetDomainUser(ShowOne):
 
 class ShowDomainUser(ShowOne):
     _description = "Display information about a domain user."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _add_domain_option(parser)
@@ -302,6 +304,7 @@ class ShowDomainUser(ShowOne):
 
 class ListDomainUserGroups(Lister):
     _description = "List users of a group."
+    multi_portal = True
     _default_fields = ['id', 'name', 'description', 'role']
 
     def configure_parser(self, parser):
@@ -36,6 +36,7 @@ class DomainParams(object):
 
 class ListDomainPropsAccess(DomainParams, ManagerAccessor, Lister):
     _description = "List key and access rights of all property sheets of the domain specified by ID or name."
+    multi_portal = True
     _default_fields = ["domain", "key", "access"]
 
     def do_action(self, parsed_args):
@@ -7,6 +7,7 @@ __all__ = ['ListDomainsKeys']
 
 class ListDomainsKeys(Lister):
     _description = "Show all available keys for each known domain."
+    multi_portal = True
     _default_fields = ["domain", "keys"]
 
     @property
@@ -90,6 +90,7 @@ class UpdateDomainProps(CreateDomainProps):
 
 class GetDomainProps(DomainKeyParams, ManagerAccessor, ShowOne):
     _description = "Show a property sheet of the domain specified by ID or name and key."
+    multi_portal = True
     _default_fields = ["domain", "key", "data"]
 
     def do_action(self, parsed_args):
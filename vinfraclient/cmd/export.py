@@ -0,0 +1,60 @@
+import logging
+
+from vinfra.export import INCREMENTAL, TABLES, SqliteExport
+from vinfraclient.cmd.base import Lister
+
+LOG = logging.getLogger(__name__)
+
+
+class ExportSqlite(Lister):
+    _description = ("Export the cluster inventory to a SQLite database.\n"
+                    "Every collection is saved to a table of the same name "
+                    "with indexed columns and the whole resource as JSON in "
+                    "the \"data\" column. Collections are fetched "
+                    "concurrently. {} are refreshed incrementally by "
+                    "updated_at, so resources deleted since the previous "
+                    "export are only dropped with --full.".format(
+                        ", ".join(INCREMENTAL).capitalize()))
+    _default_fields = ['table', 'mode', 'rows', 'total', 'elapsed', 'error']
+
+    def configure_parser(self, parser):
+        parser.add_argument(
+            "file",
+            metavar="<file>",
+            help="Database file, it is created if it does not exist"
+        )
+        parser.add_argument(
+            "--collection",
+            dest="collections",
+            action="append",
+            metavar="<collection>",
+            choices=list(TABLES),
+            help="Collection to export: {} (this option can be used "
+                 "multiple times). All of them are exported by "
+                 "default.".format(", ".join(TABLES))
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Export all the resources instead of the ones updated "
+                 "since the previous export."
+        )
+        parser.add_argument(
+            "--concurrency",
+            metavar="<num>",
+            type=int,
+            help="Maximum number of concurrent requests."
+        )
+
+    def do_action(self, parsed_args):
+        export = SqliteExport(self.app.vinfra, parsed_args.file,
+                              tables=parsed_args.collections,
+                              full=parsed_args.full,
+                              concurrency=parsed_args.concurrency)
+        rv = []
+        for result in export:
+            if result['error']:
+                LOG.warning("Failed to export %s: %s", result['table'],
+                            result['error'])
+            rv.append(result)
+        return rv
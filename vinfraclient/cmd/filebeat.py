@@ -59,6 +59,7 @@ def filebeat_filename_arg(parser):
 
 class ListFilebeatConfig(base.Lister):
     _description = "List Filebeat config."
+    multi_portal = True
     _default_fields = ['id', 'name', 'config']
 
     def do_action(self, parsed_args):
@@ -68,6 +69,7 @@ class ListFilebeatConfig(base.Lister):
 
 class ShowFilebeatConfig(base.Lister):
     _description = "Show Filebeat config."
+    multi_portal = True
     _default_fields = ['id', 'name', 'config']
 
     def configure_parser(self, parser):
@@ -21,6 +21,7 @@ def parse_virtual_ip(value):
 
 class HaShow(ShowOne):
     _description = "Display the HA configuration."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         return self.app.vinfra.ha.get()
@@ -3,6 +3,7 @@ from vinfraclient.cmd.base import ShowOne, Command
 
 class ShowLicense(ShowOne):
     _description = "Show details of the installed license."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         cluster = self.app.vinfra.get_cluster()
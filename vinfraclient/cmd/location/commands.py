@@ -27,6 +27,7 @@ class Configurable(object):
 
 class ListFailureDomains(Configurable, Lister):
     _description = "Show available failure domains."
+    multi_portal = True
     _default_fields = ["id", "singular", "plural"]
 
     def __init__(self, *args, **kwargs):
@@ -139,6 +140,7 @@ class ObservableAction(LevelAwareAction):
 
 class ListLocations(ObservableAction, Lister):
     _description = "List locations of the specified failure domain."
+    multi_portal = True
 
     def _internal_do_action(self, parsed_args):
         return self.mgr.list()
@@ -146,6 +148,7 @@ class ListLocations(ObservableAction, Lister):
 
 class ShowLocation(ObservableAction, ShowOne):
     _description = "Show the location of the specified failure domain and identified by ID."
+    multi_portal = True
 
     def _configure_parser(self, parser):
         super(ShowLocation, self)._configure_parser(parser)
@@ -40,6 +40,7 @@ class NodeParams(object):
 
 class GetLogLevel(NodeParams, ManagerAccessor, Lister):
     _description = "Show the logging severity for nodes specified by ID or host name."
+    multi_portal = True
     _default_fields = ["node_id", "host", "agent_level", "backend_level"]
 
     def __init__(self, *args, **kwargs):
@@ -4,6 +4,7 @@ from vinfra.consts import missing
 
 class ShowParams(ShowOne):
     _description = 'Show per-cluster memory parameters.'
+    multi_portal = True
 
     def do_action(self, parsed_args):
         cluster = self.app.vinfra.get_cluster()
@@ -5,6 +5,7 @@ from vinfraclient.utils import find_resource
 
 class ShowParams(ShowOne):
     _description = 'Show per-node memory parameters.'
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -64,6 +64,7 @@ class ProblemReport(TaskCommand):
 
 class ShowReportSettings(SuppressMixin, ShowOne):
     _description = "Show reports settings."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         return self.app.vinfra.show_reports_settings()
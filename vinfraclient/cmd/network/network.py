@@ -37,6 +37,7 @@ def parse_network_bulk(value):
 
 class ListNetwork(Lister):
     _description = "List available networks."
+    multi_portal = True
     _default_fields_before_46 = ['id', 'name', 'traffic_types', 'allow_list', 'deny_list']
     _default_fields = ['id', 'name', 'traffic_types',
                        'inbound_allow_list', 'inbound_deny_list',
@@ -52,6 +53,7 @@ class ListNetwork(Lister):
 
 class ShowNetwork(ShowOne):
     _description = "Show details of a network."
+    multi_portal = True
     _formatters = {'traffic_types': fmt_columns.ListColumn}
 
     def configure_parser(self, parser):
@@ -437,6 +439,7 @@ class DeleteNetwork(Command):
 
 class NetworkReconfigurationDetails(ShowOne):
     _description = "Display network reconfiguration details."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         return NetworkReconfiguration(self.app.vinfra).get_reconfiguration()
@@ -525,6 +528,7 @@ class NetworkMigrationStart(TaskCommand):
 
 class NetworkMigrationDetails(ShowOne, _NetworkMigrationMixin):
     _description = "Display network migration details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -660,6 +664,7 @@ class _AssignmentMixin(object):
 
 class TrafficTypeAssignmentDetails(ShowOne, _AssignmentMixin):
     _description = "Display traffic type assignment details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -888,6 +893,7 @@ class NetworkEncryptionBypassDel(NetworkEncryptionBypassBase):
 
 class NetworkEncryptionBypassList(Lister):
     _description = "List exceptions for traffic encryption"
+    multi_portal = True
     _default_fields = ['subnet', 'port']
 
     def do_action(self, parsed_args):
@@ -902,6 +908,7 @@ class SubnetColumn(fmt_columns.BaseColumn):
 
 class NetworkEncryptionStatus(Lister):
     _description = "Get status of traffic encryption"
+    multi_portal = True
     _default_fields = ['id', 'name', 'status', 'subnets']
     _formatters = {'subnets': SubnetColumn}
 
@@ -954,6 +961,7 @@ class RemoveIPv6Prefix(TaskCommand):
 
 class IPv6Prefix(ShowOne):
     _description = "Show IPv6 prefix"
+    multi_portal = True
 
     def do_action(self, parsed_args):
         return self.app.vinfra.networks.ipv6_prefix.get_prefix()
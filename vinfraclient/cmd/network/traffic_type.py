@@ -20,6 +20,7 @@ def _traffic_type_arg(parser):
 
 class ListTrafficType(Lister):
     _description = "List available traffic types."
+    multi_portal = True
     _default_fields_before_46 = ['name', 'type', 'exclusive', 'port',
                                  'allow_list', 'deny_list']
     _default_fields = ['name', 'type', 'exclusive', 'port',
@@ -37,6 +38,7 @@ class ListTrafficType(Lister):
 
 class ShowTrafficType(ShowOne):
     _description = "Show details of a traffic type."
+    multi_portal = True
 
     def configure_parser(self, parser):
         _traffic_type_arg(parser)
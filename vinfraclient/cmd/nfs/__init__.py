@@ -64,6 +64,7 @@ class DeleteCluster(TaskCommand):
 
 class ListNodes(Lister):
     _description = 'List NFS cluster nodes.'
+    multi_portal = True
     _default_fields = ['id', 'ip_address', 'has_configd']
 
     def do_action(self, parsed_args):
@@ -111,6 +112,7 @@ class ReleaseNode(TaskCommand):
 
 class GetKrbAuthSettings(ShowOne):
     _description = "Get Kerberos authentication settings"
+    multi_portal = True
 
     def do_action(self, _parsed_args):
         cluster = get_cluster(self.app.vinfra)
@@ -140,6 +140,7 @@ class DeleteExport(TaskCommand):
 
 class ListExport(Lister):
     _description = 'List NFS exports'
+    multi_portal = True
     _default_fields = ['name', 'path', 'access_type']
 
     def configure_parser(self, parser):
@@ -159,6 +160,7 @@ class ListExport(Lister):
 
 class ShowExportInfo(ShowOne):
     _description = 'Show details of an NFS export.'
+    multi_portal = True
 
     def configure_parser(self, parser):
         _share_name_option(parser)
@@ -108,6 +108,7 @@ class DeleteShare(TaskCommand):
 
 class ListShare(Lister):
     _description = 'List NFS shares.'
+    multi_portal = True
     _default_fields = ['name', 'ip_address', 'node']
 
     def do_action(self, parsed_args):
@@ -118,6 +119,7 @@ class ListShare(Lister):
 
 class ShowShareInfo(ShowOne):
     _description = 'Show details of an NFS share.'
+    multi_portal = True
 
     def configure_parser(self, parser):
         _share_name_option(parser)
@@ -5,7 +5,8 @@ import sys
 from vinfraclient.argtypes import parse_dict_options
 from vinfraclient.cmd import base
 from vinfraclient.cmd.node import utils as node_utils
-from vinfraclient.utils import get_cluster, find_resource, find_resources
+from vinfraclient.utils import (get_cluster, find_resource, find_resources,
+                                match_resources)
 
 
 LOG = logging.getLogger(__name__)
@@ -73,6 +74,34 @@ class DiskOption(object):
             'service_params': self.params
         }
 
+    @classmethod
+    def resolve(cls, disks_manager, disk_options, disks=None):
+        """Replace disk names with IDs in disk options.
+
+        All the names are looked up in a single listing of node disks, or
+        in disks if they are already fetched, e.g. by a node inventory.
+        Return a list of disk configurations suitable for the API.
+        """
+        names = []
+        for option in disk_options:
+            names.append(option.disk)
+            if option.params.get('journal_disk_id'):
+                names.append(option.params['journal_disk_id'])
+
+        if disks is None:
+            found = find_resources(disks_manager, names)
+        else:
+            found = match_resources(disks_manager, disks, names)
+        disk_ids = dict(zip(names, (disk.id for disk in found)))
+        configs = []
+        for option in disk_options:
+            option.disk = disk_ids[option.disk]
+            if option.params.get('journal_disk_id'):
+                option.params['journal_disk_id'] = disk_ids[
+                    option.params['journal_disk_id']]
+            configs.append(option.to_dict())
+        return configs
+
 
 def sizeof_fmt(num, suffix='B'):
     for unit in ['', 'Ki', 'Mi', 'Gi', 'Ti', 'Pi', 'Ei', 'Zi']:
@@ -119,6 +148,7 @@ def _add_disk_argument(parser):
 
 class ListDisk(base.Lister):
     _description = "List node disks."
+    multi_portal = True
     _default_fields = [
         'id', 'device', 'type', 'role', 'disk_status', 'used', 'size', 'physical_size',
         'service_id', 'service_status',
@@ -150,6 +180,7 @@ class ListDisk(base.Lister):
 class ShowDiskDiagnosticInfo(base.Lister):
 
     _description = "Show diagnostic information of a disk"
+    multi_portal = True
     _default_fields = ["command", "stdout"]
 
     def configure_parser(self, parser):
@@ -164,6 +195,7 @@ class ShowDiskDiagnosticInfo(base.Lister):
 
 class ShowDisk(base.ShowOne):
     _description = "Show details of a disk."
+    multi_portal = True
 
     def configure_parser(self, parser):
         node_utils.add_node_option(parser)
@@ -191,14 +223,8 @@ class AssignDiskBulk(base.TaskCommand):
         node_utils.add_node_option(parser)
 
     def do_action(self, parsed_args):
-        disks = []
         node = find_resource(self.app.vinfra.nodes, parsed_args.node)
-        for disk in parsed_args.disks:
-            disk.disk = find_resource(node.disks_manager, disk.disk).id
-            if disk.params.get('journal_disk_id'):
-                disk.params['journal_disk_id'] = find_resource(
-                    node.disks_manager, disk.params['journal_disk_id']).id
-            disks.append(disk.to_dict())
+        disks = DiskOption.resolve(node.disks_manager, parsed_args.disks)
 
         cluster = get_cluster(self.app.vinfra)
         return node.disks_manager.assign_bulk_async(disks, cluster=cluster)
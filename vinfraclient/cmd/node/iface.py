@@ -134,6 +134,7 @@ def _add_iface_argument(parser):
 
 class ListIface(base.Lister):
     _description = "List node network interfaces."
+    multi_portal = True
     _default_fields = ["name", "node_id", "ipv4", "state", "network"]
 
     def configure_parser(self, parser):
@@ -173,6 +174,7 @@ class ListIface(base.Lister):
 
 class ShowIface(base.ShowOne):
     _description = "Show details of a network interface."
+    multi_portal = True
 
     def configure_parser(self, parser):
         node_utils.add_node_option(parser, required=True)
@@ -1,6 +1,22 @@
-from vinfraclient.cmd.base import Lister, ShowOne, TaskCommand
+import copy
+import functools
+import logging
+import os
+import subprocess
+
+from vinfra.api.nodes.inventory import NodeInventory
+from vinfra.api.nodes.join import NodeJoin
+from vinfra.exceptions import VinfraError
+from vinfra.utils import DEFAULT_CONCURRENCY
+from vinfraclient.cmd.base import COMMAND_ERROR, Lister, ShowOne, TaskCommand
 from vinfraclient.cmd.node.disk import DiskOption
-from vinfraclient.utils import get_cluster, find_resource
+from vinfraclient.formatters import columns as fmt_columns
+from vinfraclient.exceptions import CommandError, ValidationError
+from vinfraclient.session import get_cache_dir
+from vinfraclient.utils import (get_cluster, find_resource, find_resources,
+                                load_state, save_state)
+
+LOG = logging.getLogger(__name__)
 
 
 def node_arg(parser):
@@ -13,6 +29,7 @@ def node_arg(parser):
 
 class ListNode(Lister):
     _description = "List storage nodes."
+    multi_portal = True
     _default_fields = ['id', 'host', 'is_primary', 'is_online', 'is_assigned',
                        'is_in_ha']
 
@@ -28,8 +45,98 @@ class ListNode(Lister):
         return nodes
 
 
+class NamesColumn(fmt_columns.BaseColumn):
+    name_key = 'name'
+
+    def human_readable(self, value=None):
+        if self._value is not None:
+            value = ','.join(str(item.get(self.name_key))
+                             for item in self._value)
+        return super(NamesColumn, self).human_readable(value=value)
+
+
+class DeviceNamesColumn(NamesColumn):
+    name_key = 'device'
+
+
+class TargetNameColumn(fmt_columns.BaseColumn):
+    def human_readable(self, value=None):
+        if self._value is not None:
+            value = self._value.get('target_name')
+        return super(TargetNameColumn, self).human_readable(value=value)
+
+
+class ListNodeInventory(Lister):
+    _description = ("List storage nodes with their disks, network "
+                    "interfaces and iSCSI targets.\n"
+                    "Sub-resources of all the nodes are fetched "
+                    "concurrently.")
+    multi_portal = True
+    _default_fields = ['id', 'host', 'is_online', 'disks', 'ifaces',
+                       'iscsi_target']
+    _formatters = {
+        'disks': DeviceNamesColumn,
+        'ifaces': NamesColumn,
+        'iscsi_target': TargetNameColumn,
+    }
+
+    def configure_parser(self, parser):
+        parser.add_argument(
+            "--node",
+            dest="nodes",
+            action="append",
+            metavar="<node>",
+            help="Node ID or hostname to include (this option can be used "
+                 "multiple times). All the nodes are included by default."
+        )
+        parser.add_argument(
+            "--include",
+            dest="phases",
+            action="append",
+            metavar="<resource>",
+            choices=NodeInventory.phases,
+            help="Node resources to fetch: {} (this option can be used "
+                 "multiple times). All of them are fetched by "
+                 "default.".format(", ".join(NodeInventory.phases))
+        )
+        parser.add_argument(
+            "--concurrency",
+            metavar="<num>",
+            type=int,
+            help="Maximum number of concurrent requests."
+        )
+        parser.add_argument(
+            "--timings",
+            action="store_true",
+            help="Print time spent on every phase to stderr."
+        )
+
+    def do_action(self, parsed_args):
+        nodes = None
+        if parsed_args.nodes:
+            nodes = find_resources(self.app.vinfra.nodes, parsed_args.nodes)
+
+        inventory = self.app.vinfra.nodes.snapshot(
+            nodes=nodes, phases=parsed_args.phases,
+            concurrency=parsed_args.concurrency)
+
+        for node in inventory.nodes:
+            for phase, error in inventory.errors.get(node.id, {}).items():
+                LOG.warning("Failed to fetch %s of node %s: %s",
+                            phase, node.host, error)
+
+        if parsed_args.timings:
+            for phase in ('nodes',) + NodeInventory.phases + ('total',):
+                if phase in inventory.timings:
+                    self.app.stderr.write("{}: {:.3f}s\n".format(
+                        phase, inventory.timings[phase]))
+
+        return [inventory.node_to_dict(node) for node in inventory.nodes]
+
+
 class ShowNode(ShowOne):
     _description = "Show storage node details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         node_arg(parser)
@@ -73,18 +180,86 @@ class JoinNode(TaskCommand):
 
         disks = None
         if parsed_args.disks:
-            disks = []
-            for disk in parsed_args.disks:
-                disk.disk = find_resource(node.disks_manager, disk.disk).id
-                if disk.params.get('journal_disk_id'):
-                    disk.params['journal_disk_id'] = find_resource(
-                        node.disks_manager, disk.params['journal_disk_id']).id
-                disks.append(disk.to_dict())
+            disks = DiskOption.resolve(node.disks_manager, parsed_args.disks)
 
         cluster = get_cluster(self.app.vinfra)
         return cluster.join_node_async(node.id, disks=disks)
 
 
+class JoinNodeBulk(Lister):
+    _description = ("Join multiple nodes to the storage cluster.\n"
+                    "All the nodes are validated and their join "
+                    "configurations are checked before any node is "
+                    "joined. Then up to --concurrency nodes are joined at "
+                    "a time, and the next node is joined as soon as one of "
+                    "them is done. If the backend is busy, joining is "
+                    "retried later. The command fails if any node fails "
+                    "to join.")
+    _default_fields = ['host', 'task_id', 'state', 'elapsed', 'error']
+
+    def configure_parser(self, parser):
+        parser.add_argument(
+            "--disk",
+            dest="disks",
+            action="append",
+            metavar=DiskOption.metavar,
+            type=DiskOption.from_string,
+            help="Disk configuration applied to every node, disk names are "
+                 "looked up on each node. " + DiskOption.help,
+        )
+        parser.add_argument(
+            "--concurrency",
+            metavar="<num>",
+            type=int,
+            help="Maximum number of nodes joining at a time "
+                 "(default: {}).".format(DEFAULT_CONCURRENCY)
+        )
+        parser.add_argument(
+            "--timeout",
+            metavar="<seconds>",
+            type=int,
+            default=NodeJoin.default_timeout,
+            help="A timeout for all the nodes to join, in seconds "
+                 "(default: {})".format(NodeJoin.default_timeout)
+        )
+        parser.add_argument(
+            "nodes",
+            metavar="<node>",
+            nargs="+",
+            help="Node ID or hostname"
+        )
+
+    def do_action(self, parsed_args):
+        nodes = find_resources(self.app.vinfra.nodes, parsed_args.nodes)
+
+        disks = None
+        if parsed_args.disks:
+            inventory = self.app.vinfra.nodes.snapshot(
+                nodes=nodes, phases=['disks'],
+                concurrency=parsed_args.concurrency)
+            failed = ["{}: {}".format(node.host,
+                                      inventory.errors[node.id]['disks'])
+                      for node in nodes if node.id in inventory.errors]
+            if failed:
+                raise VinfraError("Cannot list disks of nodes:\n{}".format(
+                    '\n'.join(failed)))
+            # disk options are resolved in place, so copy them for each node
+            disks = dict((node.id, DiskOption.resolve(
+                node.disks_manager, copy.deepcopy(parsed_args.disks),
+                disks=inventory.get_disks(node))) for node in nodes)
+
+        cluster = get_cluster(self.app.vinfra)
+        join = cluster.join_nodes(nodes, disks=disks,
+                                  concurrency=parsed_args.concurrency)
+        results = join.run(timeout=parsed_args.timeout)
+
+        failed = len([result for result in results if result['error']])
+        if failed:
+            LOG.error("%d of %d nodes failed to join.", failed, len(results))
+            self.exit_code = COMMAND_ERROR
+        return results
+
+
 class ReleaseNode(TaskCommand):
     _description = ("Release a node from the storage cluster.\n"
                     "Start data migration from the node as well as cluster "
@@ -107,6 +282,7 @@ class ReleaseNode(TaskCommand):
 
 class MaintenanceNodeStatus(ShowOne):
     _description = "Show node maintenance details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         node_arg(parser)
@@ -199,3 +375,158 @@ class MaintenanceNodePrecheck(TaskCommand):
     def do_action(self, parsed_args):
         node = find_resource(self.app.vinfra.nodes, parsed_args.node)
         return node.maintenance_precheck()
+
+
+class RollingMaintenanceNode(Lister):
+    _description = ("Put nodes into maintenance and return them to operation "
+                    "batch by batch.\n"
+                    "Maintenance prechecks of all the nodes run concurrently "
+                    "first. Then nodes are split into batches of up to "
+                    "--batch-size nodes of one rack, nodes out of racks and "
+                    "the primary node, which goes last, are maintained "
+                    "alone. "
+                    "Every batch enters maintenance, --exec runs for each "
+                    "of its nodes, and the batch returns to operation before "
+                    "the next one starts.\n"
+                    "The progress is saved to the state file after every "
+                    "step. If the command is interrupted or a step fails, "
+                    "run it again to resume from the failed step.")
+    _default_fields = ['host', 'batch', 'phase', 'error']
+    _ignore_choices = ('iscsi', 'compute', 's3', 'storage', 'alua', 'nfs')
+
+    def configure_parser(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            metavar="<num>",
+            type=int,
+            default=1,
+            help="Maximum number of nodes of one rack in maintenance at "
+                 "a time (default: 1). A batch never takes down more than "
+                 "one rack."
+        )
+        parser.add_argument(
+            "--ignore",
+            metavar="<service>",
+            action="append",
+            choices=self._ignore_choices,
+            help="Ignore evacuation of the service during maintenance: "
+                 "{} (this option can be used multiple times).".format(
+                     ", ".join(self._ignore_choices))
+        )
+        parser.add_argument(
+            "--exec",
+            dest="command",
+            metavar="<command>",
+            help="Shell command to run for every node in maintenance. "
+                 "VINFRA_NODE_ID and VINFRA_NODE_HOST environment variables "
+                 "are set to the node ID and hostname. A node returns to "
+                 "operation only if the command succeeds."
+        )
+        parser.add_argument(
+            "--skip-blocked",
+            action="store_true",
+            help="Maintain the nodes passed prechecks even if other nodes "
+                 "fail them."
+        )
+        parser.add_argument(
+            "--state-file",
+            metavar="<file>",
+            help="File to save the progress to "
+                 "(default: ~/.vinfra/HOST/maintenance.json)."
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Discard the saved progress and start from prechecks."
+        )
+        parser.add_argument(
+            "--concurrency",
+            metavar="<num>",
+            type=int,
+            help="Maximum number of concurrent requests."
+        )
+        parser.add_argument(
+            "--timeout",
+            metavar="<seconds>",
+            type=int,
+            default=3600,
+            help="A timeout for every maintenance step, in seconds "
+                 "(default: 3600)"
+        )
+        parser.add_argument(
+            "nodes",
+            metavar="<node>",
+            nargs="*",
+            help="Node ID or hostname. All the nodes in the cluster are "
+                 "maintained by default, or the nodes of the saved run."
+        )
+
+    @staticmethod
+    def _exec(command, node):
+        env = dict(os.environ, VINFRA_NODE_ID=node.id,
+                   VINFRA_NODE_HOST=node.host or '')
+        retcode = subprocess.call(command, shell=True, env=env)
+        if retcode:
+            raise CommandError("The command exited with {}.".format(retcode))
+
+    def do_action(self, parsed_args):
+        if parsed_args.batch_size < 1:
+            raise ValidationError("The batch size must be positive.")
+
+        state_file = parsed_args.state_file
+        if not state_file:
+            cache_dir = get_cache_dir(self.app.vinfra.session.url)
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir, 0o700)
+            state_file = os.path.join(cache_dir, 'maintenance.json')
+        state = None
+        if not parsed_args.restart:
+            state = load_state(state_file)
+
+        manager = self.app.vinfra.nodes
+        if parsed_args.nodes:
+            nodes = find_resources(manager, parsed_args.nodes)
+        elif state is not None:
+            nodes = find_resources(manager, sorted(state['nodes']))
+        else:
+            nodes = [node for node in manager.list() if node.is_assigned]
+        if state is not None and set(state['nodes']) != set(
+                node.id for node in nodes):
+            raise ValidationError(
+                "The progress saved to {} is for other nodes. Use --restart "
+                "to discard it.".format(state_file))
+        if state is not None:
+            self.app.print_message("Resuming rolling maintenance from %s",
+                                   state_file)
+
+        ignore = parsed_args.ignore or []
+        action = None
+        if parsed_args.command:
+            action = functools.partial(self._exec, parsed_args.command)
+        failure_domains = None
+        scheduled = state is not None and state['batches'] is not None
+        if parsed_args.batch_size > 1 and not scheduled:
+            failure_domains = dict(
+                (node_id, rack.id)
+                for rack in self.app.vinfra.locations.racks.list()
+                for node_id in rack.nodes)
+        maintenance = manager.rolling_maintenance(
+            nodes, batch_size=parsed_args.batch_size,
+            failure_domains=failure_domains,
+            concurrency=parsed_args.concurrency, state=state,
+            on_change=functools.partial(save_state, state_file),
+            action=action, timeout=parsed_args.timeout,
+            skip_blocked=parsed_args.skip_blocked,
+            start_params=dict(('{}_mode'.format(service), 'ignore')
+                              for service in ignore),
+            stop_params={'ignore_compute': 'compute' in ignore})
+        try:
+            state = maintenance.run()
+        except VinfraError as err:
+            raise CommandError("{}\nThe progress is saved to {}, run the "
+                               "command again to resume.".format(
+                                   err, state_file))
+        os.remove(state_file)
+
+        return sorted(state['nodes'].values(), key=lambda node: (
+            node['batch'] or 0, node['host'] or ''))
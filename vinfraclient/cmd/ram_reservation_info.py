@@ -12,6 +12,7 @@ def node_arg(parser):
 
 class ShowNodesRamReservationInfo(Lister):
     _description = "Show nodes ram reservation details"
+    multi_portal = True
     _default_fields = ['id', 'host', 'reservations', 'total']
 
     def do_action(self, parsed_args):
@@ -21,6 +22,7 @@ class ShowNodesRamReservationInfo(Lister):
 
 class ShowNodeRamReservationInfo(ShowOne):
     _description = "Show storage node ram reservation details."
+    multi_portal = True
 
     def configure_parser(self, parser):
         node_arg(parser)
@@ -32,6 +34,7 @@ class ShowNodeRamReservationInfo(ShowOne):
 
 class ShowTotalRamReservationInfo(ShowOne):
     _description = "Show total ram reservation details"
+    multi_portal = True
 
     def do_action(self, parsed_args):
         return self.app.vinfra.ram_reservation_info.get_total()
@@ -9,6 +9,7 @@ from vinfraclient.utils import \
 
 class ShowS3(ShowOne):
     _description = "Show S3 cluster configuration."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         cluster = get_cluster(self.app.vinfra)
@@ -266,6 +267,7 @@ class ReleaseNode(TaskCommand):
 
 class ShowS3GeoReplication(ShowOne):
     _description = "Show details about registered site for S3 geo-replication or self site."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -285,6 +287,7 @@ class ShowS3GeoReplication(ShowOne):
 
 class ListS3GeoReplication(Lister):
     _description = "List registered site for S3 geo-replication."
+    multi_portal = True
     _default_fields = ['uid', 'readable_name', 'url', 'is_self', 'user_key_id', 'user_secret_key']
 
     def do_action(self, parsed_args):
@@ -294,6 +297,7 @@ class ListS3GeoReplication(Lister):
 
 class ShowTokenS3GeoReplication(ShowOne):
     _description = "Get S3 geo-replication token."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         cluster = get_cluster(self.app.vinfra)
@@ -7,6 +7,7 @@ from vinfraclient.utils import find_resource, get_cluster
 
 class ShowClusterEncryption(ShowOne):
     _description = "Display storage tiers encyption."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         cluster = get_cluster(self.app.vinfra)
@@ -62,6 +63,7 @@ class SetClusterEncryption(ShowOne):
 
 class ShowDns(ShowOne):
     _description = "Display DNS servers."
+    multi_portal = True
     _formatters = {
         'nameservers': fmt_columns.ListColumn,
         'dhcp_nameservers': fmt_columns.ListColumn,
@@ -94,6 +96,7 @@ class SetDns(ShowOne):
 
 class ListLocale(Lister):
     _description = "List locales."
+    multi_portal = True
     _default_fields = ['language', 'english_name', 'display_name', 'enabled',
                        'is_default']
     auth_required = False
@@ -104,6 +107,7 @@ class ListLocale(Lister):
 
 class ShowLocale(ShowOne):
     _description = "Display locale information."
+    multi_portal = True
 
     def configure_parser(self, parser):
         parser.add_argument(
@@ -159,6 +163,7 @@ class UpdateLocale(ShowOne):
 class ShowCsConfig(ShowOne):
 
     _description = "Show CS config."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         return self.app.vinfra.cses_config.get()
@@ -272,6 +277,7 @@ class SetEmailNotifications(ShowOne):
 class ShowEmailNotificationsSettings(ShowOne):
 
     _description = "Display email notification settings."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         return self.app.vinfra.email_notifications.get()
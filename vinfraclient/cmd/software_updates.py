@@ -11,6 +11,7 @@ from vinfraclient.utils import find_resource
 
 class SoftwareUpdatesStatus(ShowOne):
     _description = "Show software updates status."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         return self.app.vinfra.software_updates.get()
@@ -5,6 +5,7 @@ from vinfraclient.utils import find_resource, get_cluster
 
 class ListSshKey(Lister):
     _description = "Show the list of added SSH public keys."
+    multi_portal = True
     _default_fields = ['id', 'key', 'label']
 
     def do_action(self, parsed_args):
@@ -5,6 +5,7 @@ from vinfraclient.utils import get_password
 
 class ShowSsl(ShowOne):
     _description = "Display SSL configuration."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         return self.app.vinfra.ssl.get()
@@ -1,15 +1,14 @@
 import argparse
-import datetime
 import uuid
 
-import progressbar as pb
-
+from vinfra.api.tasks import STATES
 from vinfra.exceptions import TaskError
 
+from vinfraclient.argtypes import timestamp
 from vinfraclient.cmd.base import Lister, ShowOne
 from vinfraclient.exceptions import CommandError
 from vinfraclient.formatters import columns as fmt_columns
-from vinfraclient.utils import progress_bar_context
+from vinfraclient.utils import PROGRESS_FORMATS, task_progress_context
 
 
 def cut_task(task):
@@ -41,15 +40,44 @@ class TracebackColumn(fmt_columns.BaseColumn):
 
 class ListTask(Lister):
     _description = "List tasks"
+    multi_portal = True
     _default_fields = ['task_id', 'state', 'name']
 
+    def configure_parser(self, parser):
+        parser.add_argument(
+            "--state",
+            dest="states",
+            metavar="<state>",
+            action="append",
+            choices=STATES,
+            help="List tasks in the state: {} (this option can be used "
+                 "multiple times).".format(", ".join(STATES))
+        )
+        parser.add_argument(
+            "--name",
+            metavar="<pattern>",
+            help="List tasks with names matching the shell-style pattern, "
+                 "e.g. 'node*'."
+        )
+        parser.add_argument(
+            "--since",
+            metavar="<time>",
+            type=timestamp,
+            help="List tasks started after the time. The time is either in "
+                 "the ISO 8601 format in UTC (e.g. 2020-10-02T15:10:11) or "
+                 "relative to now (e.g. 30m, 2h, 7d)."
+        )
+
     def do_action(self, parsed_args):
-        tasks = self.app.vinfra.tasks.list()
+        tasks = self.app.vinfra.tasks.iterate(states=parsed_args.states,
+                                              name=parsed_args.name,
+                                              since=parsed_args.since)
         return tasks
 
 
 class ShowTask(ShowOne):
     _description = "Show task details."
+    multi_portal = True
     _formatters = {'traceback': TracebackColumn}
 
     def configure_parser(self, parser):
@@ -90,6 +118,13 @@ class WaitTask(ShowOne):
             default=600,
             help="A timeout for the task to complete, in seconds (default: 600)"
         )
+        parser.add_argument(
+            "--progress-format",
+            choices=PROGRESS_FORMATS,
+            help="Show the progress of the task: 'text' (default for the "
+                 "table format on a terminal) or 'json', a JSON object per "
+                 "poll written to stderr."
+        )
 
     @staticmethod
     def task_wait(task, timeout):
@@ -100,22 +135,16 @@ class WaitTask(ShowOne):
 
     def do_action(self, parsed_args):
         timeout = parsed_args.timeout
-        formatter = parsed_args.formatter
+        progress_format = parsed_args.progress_format
 
         task = self.app.vinfra.tasks.get(parsed_args.task)
 
-        if formatter == 'table':
+        if parsed_args.formatter == 'table':
+            progress_format = progress_format or 'text'
             self.app.print_message("Task '%s' waiting ...", task.task_id)
 
-            timeout_str = datetime.timedelta(seconds=timeout)
-            pattern = '[timeout: {}, elapsed time: %s]  '.format(timeout_str)
-            widgets = [pb.Timer(format=pattern), pb.AnimatedMarker()]
-
-            pbar = pb.ProgressBar(maxval=80, term_width=80, widgets=widgets,
-                                  fd=self.app.stderr)
-            with progress_bar_context(self.app, pbar, timeout=timeout):
-                task = self.task_wait(task, timeout)
-        else:
+        with task_progress_context(self.app, progress_format,
+                                   timeout=timeout, message='Waiting'):
             task = self.task_wait(task, timeout)
 
         return cut_task(task.to_dict())
@@ -3,6 +3,7 @@ from vinfraclient.cmd.base import ShowOne
 
 class ShowToken(ShowOne):
     _description = "Display the backend token."
+    multi_portal = True
 
     def do_action(self, parsed_args):
         return self.app.vinfra.token.get()
@@ -73,6 +73,7 @@ def _common_set_options(parser, create_command=True):
 
 class ListUser(Lister):
     _description = "List all admin panel users."
+    multi_portal = True
     _default_fields = ['id', 'name', 'is_enabled', 'is_superuser', 'roles']
 
     def do_action(self, parsed_args):
@@ -82,6 +83,7 @@ class ListUser(Lister):
 
 class ShowUser(ShowOne):
     _description = "Show details of an admin panel user."
+    multi_portal = True
 
     def configure_parser(self, parser):
         user_arg(parser)
@@ -193,6 +195,7 @@ class ChangePassword(ShowOne):
 
 class ListRoles(Lister):
     _description = "List available user roles."
+    multi_portal = True
     _default_fields = ['id', 'name', 'description', 'scope']
 
     def do_action(self, parsed_args):
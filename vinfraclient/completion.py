@@ -0,0 +1,282 @@
+"""Shell completion helper.
+
+The module is run by the bash completion function on every <Tab>, so it
+imports nothing but the standard library. Commands and their arguments
+are read from a completion tree precompiled with build_tree() at install
+time (see scripts/complete.py). Names of compute resources are read from
+a cache under ~/.vinfra/<host>/completion, which is refreshed in the
+background by "vinfra completion refresh" once it gets stale.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+try:
+    from urllib.parse import urlparse
+except ImportError:  # python2
+    from urlparse import urlparse
+
+SPEC = '__spec__'
+TREE_ENV = 'VINFRA_COMPLETION_TREE'
+TTL_ENV = 'VINFRA_COMPLETION_TTL'
+DEFAULT_TREE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'completion.json')
+DEFAULT_PORTAL = 'backend-api.svc.vstoragedomain'
+DEFAULT_TTL = 300  # seconds
+REFRESH_INTERVAL = 60  # min seconds between background refreshes
+
+# argument metavars of compute commands completed with resource names
+RESOURCE_KINDS = {
+    'server': 'servers',
+    'volume': 'volumes',
+    'volume-snapshot': 'volume_snapshots',
+    'snapshot': 'volume_snapshots',
+    'image': 'images',
+    'flavor': 'flavors',
+    'network': 'networks',
+    'router': 'routers',
+    'security-group': 'security_groups',
+    'ssh-key': 'keys',
+    'key-name': 'keys',
+}
+_RESOURCE_COMMANDS = 'service compute '
+
+
+def _action_spec(action, kind_enabled):
+    spec = {'nargs': 0 if action.nargs == 0 else 1}
+    if action.choices:
+        spec['choices'] = sorted('{}'.format(c) for c in action.choices)
+    metavar = action.metavar if isinstance(action.metavar, str) else None
+    if kind_enabled and metavar:
+        kind = RESOURCE_KINDS.get(metavar.strip('<>'))
+        if kind:
+            spec['kind'] = kind
+    return spec
+
+
+def build_tree(app):
+    """Build the completion tree of a VinfraApp.
+
+    Every command parser is created once here, so completion does not need
+    to load the commands again.
+    """
+    tree = {'options': {}, 'commands': {}}
+    for action in app.parser._actions:  # pylint: disable=protected-access
+        for option in action.option_strings:
+            tree['options'][option] = _action_spec(action, False)
+
+    for name, entry_point in sorted(app.command_manager):
+        cmd_cls = entry_point.load()
+        cmd = cmd_cls(app, None)
+        parser = cmd.get_parser('vinfra {}'.format(name))
+        kind_enabled = name.startswith(_RESOURCE_COMMANDS)
+
+        spec = {'options': {}, 'positionals': []}
+        for action in parser._actions:  # pylint: disable=protected-access
+            if action.help == argparse.SUPPRESS:
+                continue
+            if action.option_strings:
+                for option in action.option_strings:
+                    spec['options'][option] = _action_spec(action,
+                                                           kind_enabled)
+            else:
+                item = _action_spec(action, kind_enabled)
+                item['repeat'] = action.nargs in ('+', '*')
+                spec['positionals'].append(item)
+
+        node = tree['commands']
+        for word in name.split():
+            node = node.setdefault(word, {})
+        node[SPEC] = spec
+    return tree
+
+
+def get_cache_dir(portal):
+    # NOTE: keep in sync with vinfraclient.session.get_cache_dir, it cannot
+    # be imported here without the API packages
+    if '://' not in portal:
+        portal = 'https://' + portal
+    hostname = urlparse(portal).netloc.split(':')[0]
+    return os.path.join(os.path.expanduser("~"), '.vinfra', hostname)
+
+
+def get_names_dir(portal):
+    return os.path.join(get_cache_dir(portal), 'completion')
+
+
+def get_names_path(names_dir, kind):
+    return os.path.join(names_dir, '{}.json'.format(kind))
+
+
+def load_names(names_dir, kind):
+    """Return cached names of the kind and their age in seconds."""
+    path = get_names_path(names_dir, kind)
+    try:
+        with open(path) as fp:
+            names = json.load(fp)['names']
+        return names, time.time() - os.path.getmtime(path)
+    except (IOError, OSError, ValueError, KeyError, TypeError):
+        return [], None
+
+
+def refresh_in_background(portal, names_dir):
+    """Start "vinfra completion refresh" detached from the terminal."""
+    stamp = os.path.join(names_dir, '.refresh')
+    try:
+        if time.time() - os.path.getmtime(stamp) < REFRESH_INTERVAL:
+            return
+    except OSError:
+        pass
+
+    try:
+        if not os.path.isdir(names_dir):
+            os.makedirs(names_dir)
+        with open(stamp, 'w'):
+            pass
+        with open(os.devnull, 'r+') as devnull:
+            # a new session has no controlling terminal, so the command
+            # fails instead of asking for a password
+            subprocess.Popen(
+                [sys.executable, '-m', 'vinfraclient.main',
+                 '--vinfra-portal', portal, 'completion', 'refresh'],
+                stdin=devnull, stdout=devnull, stderr=devnull,
+                close_fds=True, preexec_fn=os.setsid)
+    except (IOError, OSError):
+        pass
+
+
+class Completer(object):
+    def __init__(self, tree, portal=None, ttl=None):
+        self.tree = tree
+        self.portal = portal or os.environ.get('VINFRA_PORTAL',
+                                               DEFAULT_PORTAL)
+        self.ttl = DEFAULT_TTL if ttl is None else ttl
+        self._refresh_started = False
+
+    def complete(self, words):
+        """Return candidates for the last of the words.
+
+        :param words: command line words after the program name
+        """
+        words = list(words) or ['']
+        current, args = words[-1], words[:-1]
+
+        idx, pending = self._skip_options(args, 0, self.tree['options'])
+        if pending is not None:
+            return self._filter(self._values(pending, current), current)
+
+        node = self.tree['commands']
+        while idx < len(args) and args[idx] != SPEC and args[idx] in node:
+            node = node[args[idx]]
+            idx += 1
+
+        spec = node.get(SPEC)
+        if idx == len(args):
+            candidates = [word for word in node if word != SPEC]
+            if spec is not None:
+                candidates.extend(self._complete_args(spec, [], current))
+            return self._filter(candidates, current)
+        if spec is None:
+            return []
+        return self._filter(self._complete_args(spec, args[idx:], current),
+                            current)
+
+    def _skip_options(self, args, idx, options):
+        # skip global options preceding the command
+        while idx < len(args) and args[idx].startswith('-'):
+            option = options.get(args[idx].split('=', 1)[0], {'nargs': 0})
+            nargs = 0 if '=' in args[idx] else option['nargs']
+            if args[idx] == '--vinfra-portal' and idx + 1 < len(args):
+                self.portal = args[idx + 1]
+            if idx + nargs >= len(args):
+                return idx, option
+            idx += 1 + nargs
+        return idx, None
+
+    def _complete_args(self, spec, args, current):
+        positional = 0
+        idx = 0
+        while idx < len(args):
+            arg = args[idx]
+            if arg.startswith('-') and '=' not in arg:
+                option = spec['options'].get(arg, {'nargs': 0})
+                if option['nargs'] and idx + 1 == len(args):
+                    return self._values(option, current)
+                idx += 1 + option['nargs']
+                continue
+            if not arg.startswith('-'):
+                positional += 1
+            idx += 1
+
+        if current.startswith('-'):
+            return list(spec['options'])
+
+        positionals = spec['positionals']
+        if positional >= len(positionals):
+            if not positionals or not positionals[-1].get('repeat'):
+                return []
+            positional = len(positionals) - 1
+        return self._values(positionals[positional], current)
+
+    def _values(self, item, current):
+        if item.get('choices'):
+            return item['choices']
+        kind = item.get('kind')
+        if not kind:
+            return []
+
+        names_dir = get_names_dir(self.portal)
+        names, age = load_names(names_dir, kind)
+        if (age is None or age > self.ttl) and not self._refresh_started:
+            self._refresh_started = True
+            refresh_in_background(self.portal, names_dir)
+        return names
+
+    @staticmethod
+    def _filter(candidates, current):
+        return sorted(set(candidate for candidate in candidates
+                          if candidate.startswith(current)))
+
+
+def load_tree(path=None):
+    with open(path or os.environ.get(TREE_ENV) or DEFAULT_TREE) as fp:
+        return json.load(fp)
+
+
+def main(argv=None):
+    """Print completion candidates, one per line.
+
+    Usage: python -m vinfraclient.completion -- WORD... CURRENT-WORD
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == '--':
+        argv = argv[1:]
+    try:
+        tree = load_tree()
+    except (IOError, OSError, ValueError):
+        return 1
+
+    ttl = None
+    if os.environ.get(TTL_ENV, '').isdigit():
+        ttl = int(os.environ[TTL_ENV])
+    for candidate in Completer(tree, ttl=ttl).complete(argv):
+        sys.stdout.write(candidate + '\n')
+    return 0
+
+
+BASH_SCRIPT = '''_vinfra()
+{
+    local IFS=$'\\n'
+    COMPREPLY=($(%(python)s -m vinfraclient.completion -- \\
+        "${COMP_WORDS[@]:1:COMP_CWORD}" 2>/dev/null))
+    return 0
+}
+complete -o default -F _vinfra vinfra
+'''
+
+
+if __name__ == '__main__':
+    sys.exit(main())
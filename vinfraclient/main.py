@@ -2,28 +2,49 @@ import logging
 import os
 import signal
 import sys
+import threading
+import time
 from argparse import ArgumentParser as _ArgumentParser
 
 import pkg_resources
 from cliff.app import App
+from requests.exceptions import HTTPError
 
+from vinfra import exceptions as vinfra_exceptions
 from vinfra import log
+from vinfra import transport
 from vinfra import Vinfra
+from vinfra.api_versions import VersionCache
+from vinfra.utils import concurrent_map
 from vinfraclient import commandmanager
+from vinfraclient import exceptions
 from vinfraclient.compat import urlparse
 from vinfraclient.session import CachedAuth
+from vinfraclient.session import get_cache_dir
 from vinfraclient.session import Session
+from vinfraclient.utils import load_state, save_state
 
 LOG = logging.getLogger(__name__)
 
+HA_ENDPOINTS_TTL = 3600  # seconds
+
 
 def normalize_portal(portal):
+    if transport.is_unix_url(portal):
+        # a backend on this host listening on a Unix socket
+        try:
+            return transport.normalize_url(portal)
+        except ValueError as err:
+            sys.stderr.write("{}\n".format(err))
+            sys.exit(2)
+
     parsed = urlparse(portal)
     if not parsed.scheme:
         parsed = urlparse("https://" + portal)
-    elif parsed.scheme == 'http':
+    elif parsed.scheme == 'http' and not transport.is_loopback_url(portal):
         sys.stderr.write(
-            "'http' scheme is not supported, use 'https' instead.\n")
+            "'http' scheme is supported for loopback addresses only, use "
+            "'https' instead.\n")
         sys.exit(2)
     if not parsed.port:
         parsed = parsed._replace(netloc="{}:8888".format(parsed.netloc))
@@ -31,6 +52,18 @@ def normalize_portal(portal):
     return url
 
 
+def read_portals_file(path):
+    """Read portals listed one per line, skipping empty lines and comments."""
+    try:
+        with open(path) as portals_file:
+            lines = portals_file.readlines()
+    except (IOError, OSError) as err:
+        sys.stderr.write("Failed to read the portals file: {}\n".format(err))
+        sys.exit(2)
+    return [line.strip() for line in lines
+            if line.strip() and not line.strip().startswith('#')]
+
+
 def _description_from_file(lines):
     for line in lines:
         if line.lower().startswith('summary:'):
@@ -64,7 +97,19 @@ class VinfraApp(App):
             command_manager=commandmanager.CommandManager(dist),
             deferred_help=True,
         )
-        self.vinfra = None
+        self._local = threading.local()
+        self._request_cache = None
+        self.portals = []
+
+    @property
+    def vinfra(self):
+        # every thread running a command on one of multiple portals has
+        # its own client
+        return getattr(self._local, 'vinfra', None)
+
+    @vinfra.setter
+    def vinfra(self, value):
+        self._local.vinfra = value
 
     def build_option_parser(self, description, version, argparse_kwargs=None):
         parser = ArgumentParser(description=description, add_help=False)
@@ -102,7 +147,26 @@ class VinfraApp(App):
             default=os.environ.get('VINFRA_PORTAL',
                                    'backend-api.svc.vstoragedomain'),
             help='backend hostname or IP address (default: '
-                 'backend-api.svc.vstoragedomain) [Env: VINFRA_PORTAL]')
+                 'backend-api.svc.vstoragedomain), or unix://<path> of the '
+                 'backend socket on this node. Specify a comma-separated '
+                 'list to run the command on multiple portals at once '
+                 '[Env: VINFRA_PORTAL]')
+        parser.add_argument(
+            '--vinfra-portals-file',
+            metavar='<path>',
+            dest='portals_file',
+            default=os.environ.get('VINFRA_PORTALS_FILE'),
+            help='A file listing portals one per line to run the command '
+                 'on at once, overrides --vinfra-portal '
+                 '[Env: VINFRA_PORTALS_FILE]')
+        parser.add_argument(
+            '--vinfra-concurrency',
+            metavar='<num>',
+            dest='concurrency',
+            type=int,
+            default=os.environ.get('VINFRA_CONCURRENCY'),
+            help='Maximum number of portals the command runs on at once '
+                 '(default: 8) [Env: VINFRA_CONCURRENCY]')
         parser.add_argument(
             '--vinfra-username',
             metavar='<username>',
@@ -150,6 +214,22 @@ class VinfraApp(App):
                      'stevedore.extension'):
             logging.getLogger(name).setLevel(logging.WARNING)
 
+    def initialize_app(self, argv):
+        if self.options.portals_file:
+            portals = read_portals_file(self.options.portals_file)
+        else:
+            portals = self.options.portal.split(',')
+
+        self.portals = []
+        for portal in portals:
+            portal = portal.strip()
+            if portal and portal not in self.portals:
+                normalize_portal(portal)  # exits on invalid portals
+                self.portals.append(portal)
+        if not self.portals:
+            sys.stderr.write("Portal is not set.\n")
+            sys.exit(2)
+
     def interact(self):
         self._init_vinfra()
         self._init_auth()
@@ -159,9 +239,28 @@ class VinfraApp(App):
         if not cmd.client_required:
             return
 
+        if len(self.portals) > 1:
+            if not getattr(cmd, 'multi_portal', False):
+                sys.stderr.write("The command cannot run on multiple "
+                                 "portals.\n")
+                sys.exit(2)
+            if cmd.auth_required:
+                self._get_auth()  # exits if the username is not set
+            return
+
         self.vinfra = self._init_vinfra()
         if cmd.auth_required and self.vinfra.session.auth is None:
             self._init_auth()
+        self._init_endpoints(discover=cmd.auth_required)
+
+        # identical GET requests of the command are sent once
+        self._request_cache = self.vinfra.request_cache
+        self._request_cache.__enter__()
+
+    def clean_up(self, cmd, result, err):
+        if self._request_cache is not None:
+            self._request_cache.__exit__(None, None, None)
+            self._request_cache = None
 
     def run_subcommand(self, argv):
         if argv[0] == 'help':
@@ -171,13 +270,138 @@ class VinfraApp(App):
                     argv.remove(arg)
         return super(VinfraApp, self).run_subcommand(argv)
 
-    def _init_vinfra(self):
+    def run_on_portals(self, func, auth_required=True):
+        """Call func on every portal concurrently.
+
+        Every call runs with self.vinfra set to a client of its portal.
+        Return (portal, result, error, elapsed) tuples in the order of
+        portals, the error is None if the call has succeeded.
+        """
+        def call(portal):
+            saved = self.vinfra
+            self.vinfra = None
+            start = time.time()
+            try:
+                self._init_vinfra(portal)
+                if auth_required:
+                    self._init_auth()
+                self._init_endpoints(discover=auth_required)
+                with self.vinfra.request_cache:
+                    result = func()
+                return result, None, time.time() - start
+            except Exception as err:  # pylint: disable=broad-except
+                LOG.debug("Command failed on %s", portal, exc_info=True)
+                return None, err, time.time() - start
+            finally:
+                self.vinfra = saved
+
+        outcomes = concurrent_map(call, self.portals,
+                                  concurrency=self.options.concurrency)
+        return [(portal,) + outcome
+                for portal, outcome in zip(self.portals, outcomes)]
+
+    def _init_vinfra(self, portal=None):
         if not self.vinfra:
-            url = normalize_portal(self.options.portal)
-            self.vinfra = Vinfra(url, session=Session(url))
+            url = normalize_portal(portal or self.portals[0])
+            session = Session(url)
+            self._init_cassette(session)
+            version_cache = VersionCache(
+                os.path.join(get_cache_dir(url), '.versions'),
+                ttl=self._get_version_cache_ttl())
+            self.vinfra = Vinfra(url, session=session,
+                                 version_cache=version_cache)
         self.command_manager.init_plugins(self.vinfra)
         return self.vinfra
 
+    @staticmethod
+    def _get_version_cache_ttl():
+        ttl = os.environ.get('VINFRA_VERSION_CACHE_TTL')
+        if not ttl:
+            return None
+        try:
+            return int(ttl)
+        except ValueError:
+            sys.stderr.write("VINFRA_VERSION_CACHE_TTL must be an integer.\n")
+            sys.exit(2)
+
+    @staticmethod
+    def _init_cassette(session):
+        # For performance regression runs only: record exchanges with the
+        # backend or replay them offline.
+        record_file = os.environ.get('VINFRA_RECORD')
+        replay_file = os.environ.get('VINFRA_REPLAY')
+        if record_file and replay_file:
+            sys.stderr.write("VINFRA_RECORD and VINFRA_REPLAY are mutually "
+                             "exclusive.\n")
+            sys.exit(2)
+
+        if record_file:
+            session.record(record_file)
+        elif replay_file:
+            try:
+                latency_scale = float(
+                    os.environ.get('VINFRA_REPLAY_LATENCY_SCALE', 1))
+            except ValueError:
+                sys.stderr.write("VINFRA_REPLAY_LATENCY_SCALE must be a "
+                                 "number.\n")
+                sys.exit(2)
+            session.replay(replay_file, latency_scale=latency_scale)
+
+    def _init_endpoints(self, discover=True):
+        # For HA clusters: fail over between management nodes instead of
+        # waiting for the virtual IP to move.
+        endpoints = os.environ.get('VINFRA_ENDPOINTS')
+        session = self.vinfra.session
+        if not endpoints or session.endpoints is not None:
+            return
+
+        if endpoints == 'ha':
+            urls = self._get_ha_endpoints(discover)
+        elif len(self.portals) > 1:
+            # the endpoints belong to one cluster
+            return
+        else:
+            urls = [normalize_portal(url.strip())
+                    for url in endpoints.split(',') if url.strip()]
+
+        hedge_delay = os.environ.get('VINFRA_HEDGE_DELAY')
+        if hedge_delay:
+            try:
+                hedge_delay = float(hedge_delay)
+            except ValueError:
+                sys.stderr.write("VINFRA_HEDGE_DELAY must be a number.\n")
+                sys.exit(2)
+        if urls:
+            session.set_endpoints(urls, hedge_delay=hedge_delay or None)
+
+    def _get_ha_endpoints(self, discover):
+        url = self.vinfra.session.url
+        cache_file = os.path.join(get_cache_dir(url), '.endpoints')
+        try:
+            cached = load_state(cache_file, default={})
+        except exceptions.VinfraError as err:
+            # a corrupt cache is rewritten below
+            LOG.debug("Ignoring HA endpoints cache: %s", err)
+            cached = {}
+        if not isinstance(cached, dict):
+            cached = {}
+        if (cached.get('time', 0) + HA_ENDPOINTS_TTL > time.time() or
+                not discover):
+            return cached.get('endpoints', [])
+
+        try:
+            endpoints = self.vinfra.ha.get_endpoints()
+        except (vinfra_exceptions.VinfraError, HTTPError) as err:
+            LOG.debug("Failed to get HA endpoints: %s", err)
+            endpoints = []  # HA is not configured or not accessible
+        if os.path.isdir(os.path.dirname(cache_file)):
+            try:
+                save_state(cache_file, {'time': time.time(),
+                                        'endpoints': endpoints})
+            except exceptions.VinfraError as err:
+                LOG.debug("Failed to cache HA endpoints: %s", err)
+        return endpoints
+
     def _init_auth(self):
         assert self.vinfra
         self.vinfra.session.auth = self._get_auth()
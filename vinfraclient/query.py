@@ -0,0 +1,256 @@
+"""Client-side filtering and aggregation of listed rows.
+
+Rows are processed in a single pass while they are formatted: rows not
+matching --where conditions are dropped at once, groups only keep their
+counters, and --top without grouping keeps no more than N rows.
+"""
+import heapq
+import json
+import re
+
+import six
+
+from vinfraclient import exceptions
+
+OPERATORS = ('!=', '>=', '<=', '!~', '=', '>', '<', '~')
+_CONDITION_RE = re.compile(r'^\s*([\w.:\-]+?)\s*({})(.*)$'.format(
+    '|'.join(re.escape(op) for op in OPERATORS)))
+COUNT_COLUMN = 'count'
+
+
+def _raw(value):
+    # unwrap formattable columns
+    return getattr(value, '_value', value)  # pylint: disable=protected-access
+
+
+def _lookup(record, column):
+    if column in record:
+        return _raw(record[column])
+    # nested fields of dict values, e.g. metadata.env
+    path = column.split('.')
+    value = _raw(record.get(path[0]))
+    for key in path[1:]:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True)
+    return six.text_type(value)
+
+
+def _number(value):
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, six.integer_types + (float,)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Condition(object):
+    def __init__(self, expression):
+        """Condition in the format <column><operator><value>.
+
+        = and ~ match lists having a matching item, ordering operators
+        compare numbers if both sides are numeric.
+        """
+        match = _CONDITION_RE.match(expression)
+        if not match:
+            raise exceptions.ValidationError(
+                "Invalid condition '{}', the format is <column><operator>"
+                "<value>, supported operators: {}".format(
+                    expression, ' '.join(OPERATORS)))
+        self.column, self.op, self.value = match.groups()
+        self.column_root = self.column.split('.', 1)[0]
+        self._number = _number(self.value)
+        if self.op in ('~', '!~'):
+            try:
+                self._regex = re.compile(self.value)
+            except re.error as err:
+                raise exceptions.ValidationError(
+                    "Invalid regular expression '{}': {}".format(
+                        self.value, err))
+
+    def _equals(self, value):
+        if self._number is not None and _number(value) == self._number:
+            return True
+        return _text(value) == self.value
+
+    def _item_matches(self, value):
+        if self.op in ('=', '!='):
+            return self._equals(value)
+        if self.op in ('~', '!~'):
+            return self._regex.search(_text(value)) is not None
+
+        if value is None:
+            return False
+        number = _number(value)
+        if number is not None and self._number is not None:
+            left, right = number, self._number
+        else:
+            left, right = _text(value), self.value
+        if self.op == '<':
+            return left < right
+        if self.op == '<=':
+            return left <= right
+        if self.op == '>':
+            return left > right
+        return left >= right
+
+    def matches(self, record):
+        value = _lookup(record, self.column)
+        if isinstance(value, list) and self.op in ('=', '!=', '~', '!~'):
+            matched = any(self._item_matches(item) for item in value)
+        else:
+            matched = self._item_matches(value)
+        return not matched if self.op in ('!=', '!~') else matched
+
+
+def _sort_value(value):
+    value = _raw(value)
+    if value is None:
+        return 2, 0
+    number = _number(value)
+    if number is not None and not isinstance(value, six.string_types):
+        return 0, number
+    return 1, _text(value)
+
+
+class _OrderKey(object):
+    __slots__ = ('values', 'descending')
+
+    def __init__(self, values, descending):
+        self.values = values
+        self.descending = descending
+
+    def __lt__(self, other):
+        for desc, left, right in zip(self.descending, self.values,
+                                     other.values):
+            if left == right:
+                continue
+            # empty values go last in both directions
+            if left[0] != right[0]:
+                return left[0] < right[0]
+            return left[1] > right[1] if desc else left[1] < right[1]
+        return False
+
+
+class Query(object):
+    def __init__(self, where=None, group_by=None, sums=None, order_by=None,
+                 top=None):
+        """Query of listed rows.
+
+        :param where: conditions, see Condition
+        :param group_by: columns to group rows by
+        :param sums: columns to sum up in groups
+        :param order_by: columns to order rows by as <column>[:asc|desc]
+        :param top: max number of rows to return
+        """
+        self.conditions = [Condition(expr) for expr in where or []]
+        self.group_by = list(group_by or [])
+        self.sums = list(sums or [])
+        if top is not None and top < 0:
+            raise exceptions.ValidationError(
+                "The number of rows must not be negative.")
+        self.top = top
+
+        self.order_by = []
+        for item in order_by or []:
+            column, _sep, direction = item.rpartition(':')
+            if direction not in ('asc', 'desc'):
+                column, direction = item, 'asc'
+            if not column:
+                raise exceptions.ValidationError(
+                    "Invalid order '{}', the format is "
+                    "<column>[:asc|desc].".format(item))
+            self.order_by.append((column, direction == 'desc'))
+
+    def __bool__(self):
+        return bool(self.conditions or self.grouped or self.order_by or
+                    self.top is not None)
+
+    __nonzero__ = __bool__
+
+    @property
+    def grouped(self):
+        return bool(self.group_by or self.sums)
+
+    @property
+    def columns(self):
+        """Columns of grouped rows."""
+        return (self.group_by + [COUNT_COLUMN] +
+                ['sum_{}'.format(column) for column in self.sums])
+
+    def input_columns(self):
+        """Root columns of listed rows used by the query."""
+        columns = set(cond.column_root for cond in self.conditions)
+        columns.update(column.split('.', 1)[0]
+                       for column in self.group_by + self.sums)
+        if not self.grouped:
+            columns.update(column for column, _desc in self.order_by)
+        return columns
+
+    def matches(self, record):
+        return all(cond.matches(record) for cond in self.conditions)
+
+    def _order_key(self, record):
+        return _OrderKey([_sort_value(record.get(column))
+                          for column, _desc in self.order_by],
+                         [desc for _column, desc in self.order_by])
+
+    def _order(self, records):
+        if self.top is not None and self.order_by:
+            return heapq.nsmallest(self.top, records, key=self._order_key)
+        if self.order_by:
+            records = sorted(records, key=self._order_key)
+        if self.top is not None:
+            records = [record for _idx, record in
+                       zip(six.moves.range(self.top), records)]
+        return list(records)
+
+    def _aggregate(self, records):
+        groups = {}
+        for record in records:
+            values = [_lookup(record, column) for column in self.group_by]
+            key = tuple(_text(value) for value in values)
+            group = groups.get(key)
+            if group is None:
+                group = dict(zip(self.group_by, values))
+                group[COUNT_COLUMN] = 0
+                for column in self.sums:
+                    group['sum_{}'.format(column)] = 0
+                groups[key] = group
+
+            group[COUNT_COLUMN] += 1
+            for column in self.sums:
+                value = _lookup(record, column)
+                if value is None:
+                    continue
+                number = _number(value)
+                if number is None:
+                    raise exceptions.ValidationError(
+                        "Cannot sum up non-numeric value '{}' of "
+                        "column '{}'.".format(value, column))
+                group['sum_{}'.format(column)] += number
+        return [groups[key] for key in sorted(groups)]
+
+    def run(self, records):
+        """Filter, aggregate and order records in a single pass.
+
+        :param records: iterable of dicts column -> value
+        :return: list of resulting dicts
+        """
+        records = (record for record in records if self.matches(record))
+        if self.grouped:
+            records = self._aggregate(records)
+        return self._order(records)
@@ -1,6 +1,7 @@
 import contextlib
 import os
 import sys
+import threading
 
 from requests.exceptions import HTTPError
 
@@ -10,6 +11,10 @@ from vinfraclient.compat import urlparse, cookielib
 from vinfraclient.utils import get_password
 
 
+# commands running on multiple portals at once ask for passwords in turn
+_PROMPT_LOCK = threading.Lock()
+
+
 @contextlib.contextmanager
 def _reraise_vinfra_exception():
     try:
@@ -18,16 +23,25 @@ def _reraise_vinfra_exception():
         raise exceptions.VinfraError(err)
 
 
+def get_cache_dir(url):
+    """Return the per-backend directory for cached client data."""
+    hostname = urlparse(url).netloc.split(':')[0]
+    return os.path.join(os.path.expanduser("~"), '.vinfra', hostname)
+
+
 class Auth(vinfra_session.Auth):
-    def __init__(self, username, password=None, domain=None, project=None):
+    def __init__(self, username, password=None, domain=None, project=None,
+                 renew_margin=None):
         super(Auth, self).__init__(username, password,
-                                   domain=domain, project=project)
+                                   domain=domain, project=project,
+                                   renew_margin=renew_margin)
 
     def make_authenticate(self, session):
         if not self.password:
-            sys.stderr.write("Authentication user '{}' on {}:\n"
-                             "".format(self.username, session.url))
-            self.password = get_password("Password: ")
+            with _PROMPT_LOCK:
+                sys.stderr.write("Authentication user '{}' on {}:\n"
+                                 "".format(self.username, session.url))
+                self.password = get_password("Password: ")
         try:
             super(Auth, self).make_authenticate(session)
         except HTTPError:
@@ -40,8 +54,7 @@ class Auth(vinfra_session.Auth):
 class CachedAuth(Auth):
 
     def get_filename(self, session):
-        hostname = urlparse(session.url).netloc.split(':')[0]
-        dir_path = os.path.join(os.path.expanduser("~"), '.vinfra', hostname)
+        dir_path = get_cache_dir(session.url)
         filename = self.username
         if self.domain:
             filename += '.' + self.domain
@@ -51,6 +64,9 @@ class CachedAuth(Auth):
         filename = self.get_filename(session)
         return filename + '.' + self.project
 
+    def get_project_id_filename(self, session):
+        return self.get_token_filename(session) + '.id'
+
     def _load_session_auth(self, session):
         filename = self.get_filename(session)
         if os.path.exists(filename):
@@ -70,6 +86,11 @@ class CachedAuth(Auth):
             with open(token_filename, 'r') as token_file:
                 self.scoped_token = token_file.read()
 
+        project_id_filename = self.get_project_id_filename(session)
+        if os.path.exists(project_id_filename):
+            with open(project_id_filename, 'r') as project_id_file:
+                self.project_id = project_id_file.read().strip() or None
+
     def _save_session_auth(self, session):
         filename = self.get_filename(session)
         dirname = os.path.dirname(filename)
@@ -92,6 +113,15 @@ class CachedAuth(Auth):
 
         os.chmod(token_filename, 0o600)
 
+        # cache the project name resolution to skip projects listing on
+        # the next login
+        if self.project_id:
+            project_id_filename = self.get_project_id_filename(session)
+            with open(project_id_filename, 'w') as project_id_file:
+                project_id_file.write(self.project_id)
+
+            os.chmod(project_id_filename, 0o600)
+
     def needs_reauthenticate(self, session):
         need_reauth = super(CachedAuth, self).needs_reauthenticate(session)
         if need_reauth:
@@ -113,6 +143,10 @@ class CachedAuth(Auth):
 
 
 class Session(vinfra_session.Session):
+    @staticmethod
+    def _is_stream_request(kwargs):
+        return hasattr(kwargs.get('data'), 'read') or bool(kwargs.get('files'))
+
     def request(self, method, url, authenticated=True, **kwargs):  # pylint: disable=arguments-differ
         try:
             return super(Session, self).request(
@@ -134,6 +168,13 @@ class Session(vinfra_session.Session):
                 if not os.path.exists(filename):
                     raise
 
-            # old cached session is loaded, needs reauthenticate
-            self.auth.make_authenticate(self)
+            # old cached session is loaded, needs reauthenticate unless
+            # the session is renewed after the request headers are built
+            self.auth.renew(self, self.auth.headers_generation)
+
+            # NOTE: a stream is already consumed, it can not be sent again.
+            # Sessions are renewed before the expiration, so this happens
+            # only if the session is revoked on the backend side.
+            if self._is_stream_request(kwargs):
+                raise
             return super(Session, self).request(method, url, **kwargs)
@@ -1,6 +1,7 @@
 import argparse
 import logging
 import collections
+import datetime
 import getpass
 import inspect
 import json
@@ -18,6 +19,7 @@ from vinfra.api.domains import DomainManager
 from vinfra.api.nodes import NodeManager
 from vinfra.api.nodes.ifaces import InterfaceManager
 from vinfra.api.settings import LocaleManager
+from vinfra.progress import ProgressListener
 from vinfraclient import compat
 from vinfraclient import exceptions
 
@@ -141,7 +143,11 @@ def find_resources(manager, names_or_ids, **kwargs):
     # manager doesn't support filtering: list all resources and find matches
     if 'limit' in inspect.getargspec(manager.list).args:
         kwargs['limit'] = -1
-    resources = manager.list(**kwargs)
+    return match_resources(manager, manager.list(**kwargs), names_or_ids)
+
+
+def match_resources(manager, resources, names_or_ids):
+    """Find resources of the manager by names or IDs in a given listing."""
     resources_by_id = collections.defaultdict(list)
     resources_by_name = collections.defaultdict(list)
 
@@ -247,6 +253,73 @@ def progress_bar_context(app, pbar, timeout=None):
     return FakeProgressBarProcess()
 
 
+PROGRESS_FORMATS = ('text', 'json')
+
+
+class TextProgressWriter(object):
+    """Render progress events as a status line rewritten in place."""
+
+    def __init__(self, stream, timeout=None, message='Operation waiting'):
+        self.stream = stream
+        self.timeout = timeout
+        self.message = message
+        self._width = 0
+
+    def _write(self, line):
+        self.stream.write('\r{}'.format(line.ljust(self._width)))
+        self.stream.flush()
+        self._width = len(line)
+
+    def __call__(self, event):
+        if event['event'] == 'finish':
+            if self._width:
+                self.stream.write('\n')
+                self.stream.flush()
+            return
+
+        elapsed = datetime.timedelta(seconds=int(event.get('elapsed') or 0))
+        header = '[elapsed time: {}]'.format(elapsed)
+        if self.timeout:
+            header = '[timeout: {}, elapsed time: {}]'.format(
+                datetime.timedelta(seconds=self.timeout), elapsed)
+        parts = [self.message, header]
+        if event.get('state'):
+            parts.append(event['state'])
+        if event.get('progress') is not None:
+            parts.append('{:.0f}%'.format(event['progress']))
+        if event.get('eta') is not None:
+            parts.append('ETA {}'.format(
+                datetime.timedelta(seconds=int(event['eta']))))
+        self._write(' '.join(parts))
+
+
+class JsonProgressWriter(object):
+    """Write progress events as JSON objects, one per line."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __call__(self, event):
+        self.stream.write(json.dumps(event, sort_keys=True) + '\n')
+        self.stream.flush()
+
+
+def task_progress_context(app, progress_format=None, timeout=None,
+                          message='Operation waiting'):
+    """Return a context rendering the progress of waiting in it.
+
+    JSON events are always written to stderr. The text progress is shown
+    only on a terminal, like progress bars are.
+    """
+    if progress_format == 'json':
+        return ProgressListener(JsonProgressWriter(app.stderr))
+    if (progress_format == 'text' and app.stderr.isatty() and
+            app.options.verbose_level):
+        return ProgressListener(TextProgressWriter(
+            app.stderr, timeout=timeout, message=message))
+    return FakeProgressBarProcess()
+
+
 _MULTIPLIER = {
     "KiB": 1024,
     "MiB": 1024 ** 2,
@@ -393,3 +466,28 @@ def validate_resources_from_operator(manager, value):
 
     resources = find_resources(manager, resources)
     return '{}{}'.format(op, ','.join([r.id for r in resources]))
+
+
+def load_state(path, default=None):
+    """Load a JSON state file saved by save_state."""
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, 'r') as fp:
+            return json.load(fp)
+    except (IOError, OSError, compat.JSONDecodeError) as err:
+        raise exceptions.ValidationError(
+            'Failed to load state from "{}" ({}).'.format(path, err))
+
+
+def save_state(path, data):
+    """Atomically save a JSON state file, so an interrupted command never
+    leaves a broken one."""
+    tmp_path = '{}.tmp'.format(path)
+    try:
+        with open(tmp_path, 'w') as fp:
+            json.dump(data, fp)
+        os.rename(tmp_path, path)
+    except (IOError, OSError) as err:
+        raise exceptions.VinfraError(
+            'Failed to save state to "{}" ({}).'.format(path, err))